@@ -14,12 +14,12 @@ import os
 import time
 import argparse
 import logging
-import requests
 import zipfile
 
 import pydatajson
 from pydatajson.helpers import ensure_dir_exists
 from pydatajson.download import download_to_file
+from pydatajson.transport import get_default_transport
 
 CATALOGS_DIR = ""
 CATALOGS_URL = 'http://monitoreo.datos.gob.ar/nodes.json'
@@ -106,12 +106,8 @@ def make_catalog_backup(catalog, catalog_id=None, local_catalogs_dir="",
         None
     """
 
-    try:
-        catalog = pydatajson.DataJson(
-            catalog, catalog_format="json", verify_ssl=False)
-    except:
-        catalog = pydatajson.DataJson(
-            catalog, catalog_format="xlsx", verify_ssl=False)
+    catalog = pydatajson.DataJson(
+        catalog, catalog_format="auto", verify_ssl=False)
     catalog_identifier = catalog_id if catalog_id else catalog["identifier"]
 
     if include_metadata:
@@ -263,7 +259,7 @@ def get_catalog_path(catalog_id, catalogs_dir=CATALOGS_DIR, fmt="json"):
 def download_all(catalogs_url, backup_dir, include_data=True,
                  use_short_path=True):
     include_data = bool(int(include_data))
-    nodos = requests.get(catalogs_url, verify=False).json()
+    nodos = get_default_transport().get(catalogs_url, verify=False).json()
 
     nodos_dict = {
         catalog["id"]: catalog["url_json"]
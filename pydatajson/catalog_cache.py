@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'catalog_cache' de Pydatajson
+
+Contiene un caché en disco de catálogos ya parseados. Cada snapshot guarda el
+diccionario del catálogo junto con los índices de datasets, distribuciones y
+fields, y se identifica por un hash del contenido del archivo fuente: mientras
+el archivo no cambie, construir un DataJson a partir de él se reduce a leer el
+snapshot.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import hashlib
+import io
+import json
+import logging
+import os
+
+from six import string_types, text_type
+from six.moves import cPickle as pickle
+
+from pydatajson.helpers import ensure_dir_exists, write_file_atomically
+
+logger = logging.getLogger('pydatajson')
+
+# se incrementa cuando cambia el formato de los snapshots o la forma en que
+# se parsean los catálogos, para invalidar los snapshots anteriores
+SNAPSHOT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class CatalogSnapshotCache(object):
+    """Caché en disco de catálogos parseados, indexado por contenido.
+
+    Sólo se cachean catálogos leídos desde archivos locales: para un catálogo
+    remoto habría que descargarlo para calcular su hash.
+
+    Args:
+        cache_dir (str): Directorio donde se guardan los snapshots.
+    """
+
+    SUFFIX = ".pickle"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        ensure_dir_exists(cache_dir)
+
+    def key(self, catalog, default_values=None, catalog_format=None):
+        """Calcula la clave del snapshot de un catálogo.
+
+        Args:
+            catalog (str or dict): Catálogo a leer.
+            default_values (dict): Valores default con los que se lee.
+            catalog_format (str): Formato con el que se lee.
+
+        Returns:
+            str: Clave del snapshot, o None si el catálogo no es cacheable.
+        """
+        if not isinstance(catalog, string_types) or \
+                not os.path.isfile(catalog):
+            return None
+
+        hasher = hashlib.sha256()
+        with io.open(catalog, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+        # los parámetros de lectura también determinan el catálogo resultante
+        params = json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "default_values": default_values,
+            "catalog_format": catalog_format,
+            # el formato se infiere de la extensión si no se especifica
+            "extension": None if catalog_format else
+            os.path.splitext(catalog)[1].lower()
+        }, sort_keys=True, default=text_type)
+        hasher.update(params.encode("utf-8"))
+
+        return hasher.hexdigest()
+
+    def load(self, key):
+        """Devuelve el snapshot guardado con una clave, o None."""
+        try:
+            with io.open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            logger.warning(
+                "No se pudo leer el snapshot {}: {}".format(key, e))
+            return None
+
+    def save(self, key, snapshot):
+        """Guarda un snapshot.
+
+        Args:
+            key (str): Clave devuelta por key().
+            snapshot (dict): Catálogo e índices a guardar.
+        """
+        content = pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)
+        write_file_atomically(self._path(key), content)
+
+    def clear(self):
+        """Elimina todos los snapshots del caché."""
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(self.SUFFIX):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'catalog_query' de Pydatajson
+
+Contiene un lenguaje de consultas sobre los metadatos de un catálogo, más
+expresivo que los filtros por igualdad de search: paths a campos anidados,
+operadores de pertenencia, rangos (de fechas, números o textos), existencia
+y combinaciones booleanas de condiciones sobre datasets, distribuciones y
+fields. Una consulta se compila una vez en funciones que evalúan cada
+entidad, y sus condiciones de igualdad y de rango se resuelven con los
+índices secundarios del catálogo cuando los hay.
+
+Una consulta es un diccionario cuyas claves son paths con el nivel de la
+entidad como primer elemento ("dataset.publisher.name", "distribution.format",
+"field.type") y cuyos valores son el valor buscado o un diccionario de
+operadores::
+
+    {
+        "dataset.publisher.name": {"in": ["INDEC", "Ministerio de Energía"]},
+        "distribution.issued": {"gte": "2018-01-01", "lt": "2019-01-01"},
+        "field.units": {"exists": True},
+        "not": {"dataset.accrualPeriodicity": "R/P1Y"},
+        "or": [{"distribution.format": "CSV"},
+               {"distribution.mediaType": "text/csv"}],
+    }
+
+Las claves de una consulta se combinan con "and". Las condiciones sobre el
+nivel buscado o sus contenedores se evalúan sobre esas entidades; las
+condiciones sobre niveles inferiores se cumplen si alguna entidad contenida
+las cumple (por ejemplo, un dataset cumple "distribution.format": "CSV" si
+tiene alguna distribución CSV).
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import bisect
+import datetime
+import numbers
+import re
+
+from dateutil import parser, tz
+from six import iteritems, string_types
+
+from .custom_exceptions import InvalidQueryError
+from .search_indexes import LEVELS, PARENT_KEYS, get_path, index_key
+from .search_indexes import iter_entities
+
+BOOLEAN_OPERATORS = ("and", "or", "not")
+COMPARISON_OPERATORS = ("gt", "gte", "lt", "lte")
+OPERATORS = ("eq", "ne", "in", "exists") + COMPARISON_OPERATORS
+
+# operadores que se pueden resolver con los índices secundarios
+INDEXED_OPERATORS = ("eq", "in") + COMPARISON_OPERATORS
+
+ISO_DATE_PATTERN = re.compile(r"^\d{4}(-\d{2}){0,2}([T ]\d{2}:\d{2}.*)?$")
+
+DATE, NUMBER, TEXT = "date", "number", "text"
+
+# fechas ya parseadas, que suelen repetirse entre entidades y consultas
+MAX_PARSED_DATES = 10000
+_parsed_dates = {}
+
+
+def compile_query(query):
+    """Compila una consulta.
+
+    Args:
+        query (dict o CatalogQuery): Consulta (ver el módulo).
+
+    Returns:
+        CatalogQuery: Consulta compilada, reutilizable.
+
+    Raises:
+        InvalidQueryError: La consulta no tiene un formato válido.
+    """
+    if isinstance(query, CatalogQuery):
+        return query
+    return CatalogQuery(query)
+
+
+class CatalogQuery(object):
+    """Consulta compilada sobre los metadatos de un catálogo.
+
+    Args:
+        query (dict): Consulta (ver el módulo).
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self._tree = _parse(query)
+        self._predicates = {}
+
+    def predicate(self, level):
+        """Devuelve la función que evalúa la consulta sobre una entidad del
+        nivel pedido.
+
+        Returns:
+            function: Recibe la lista de la entidad y sus contenedoras,
+                desde el dataset, y devuelve True si la entidad cumple la
+                consulta.
+        """
+        predicate = self._predicates.get(level)
+        if predicate is None:
+            predicate = self._predicates[level] = _compile(
+                self._tree, LEVELS.index(level))
+        return predicate
+
+    def matches(self, entities):
+        """Indica si una entidad cumple la consulta.
+
+        Args:
+            entities (list): La entidad y sus contenedoras, desde el
+                dataset. Ejemplo: [dataset, distribution].
+        """
+        return self.predicate(LEVELS[len(entities) - 1])(entities)
+
+    def index_conditions(self, level):
+        """Devuelve las condiciones que toda entidad del nivel pedido debe
+        cumplir y que pueden resolverse con índices: igualdad, pertenencia
+        y rangos sobre el nivel o sus contenedores.
+
+        Returns:
+            list: Tuplas (nivel, path, operador, operando).
+        """
+        depth = LEVELS.index(level)
+        nodes = self._tree[1] if self._tree[0] == "and" else [self._tree]
+        return [(LEVELS[node[1]], node[2], node[3], node[4])
+                for node in nodes
+                if node[0] == "leaf" and node[1] <= depth and
+                node[3] in INDEXED_OPERATORS]
+
+    def filter(self, catalog, level, indexes=None):
+        """Devuelve las entidades de un nivel que cumplen la consulta.
+
+        Args:
+            catalog (dict o DataJson): Catálogo a consultar. Si es un
+                DataJson lazy, los datasets se leen de la fuente.
+            level (str): "dataset", "distribution" o "field".
+            indexes (SearchIndexes): Índices secundarios del catálogo. Si se
+                pasan, sólo se evalúan las entidades que cumplen las
+                condiciones indexables.
+
+        Returns:
+            list: Tuplas (posición, entidades), en el orden del catálogo.
+        """
+        predicate = self.predicate(level)
+        if indexes is not None:
+            conditions = [
+                (LEVELS.index(condition[0]) + 1,
+                 _indexed_positions(indexes, *condition))
+                for condition in self.index_conditions(level)]
+            candidates = indexes.select(level, conditions)
+        else:
+            datasets = catalog.iter_datasets() \
+                if getattr(catalog, "lazy", False) else catalog["dataset"]
+            candidates = iter_entities(datasets, level)
+
+        return [(position, entities) for position, entities in candidates
+                if predicate(entities)]
+
+
+def _indexed_positions(indexes, level, path, operator, operand):
+    """Devuelve las posiciones de las entidades de un nivel que cumplen una
+    condición, usando los índices secundarios."""
+    if operator == "eq":
+        return indexes.lookup(level, path, operand)
+    if operator == "in":
+        positions = set()
+        for value in operand:
+            positions.update(indexes.lookup(level, path, value))
+        return positions
+
+    keys, positions = indexes.ordered(level, path, _sort_key)
+    kind, bound = _comparable(operand)
+    # las claves son tuplas (tipo, valor): primero acota el tipo del operando
+    low = bisect.bisect_left(keys, (kind,))
+    high = bisect.bisect_left(keys, (kind + "\0",))
+    if operator == "gt":
+        low = bisect.bisect_right(keys, (kind, bound), low, high)
+    elif operator == "gte":
+        low = bisect.bisect_left(keys, (kind, bound), low, high)
+    elif operator == "lt":
+        high = bisect.bisect_left(keys, (kind, bound), low, high)
+    else:
+        high = bisect.bisect_right(keys, (kind, bound), low, high)
+    return set(positions[low:high])
+
+
+def _parse(query):
+    """Convierte una consulta en un árbol de nodos:
+    ("and", [nodos]), ("or", [nodos]), ("not", nodo) y
+    ("leaf", profundidad, path, operador, operando)."""
+    if not isinstance(query, dict) or not query:
+        raise InvalidQueryError(query, "se esperaba un diccionario no vacío")
+
+    nodes = []
+    for key, value in iteritems(query):
+        if key in ("and", "or"):
+            if not isinstance(value, list) or not value:
+                raise InvalidQueryError(
+                    query, "'{}' espera una lista de consultas".format(key))
+            nodes.append((key, [_parse(item) for item in value]))
+        elif key == "not":
+            nodes.append(("not", _parse(value)))
+        else:
+            nodes.extend(_parse_conditions(query, key, value))
+
+    return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+
+def _parse_conditions(query, key, value):
+    path = tuple(key.split(".")) if isinstance(key, string_types) else ()
+    if len(path) < 2 or path[0] not in LEVELS:
+        raise InvalidQueryError(
+            query, "'{}' debe empezar por {}".format(key, ", ".join(LEVELS)))
+    depth = LEVELS.index(path[0])
+
+    # un diccionario sin operadores es un valor a comparar por igualdad
+    if not isinstance(value, dict) or not value or \
+            not all(operator in OPERATORS for operator in value):
+        return [("leaf", depth, path[1:], "eq", value)]
+
+    conditions = []
+    for operator, operand in iteritems(value):
+        if operator == "in" and not isinstance(operand, (list, tuple, set)):
+            raise InvalidQueryError(query, "'in' espera una lista")
+        if operator in COMPARISON_OPERATORS and \
+                _comparable(operand)[0] is None:
+            raise InvalidQueryError(
+                query, "'{}' espera una fecha, un número o un texto".format(
+                    operator))
+        conditions.append(("leaf", depth, path[1:], operator, operand))
+    return conditions
+
+
+def _compile(node, depth):
+    """Compila un nodo en una función que recibe la lista de una entidad
+    del nivel de profundidad "depth" y sus contenedoras."""
+    kind = node[0]
+    if kind == "and":
+        predicates = [_compile(child, depth) for child in node[1]]
+        return lambda entities: all(predicate(entities)
+                                    for predicate in predicates)
+    if kind == "or":
+        predicates = [_compile(child, depth) for child in node[1]]
+        return lambda entities: any(predicate(entities)
+                                    for predicate in predicates)
+    if kind == "not":
+        predicate = _compile(node[1], depth)
+        return lambda entities: not predicate(entities)
+
+    _, condition_depth, path, operator, operand = node
+    value_of = _value_getter(condition_depth, path)
+    test = _compile_test(operator, operand)
+    if condition_depth <= depth:
+        return lambda entities: test(value_of(entities))
+    return lambda entities: any(
+        test(value_of(descendant))
+        for descendant in _descendants(entities, condition_depth))
+
+
+def _value_getter(depth, path):
+    parent = PARENT_KEYS.get(LEVELS[depth], {}).get(path[0]) \
+        if len(path) == 1 else None
+    if parent:
+        # metadato que las vistas de search agregan a la entidad
+        parent_depth, parent_key = parent
+        return lambda entities: entities[parent_depth].get(parent_key)
+    return lambda entities: get_path(entities[depth], path)
+
+
+def _compile_test(operator, operand):
+    if operator == "eq":
+        return lambda value: value == operand
+    if operator == "ne":
+        return lambda value: value != operand
+    if operator == "in":
+        keys = set(index_key(item) for item in operand)
+        return lambda value: index_key(value) in keys
+    if operator == "exists":
+        return lambda value: (value is not None) == bool(operand)
+
+    kind, bound = _comparable(operand)
+    compare = {
+        "gt": lambda value: value > bound,
+        "gte": lambda value: value >= bound,
+        "lt": lambda value: value < bound,
+        "lte": lambda value: value <= bound,
+    }[operator]
+
+    def test(value):
+        value_kind, value = _comparable(value)
+        return value_kind == kind and compare(value)
+
+    return test
+
+
+def _comparable(value):
+    """Devuelve el tipo de un valor para los rangos y su valor comparable.
+    Las fechas ISO 8601 se comparan como fechas (en UTC si tienen zona
+    horaria); una fecha sin hora equivale a su medianoche."""
+    if isinstance(value, datetime.datetime):
+        return DATE, _naive_utc(value)
+    if isinstance(value, datetime.date):
+        return DATE, datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return NUMBER, value
+    if isinstance(value, string_types):
+        parsed = _parsed_dates.get(value)
+        if parsed is None:
+            parsed = _parse_date(value)
+            if len(_parsed_dates) >= MAX_PARSED_DATES:
+                _parsed_dates.clear()
+            _parsed_dates[value] = parsed
+        return parsed
+    return None, value
+
+
+def _parse_date(value):
+    if ISO_DATE_PATTERN.match(value):
+        try:
+            return DATE, _naive_utc(parser.isoparse(value))
+        except ValueError:
+            pass
+    return TEXT, value
+
+
+def _sort_key(value):
+    """Clave de un valor en los índices ordenados: (tipo, valor), o None
+    para los valores que no admiten rangos."""
+    kind, comparable = _comparable(value)
+    return (kind, comparable) if kind is not None else None
+
+
+def _naive_utc(value):
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(tz.tzutc()).replace(tzinfo=None)
+
+
+def _descendants(entities, depth):
+    """Itera las listas de entidades de profundidad "depth" contenidas en
+    la última entidad de una lista."""
+    if len(entities) == depth + 1:
+        yield entities
+        return
+
+    children = entities[-1].get("distribution" if len(entities) == 1
+                                else "field")
+    if isinstance(children, list):
+        for child in children:
+            if isinstance(child, dict):
+                for descendant in _descendants(entities + [child], depth):
+                    yield descendant
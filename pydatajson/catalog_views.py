@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'catalog_views' de Pydatajson
+
+Contiene las vistas planas de las distribuciones y los fields de un
+catálogo: copias de sólo lectura de cada entidad con los identificadores de
+las entidades que la contienen y referencias a ellas. Armar una vista no
+modifica el catálogo, y un DataJson creado con cached_views=True guarda las
+listas de vistas para no volver a armarlas en cada acceso.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+from .time_series import distribution_has_time_index, field_is_time_series
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Las vistas del catálogo son de sólo lectura: "
+                    "modifique el catálogo o una copia de la vista")
+
+
+class EntityView(dict):
+    """Copia de sólo lectura de una distribución o un field.
+
+    Incluye los metadatos "dataset_identifier" (y "distribution_identifier"
+    en los fields) y referencias a las entidades originales. La copia es
+    superficial: los valores anidados son los del catálogo. copy() y
+    copy.deepcopy() devuelven diccionarios comunes, modificables.
+
+    Args:
+        entity (dict): Entidad original del catálogo.
+        dataset (dict): Dataset que contiene a la entidad.
+        distribution (dict): Distribución que contiene al field.
+    """
+
+    __setitem__ = __delitem__ = _read_only
+    update = pop = popitem = clear = setdefault = _read_only
+
+    def __init__(self, entity, dataset, distribution=None):
+        super(EntityView, self).__init__(entity)
+        dict.__setitem__(self, "dataset_identifier", dataset["identifier"])
+        if distribution is not None:
+            dict.__setitem__(self, "distribution_identifier",
+                             distribution.get("identifier"))
+        self.entity = entity
+        self.dataset = dataset
+        self.distribution = distribution
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """Lista de sólo lectura, para compartir las listas de vistas entre
+    accesos sin que se puedan modificar."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = _read_only
+    if hasattr(list, "clear"):
+        clear = _read_only
+    if hasattr(list, "__setslice__"):
+        __setslice__ = __delslice__ = _read_only
+
+    def copy(self):
+        return list(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def distribution_view(dataset, distribution):
+    return EntityView(distribution, dataset)
+
+
+def field_view(dataset, distribution, field):
+    return EntityView(field, dataset, distribution)
+
+
+def is_time_series_view(field_view):
+    """Indica si la vista de un field corresponde a una serie de tiempo."""
+    distribution = field_view.distribution
+    return distribution_has_time_index(distribution) and \
+        field_is_time_series(field_view.entity, distribution)
+
+
+class CatalogViews(object):
+    """Listas de vistas de las distribuciones y los fields de un catálogo,
+    armadas la primera vez que se piden.
+
+    Args:
+        entities (function): Función que recibe un nivel ("distribution" o
+            "field") y devuelve las posiciones y entidades de ese nivel
+            (ver SearchIndexes.entities()).
+    """
+
+    def __init__(self, entities):
+        self._entities = entities
+        self._views = {}
+        self._by_position = {}
+
+    def distributions(self):
+        return self._level_views("distribution")
+
+    def fields(self):
+        return self._level_views("field")
+
+    def time_series(self):
+        views = self._views.get("time_series")
+        if views is None:
+            views = self._views["time_series"] = ReadOnlyList(
+                view for view in self.fields() if is_time_series_view(view))
+        return views
+
+    def view(self, level, position):
+        """Devuelve la vista de la entidad en una posición."""
+        by_position = self._by_position.get(level)
+        if by_position is None:
+            positions = [position for position, _
+                         in self._entities(level)]
+            by_position = self._by_position[level] = dict(
+                zip(positions, self._level_views(level)))
+        return by_position[position]
+
+    def _level_views(self, level):
+        views = self._views.get(level)
+        if views is None:
+            make_view = distribution_view if level == "distribution" \
+                else field_view
+            views = self._views[level] = ReadOnlyList(
+                make_view(*entities)
+                for _, entities in self._entities(level))
+        return views
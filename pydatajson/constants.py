@@ -1,9 +1,19 @@
 # -*- coding: utf-8 -*-
 
 REQUESTS_TIMEOUT = 30
+# cantidad de catálogos que se leen en paralelo en las operaciones sobre redes
+DEFAULT_READ_WORKERS = 8
 DEFAULT_TIMEZONE = "America/Buenos_Aires"
 
 INVALID_STATUS_CODES_REGEX = ["^4[0-9]+$", "^5[0-9]+$"]
 EXCEPTION_STATUS_CODES = [429]
 
 DEFAULT_CHECK_TIMEOUT = 1
+# cantidad de URLs de un mismo host que se chequean a la vez
+DEFAULT_LINK_CHECK_PER_HOST = 4
+# cantidad de fallas seguidas de un host tras las que se dejan de chequear
+# sus URLs
+DEFAULT_HOST_MAX_FAILURES = 5
+# segundos tras los que se vuelve a probar una URL de un host que se dejó de
+# chequear
+DEFAULT_HOST_RETRY_AFTER = 60
@@ -17,6 +17,7 @@ import os.path
 import sys
 from collections import OrderedDict
 from datetime import datetime
+from itertools import islice
 
 from openpyxl.styles import Alignment, Font
 from six import string_types, iteritems
@@ -25,8 +26,10 @@ from six.moves.urllib_parse import urljoin
 from pydatajson.response_formatters import format_response
 from pydatajson.validation import Validator, \
     DEFAULT_CATALOG_SCHEMA_FILENAME, ABSOLUTE_SCHEMA_DIR
+from pydatajson.validation_errors import fill_response
 from . import backup
 from . import catalog_readme
+from . import custom_exceptions as ce
 from . import documentation, constants
 from . import federation
 from . import helpers
@@ -55,7 +58,11 @@ class DataJson(dict):
                  default_values=None, catalog_format=None,
                  validator_class=Validator, verify_ssl=False,
                  requests_timeout=constants.REQUESTS_TIMEOUT,
-                 url_check_timeout=constants.DEFAULT_CHECK_TIMEOUT):
+                 url_check_timeout=constants.DEFAULT_CHECK_TIMEOUT,
+                 lazy=False, http_cache=None, snapshot_cache=None,
+                 transport=None, validation_engine=None,
+                 validation_cache=None, link_checker=None,
+                 indexed_search=False, cached_views=False):
         """Lee un catálogo y crea un objeto con funciones para manipularlo.
 
         Salvo que se indique lo contrario, se utiliza como default el schema
@@ -79,35 +86,126 @@ class DataJson(dict):
                         "dataset_issued": "2017-06-22",
                         "distribution_issued": "2017-06-22"
                     }
+            lazy (bool): Si es True y el catálogo es un data.json (local o
+                remoto), sólo se cargan en memoria los metadatos de nivel
+                catálogo. Los datasets se leen de la fuente de a uno cada vez
+                que se recorren (iter_datasets(), get_datasets(),
+                get_distributions()). La validación y los indicadores
+                recorren los datasets de la misma forma, sin cargarlos
+                todos en memoria. Las operaciones que modifican o escriben
+                el catálogo deben usarse sobre un DataJson no lazy.
+            http_cache (HttpCache): Caché en disco para las descargas de
+                catálogos remotos leídos por este objeto.
+            snapshot_cache (CatalogSnapshotCache): Caché de catálogos ya
+                parseados. Si el catálogo es un archivo local cuyo contenido
+                no cambió desde la última lectura, se carga el snapshot
+                guardado en lugar de volver a parsearlo.
+            transport (Transport): Transporte HTTP con el que este objeto
+                descarga catálogos y chequea URLs. Si no se especifica, se usa
+                el compartido por toda la librería.
+            validation_engine (str): Motor con el que se valida el catálogo
+                contra el schema: "jsonschema" o "compiled". Si no se
+                especifica, se usa validation.get_default_engine().
+            validation_cache (ValidationCache): Caché de errores de
+                validación por dataset. Si se especifica, al validar sólo se
+                revalidan los datasets que cambiaron desde la última vez.
+            link_checker (LinkChecker): Motor con el que se chequean las URLs
+                al validar con broken_links=True. Si no se especifica, se
+                crea uno por validación a partir de los parámetros de
+                chequeo.
+            indexed_search (bool): Si es True, las búsquedas filtradas se
+                resuelven con índices secundarios que se construyen a
+                demanda y se guardan en el objeto. Los índices se actualizan
+                al modificar el catálogo con los métodos de DataJson; si se
+                modifican los metadatos directamente hay que descartarlos
+                con clear_search_indexes(). Por default las búsquedas
+                recorren el catálogo en cada llamada.
+            cached_views (bool): Si es True, las distribuciones y los fields
+                se devuelven como vistas de sólo lectura que se arman una
+                sola vez (ver catalog_views), y distributions, fields y
+                time_series devuelven siempre la misma lista. Las vistas se
+                descartan como los índices de indexed_search.
+
+        Compatibilidad: sin cached_views, las búsquedas de un DataJson
+        devuelven las propias distribuciones y fields del catálogo, que se
+        pueden modificar. La primera búsqueda que devuelve cada entidad le
+        agrega los metadatos "dataset_identifier" (y "distribution_identifier"
+        a los fields), que quedan en el catálogo como en versiones
+        anteriores; las búsquedas siguientes no vuelven a escribirlos. Esto
+        incluye a los dict pasados a las funciones de búsqueda, que se leen
+        con un DataJson que comparte sus entidades. Las búsquedas sobre un
+        DataJson lazy no modifican el catálogo: devuelven vistas de sólo
+        lectura armadas en cada llamada.
         """
         self.verify_ssl = verify_ssl
         self.requests_timeout = requests_timeout
         self.url_check_timeout = url_check_timeout
+        self.http_cache = http_cache
+        self.transport = transport
+        self.validation_cache = validation_cache
+        self.link_checker = link_checker
+        self.indexed_search = indexed_search
+        self.cached_views = cached_views
+        self._search_indexes = None
+        self._text_index = None
+        self.lazy = bool(catalog) and lazy and readers.is_json_source(
+            catalog, catalog_format)
         # se construye el objeto DataJson con la interfaz de un dicconario
-        if catalog:
-
-            # lee representaciones de un catálogo hacia un diccionario
-            catalog = readers.read_catalog(catalog,
-                                           default_values=default_values,
-                                           catalog_format=catalog_format,
-                                           verify=self.verify_ssl,
-                                           timeout=self.requests_timeout)
-
-            # copia todos los atributos del diccionario hacia el objeto
+        if self.lazy:
+            self._lazy_source = catalog
+            self._default_values = default_values
+
+            # lee sólo los metadatos de nivel catálogo
+            catalog = readers.read_catalog_metadata(
+                catalog, default_values=default_values,
+                verify=self.verify_ssl, timeout=self.requests_timeout,
+                transport=self.transport)
             for key, value in iteritems(catalog):
                 self[key] = value
 
             self.has_catalog = True
 
-            # indexa los ids de datasets, distribuciones y fields
-            self._build_index()
+            # sin índices: las búsquedas recorren la fuente
+            self._datasets_index = {}
+            self._distributions_index = {}
+            self._fields_index = {}
+
+        elif catalog:
+            snapshot_key = snapshot_cache and snapshot_cache.key(
+                catalog, default_values, catalog_format)
+            snapshot = snapshot_key and snapshot_cache.load(snapshot_key)
+            self.has_catalog = True
+
+            if snapshot:
+                self._load_snapshot(snapshot)
+            else:
+                # lee representaciones de un catálogo hacia un diccionario
+                catalog = readers.read_catalog(
+                    catalog, default_values=default_values,
+                    catalog_format=catalog_format, verify=self.verify_ssl,
+                    timeout=self.requests_timeout, http_cache=self.http_cache,
+                    transport=self.transport)
+
+                # copia todos los atributos del diccionario hacia el objeto
+                for key, value in iteritems(catalog):
+                    self[key] = value
+
+                # indexa los ids de datasets, distribuciones y fields
+                self._build_index()
+
+                if snapshot_key:
+                    self._save_snapshot(snapshot_cache, snapshot_key)
 
         else:
             self.has_catalog = False
         schema_filename = schema_filename or DEFAULT_CATALOG_SCHEMA_FILENAME
         schema_dir = schema_dir or ABSOLUTE_SCHEMA_DIR
 
-        self.validator = validator_class(schema_filename, schema_dir)
+        if validation_engine:
+            self.validator = validator_class(schema_filename, schema_dir,
+                                             engine=validation_engine)
+        else:
+            self.validator = validator_class(schema_filename, schema_dir)
 
         # asigno docstrings de los métodos modularizados
         fn_doc = indicators.generate_catalogs_indicators.__doc__
@@ -130,6 +228,10 @@ class DataJson(dict):
     get_theme = search.get_theme
     get_field_location = search.get_field_location
     get_catalog_metadata = search.get_catalog_metadata
+    query = search.query
+    search_text = search.search_text
+    iter_distributions = search.iter_distributions
+    iter_fields = search.iter_fields
 
     # metodos para realizar operaciones de transformación de metadatos
     generate_distribution_ids = transformation.generate_distribution_ids
@@ -159,43 +261,164 @@ class DataJson(dict):
     # metodos de README
     generate_catalog_readme = catalog_readme.generate_catalog_readme
 
+    def iter_datasets(self, *args, **kwargs):
+        """Itera los datasets del catálogo de a uno.
+
+        Si el catálogo se construyó con `lazy=True`, los datasets se leen de
+        la fuente original en cada recorrido.
+
+        Con argumentos, filtra y pagina los datasets como
+        search.iter_datasets().
+        """
+        if args or kwargs:
+            return search.iter_datasets(self, *args, **kwargs)
+
+        if self.lazy:
+            return readers.iter_datasets(
+                self._lazy_source, default_values=self._default_values,
+                verify=self.verify_ssl, timeout=self.requests_timeout,
+                transport=self.transport)
+        return iter(self.get("dataset", []))
+
     def _build_index(self):
         """Itera todos los datasets, distribucioens y fields indexandolos."""
 
-        datasets_index = {}
-        distributions_index = {}
-        fields_index = {}
+        # un catálogo lazy no se indexa: guardar las posiciones obligaría a
+        # materializar la lista de datasets para accederlos
+        if self.lazy:
+            return
+
+        self._datasets_index = {}
+        self._distributions_index = {}
+        self._fields_index = {}
 
         # recorre todos los datasets
         for dataset_index, dataset in enumerate(self.datasets):
-            if "identifier" in dataset:
-                datasets_index[dataset["identifier"]] = {
-                    "dataset_index": dataset_index
+            self._index_dataset(dataset_index, dataset)
+
+        self.clear_search_indexes()
+
+    def _index_dataset(self, dataset_index, dataset):
+        """Agrega un dataset, sus distribuciones y sus fields a los índices
+        por identificador."""
+        if "identifier" not in dataset:
+            return
+
+        self._datasets_index[dataset["identifier"]] = {
+            "dataset_index": dataset_index
+        }
+        # recorre las distribuciones del dataset
+        for distribution_index, distribution in enumerate(
+                dataset.get("distribution", [])):
+            self._index_distribution(dataset, distribution_index,
+                                     distribution)
+
+    def _index_distribution(self, dataset, distribution_index, distribution):
+        if "identifier" not in distribution:
+            return
+
+        self._distributions_index[distribution["identifier"]] = {
+            "distribution_index": distribution_index,
+            "dataset_identifier": dataset["identifier"]
+        }
+        # recorre los fields de la distribucion
+        for field_index, field in enumerate(distribution.get("field", [])):
+            if "id" in field:
+                self._fields_index[field["id"]] = {
+                    "field_index": field_index,
+                    "dataset_identifier": dataset["identifier"],
+                    "distribution_identifier": distribution["identifier"]
                 }
-                # recorre las distribuciones del dataset
-                for distribution_index, distribution in enumerate(
-                        dataset.get("distribution", [])):
-                    if "identifier" in distribution:
-                        distributions_index[distribution["identifier"]] = {
-                            "distribution_index": distribution_index,
-                            "dataset_identifier": dataset["identifier"]
-                        }
-                        # recorre los fields de la distribucion
-                        for field_index, field in enumerate(
-                                distribution.get("field", [])):
-                            if "id" in field:
-                                fields_index[field["id"]] = {
-                                    "field_index":
-                                        field_index,
-                                    "dataset_identifier":
-                                        dataset["identifier"],
-                                    "distribution_identifier":
-                                        distribution["identifier"]
-                                }
-
-        setattr(self, "_distributions_index", distributions_index)
-        setattr(self, "_datasets_index", datasets_index)
-        setattr(self, "_fields_index", fields_index)
+
+    def _unindex_dataset(self, dataset):
+        """Quita un dataset, sus distribuciones y sus fields de los índices
+        por identificador."""
+        identifier = dataset.get("identifier")
+        if identifier is None:
+            return
+
+        self._datasets_index.pop(identifier, None)
+        for distribution in dataset.get("distribution", []):
+            self._unindex_distribution(identifier, distribution)
+
+    def _unindex_distribution(self, dataset_identifier, distribution):
+        identifier = distribution.get("identifier")
+        entry = self._distributions_index.get(identifier)
+        if entry and entry["dataset_identifier"] == dataset_identifier:
+            del self._distributions_index[identifier]
+
+        fields = distribution.get("field", [])
+        for field in fields if isinstance(fields, list) else []:
+            entry = self._fields_index.get(field.get("id"))
+            if entry and entry["distribution_identifier"] == identifier:
+                del self._fields_index[field["id"]]
+
+    def _reindex_datasets(self, start=0):
+        """Actualiza las posiciones de los datasets desde una posición."""
+        datasets_index = self._datasets_index
+        for dataset_index, dataset in enumerate(
+                islice(self["dataset"], start, None), start):
+            identifier = dataset.get("identifier")
+            entry = datasets_index.get(identifier)
+            if entry is not None:
+                entry["dataset_index"] = dataset_index
+            elif identifier is not None:
+                datasets_index[identifier] = {"dataset_index": dataset_index}
+
+    def _reindex_distributions(self, dataset, start=0):
+        """Actualiza las posiciones de las distribuciones de un dataset desde
+        una posición."""
+        distributions = dataset.get("distribution", [])
+        for distribution_index in range(start, len(distributions)):
+            identifier = distributions[distribution_index].get("identifier")
+            if identifier is not None:
+                self._distributions_index[identifier] = {
+                    "distribution_index": distribution_index,
+                    "dataset_identifier": dataset["identifier"]
+                }
+
+    def clear_search_indexes(self):
+        """Descarta los índices secundarios de las búsquedas filtradas, las
+        vistas planas de distribuciones y fields y el índice de texto.
+
+        Si el objeto se creó con indexed_search=True, los índices se
+        construyen a demanda en la primera búsqueda que filtra por cada
+        campo. Si se creó con cached_views=True, las vistas se arman en el
+        primer acceso a distributions, fields o time_series. El índice de
+        texto se construye en la primera llamada a search_text(). Todos se
+        actualizan al modificar el catálogo con los métodos de DataJson. Si
+        se modifican los metadatos directamente hay que descartarlos para que
+        las búsquedas vean los cambios.
+        """
+        self._search_indexes = None
+        self._text_index = None
+
+    def _make_snapshot(self):
+        """Devuelve el catálogo y sus índices para guardar en un caché."""
+        return {
+            "catalog": dict(self),
+            "datasets_index": self._datasets_index,
+            "distributions_index": self._distributions_index,
+            "fields_index": self._fields_index
+        }
+
+    def _save_snapshot(self, snapshot_cache, key):
+        """Guarda el catálogo en un caché de snapshots. Si no se puede
+        guardar, el catálogo se usa igual."""
+        try:
+            snapshot_cache.save(key, self._make_snapshot())
+        except Exception as e:
+            logger.warning(
+                "No se pudo guardar el snapshot {}: {}".format(key, e))
+
+    def _load_snapshot(self, snapshot):
+        """Carga el catálogo y sus índices desde un snapshot."""
+        for key, value in iteritems(snapshot["catalog"]):
+            self[key] = value
+
+        self._datasets_index = snapshot["datasets_index"]
+        self._distributions_index = snapshot["distributions_index"]
+        self._fields_index = snapshot["fields_index"]
 
     def get_distribution_time_index(self, distribution):
         if isinstance(distribution, dict):
@@ -213,32 +436,271 @@ class DataJson(dict):
 
         return time_series.get_distribution_time_index_frequency(distribution)
 
+    def add_dataset(self, dataset):
+        """Agrega un dataset al final del catálogo y actualiza los índices.
+
+        Args:
+            dataset (dict): Dataset a agregar.
+
+        Raises:
+            DatasetIdRepetitionError: Ya hay un dataset con ese identifier.
+        """
+        identifier = dataset.get("identifier")
+        if identifier is not None and identifier in self._datasets_index:
+            raise ce.DatasetIdRepetitionError(
+                identifier, [self.get_dataset(identifier)])
+
+        datasets = self.setdefault("dataset", [])
+        datasets.append(dataset)
+        self._index_dataset(len(datasets) - 1, dataset)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.add_dataset(dataset)
+
+    def replace_dataset(self, dataset):
+        """Reemplaza el dataset con el mismo identifier, en su posición, y
+        actualiza los índices.
+
+        Args:
+            dataset (dict): Dataset nuevo.
+
+        Raises:
+            DatasetIdNonExistentError: No hay un dataset con ese identifier.
+        """
+        identifier = dataset.get("identifier")
+        dataset_index = self._find_dataset_index(identifier)
+        if dataset_index is None:
+            raise ce.DatasetIdNonExistentError(identifier)
+
+        self._unindex_dataset(self["dataset"][dataset_index])
+        self["dataset"][dataset_index] = dataset
+        self._index_dataset(dataset_index, dataset)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.add_dataset(dataset)
+
     def remove_dataset(self, identifier):
-        for index, dataset in enumerate(self["dataset"]):
-            if dataset["identifier"] == identifier:
-                self["dataset"].pop(index)
-                logger.info("Dataset {} en posicion {} fue eliminado.".format(
-                    identifier, index))
-                return
+        dataset_index = self._find_dataset_index(identifier)
+        if dataset_index is None:
+            logger.warning("No se encontro el dataset {}.".format(identifier))
+            return
+
+        self._unindex_dataset(self["dataset"].pop(dataset_index))
+        self._reindex_datasets(dataset_index)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.remove_dataset(identifier)
+        logger.info("Dataset {} en posicion {} fue eliminado.".format(
+            identifier, dataset_index))
+
+    def remove_datasets(self, identifiers):
+        """Elimina varios datasets recorriendo el catálogo una sola vez.
 
-        logger.warning("No se encontro el dataset {}.".format(identifier))
+        A diferencia de llamar a remove_dataset() por cada uno, el costo no
+        depende de la cantidad de datasets eliminados.
+
+        Args:
+            identifiers (iterable): Identifiers de los datasets a eliminar.
+                Se eliminan todos los datasets con esos identifiers.
+
+        Returns:
+            int: Cantidad de datasets eliminados.
+        """
+        identifiers = set(identifiers)
+        kept = []
+        removed = []
+        for dataset in self["dataset"]:
+            if dataset.get("identifier") in identifiers:
+                removed.append(dataset)
+            else:
+                kept.append(dataset)
+
+        self["dataset"][:] = kept
+        for dataset in removed:
+            self._unindex_dataset(dataset)
+            if self._text_index is not None:
+                self._text_index.remove_dataset(dataset["identifier"])
+        self._reindex_datasets()
+        self._search_indexes = None
+
+        not_found = identifiers.difference(
+            dataset["identifier"] for dataset in removed)
+        if not_found:
+            logger.warning("No se encontraron los datasets {}.".format(
+                ", ".join(sorted(not_found))))
+        logger.info("{} datasets fueron eliminados.".format(len(removed)))
+        return len(removed)
+
+    def add_distribution(self, distribution, dataset_identifier):
+        """Agrega una distribución al final de un dataset y actualiza los
+        índices.
+
+        Args:
+            distribution (dict): Distribución a agregar.
+            dataset_identifier (str): Identifier del dataset.
+
+        Raises:
+            DatasetIdNonExistentError: No hay un dataset con ese identifier.
+            DistributionIdRepetitionError: Ya hay una distribución con ese
+                identifier.
+        """
+        dataset_index = self._find_dataset_index(dataset_identifier)
+        if dataset_index is None:
+            raise ce.DatasetIdNonExistentError(dataset_identifier)
+        identifier = distribution.get("identifier")
+        if identifier is not None and \
+                identifier in self._distributions_index:
+            raise ce.DistributionIdRepetitionError(
+                identifier, [self.get_distribution(identifier)])
+
+        dataset = self["dataset"][dataset_index]
+        distributions = dataset.setdefault("distribution", [])
+        distributions.append(distribution)
+        self._index_distribution(dataset, len(distributions) - 1,
+                                 distribution)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.add_dataset(dataset)
+
+    def replace_distribution(self, distribution, dataset_identifier=None):
+        """Reemplaza la distribución con el mismo identifier, en su
+        posición, y actualiza los índices.
+
+        Args:
+            distribution (dict): Distribución nueva.
+            dataset_identifier (str): Identifier del dataset de la
+                distribución. Si no se especifica, se busca en todos.
+
+        Raises:
+            DistributionIdNonExistentError: No hay una distribución con ese
+                identifier.
+        """
+        identifier = distribution.get("identifier")
+        location = self._find_distribution_index(identifier,
+                                                 dataset_identifier)
+        if location is None:
+            raise ce.DistributionIdNonExistentError(identifier)
+
+        dataset, distribution_index = location
+        self._unindex_distribution(
+            dataset["identifier"],
+            dataset["distribution"][distribution_index])
+        dataset["distribution"][distribution_index] = distribution
+        self._index_distribution(dataset, distribution_index, distribution)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.add_dataset(dataset)
 
     def remove_distribution(self, identifier, dataset_identifier=None):
+        location = self._find_distribution_index(identifier,
+                                                 dataset_identifier)
+        if location is None:
+            logger.warning("No se encontro la distribucion {}.".format(
+                identifier))
+            return
+
+        dataset, index = location
+        self._unindex_distribution(dataset["identifier"],
+                                   dataset["distribution"].pop(index))
+        self._reindex_distributions(dataset, index)
+        self._search_indexes = None
+        if self._text_index is not None:
+            self._text_index.remove_distribution(identifier)
+        logger.info("Distribution {} del dataset {}"
+                    "en posicion {} fue eliminada.".format(
+                        identifier, dataset["identifier"], index))
+
+    def remove_distributions(self, identifiers):
+        """Elimina varias distribuciones recorriendo el catálogo una sola
+        vez.
+
+        Args:
+            identifiers (iterable): Identifiers de las distribuciones a
+                eliminar. Se eliminan todas las distribuciones con esos
+                identifiers.
+
+        Returns:
+            int: Cantidad de distribuciones eliminadas.
+        """
+        identifiers = set(identifiers)
+        found = set()
+        removed_count = 0
         for dataset in self["dataset"]:
-            for index, distribution in enumerate(dataset["distribution"]):
-                if (distribution["identifier"] == identifier and
-                        (not dataset_identifier or
-                         dataset["identifier"] == dataset_identifier)):
-                    dataset["distribution"].pop(index)
-                    logger.info("Distribution {} del dataset {}"
-                                "en posicion {} fue eliminada.".format(
-                                    identifier, dataset["identifier"], index))
-                    return
-
-        logger.warning("No se encontro la distribucion {}.".format(identifier))
+            distributions = dataset.get("distribution", [])
+            kept = [distribution for distribution in distributions
+                    if distribution.get("identifier") not in identifiers]
+            if len(kept) == len(distributions):
+                continue
+
+            for distribution in distributions:
+                if distribution.get("identifier") in identifiers:
+                    found.add(distribution["identifier"])
+                    self._unindex_distribution(dataset.get("identifier"),
+                                               distribution)
+                    if self._text_index is not None:
+                        self._text_index.remove_distribution(
+                            distribution["identifier"])
+            removed_count += len(distributions) - len(kept)
+            distributions[:] = kept
+            if "identifier" in dataset:
+                self._reindex_distributions(dataset)
+        self._search_indexes = None
+
+        not_found = identifiers.difference(found)
+        if not_found:
+            logger.warning("No se encontraron las distribuciones {}.".format(
+                ", ".join(sorted(not_found))))
+        logger.info("{} distribuciones fueron eliminadas.".format(
+            removed_count))
+        return removed_count
+
+    def _find_dataset_index(self, identifier):
+        """Devuelve la posición de un dataset, usando el índice por
+        identificador si está al día."""
+        datasets = self["dataset"]
+        entry = self._datasets_index.get(identifier)
+        if entry is not None:
+            dataset_index = entry["dataset_index"]
+            if dataset_index < len(datasets) and \
+                    datasets[dataset_index].get("identifier") == identifier:
+                return dataset_index
+
+        # el catálogo se modificó directamente: recorre los datasets
+        for dataset_index, dataset in enumerate(datasets):
+            if dataset.get("identifier") == identifier:
+                return dataset_index
+        return None
+
+    def _find_distribution_index(self, identifier, dataset_identifier=None):
+        """Devuelve el dataset de una distribución y su posición en él,
+        usando el índice por identificador si está al día."""
+        entry = self._distributions_index.get(identifier)
+        if entry is not None and (not dataset_identifier or
+                                  entry["dataset_identifier"] ==
+                                  dataset_identifier):
+            dataset_index = self._find_dataset_index(
+                entry["dataset_identifier"])
+            if dataset_index is not None:
+                dataset = self["dataset"][dataset_index]
+                distributions = dataset.get("distribution", [])
+                index = entry["distribution_index"]
+                if index < len(distributions) and \
+                        distributions[index].get("identifier") == identifier:
+                    return dataset, index
+
+        # el catálogo se modificó directamente: recorre las distribuciones
+        for dataset in self["dataset"]:
+            if dataset_identifier and \
+                    dataset.get("identifier") != dataset_identifier:
+                continue
+            for index, distribution in enumerate(
+                    dataset.get("distribution", [])):
+                if distribution.get("identifier") == identifier:
+                    return dataset, index
+        return None
 
     def is_valid_catalog(self, catalog=None, broken_links=False,
-                         broken_links_threads=1):
+                         broken_links_threads=1, workers=1):
         """Valida que un archivo `data.json` cumpla con el schema definido.
 
         Chequea que el data.json tiene todos los campos obligatorios y que
@@ -249,6 +711,8 @@ class DataJson(dict):
             catalog (str o dict): Catálogo (dict, JSON o XLSX) a ser validado.
                 Si no se pasa, valida este catálogo.
             broken_links(bool): Activa el checkeo de estados de urls
+            workers (int): Cantidad de procesos entre los que se reparte la
+                validación de los datasets.
 
         Returns:
             bool: True si el data.json cumple con el schema, sino False.
@@ -257,48 +721,18 @@ class DataJson(dict):
         return self.validator.is_valid(
             catalog, broken_links=broken_links, verify_ssl=self.verify_ssl,
             url_check_timeout=self.url_check_timeout,
-            broken_links_threads=broken_links_threads)
+            broken_links_threads=broken_links_threads,
+            transport=self.transport, **self._validation_kwargs(workers))
 
     @staticmethod
     def _update_validation_response(error, response):
         """Actualiza la respuesta por default acorde a un error de
         validación."""
-        new_response = response.copy()
-
-        # El status del catálogo entero será ERROR
-        new_response["status"] = "ERROR"
-
-        # Adapto la información del ValidationError recibido a los fines
-        # del validador de DataJsons
-        error_info = {
-            # Error Code 1 para "campo obligatorio faltante"
-            # Error Code 2 para "error en tipo o formato de campo"
-            "error_code": 1 if error.validator == "required" else 2,
-            "message": error.message,
-            "validator": error.validator,
-            "validator_value": error.validator_value,
-            "path": list(error.path),
-            # La instancia validada es irrelevante si el error es de tipo 1
-            "instance": (None if error.validator == "required" else
-                         error.instance)
-        }
-
-        # Identifico a qué nivel de jerarquía sucedió el error.
-        if len(error.path) >= 2 and error.path[0] == "dataset":
-            # El error está a nivel de un dataset particular o inferior
-            position = new_response["error"]["dataset"][error.path[1]]
-        else:
-            # El error está a nivel de catálogo
-            position = new_response["error"]["catalog"]
-
-        position["status"] = "ERROR"
-        position["errors"].append(error_info)
-
-        return new_response
+        return fill_response(response, [error])
 
     def validate_catalog(self, catalog=None, only_errors=False, fmt="dict",
                          export_path=None, broken_links=False,
-                         broken_links_threads=1):
+                         broken_links_threads=1, workers=1):
         """Analiza un data.json registrando los errores que encuentra.
 
         Chequea que el data.json tiene todos los campos obligatorios y que
@@ -317,6 +751,8 @@ class DataJson(dict):
             export_path (str): Path donde exportar el reporte generado (en
                 formato XLSX o CSV). Si se especifica, el método no devolverá
                 nada, a pesar de que se pase algún argumento en `fmt`.
+            workers (int): Cantidad de procesos entre los que se reparte la
+                validación de los datasets.
 
         Returns:
             dict: Diccionario resumen de los errores encontrados::
@@ -347,17 +783,59 @@ class DataJson(dict):
             error encontrado, con las siguientes claves: "path", "instance",
             "message", "validator", "validator_value", "error_code".
 
+            Si se chequean los links (`broken_links`), la clave "hosts"
+            tiene el estado de cada host chequeado ("OK", o "SKIPPED" si
+            se dejaron de chequear sus URLs por no responder).
+
         """
         catalog = self._read_catalog(catalog) if catalog else self
 
         validation = self.validator.validate_catalog(
             catalog, only_errors, broken_links, self.verify_ssl,
-            self.url_check_timeout, broken_links_threads)
+            self.url_check_timeout, broken_links_threads,
+            transport=self.transport, **self._validation_kwargs(workers))
         if export_path:
             fmt = 'table'
 
         return format_response(validation, export_path, fmt)
 
+    def get_validation_errors(self, catalog=None, broken_links=False,
+                              broken_links_threads=1, workers=1):
+        """Analiza un data.json y devuelve sus errores agrupados por dataset.
+
+        Es la representación compacta de validate_catalog(), para quien sólo
+        necesita saber qué datasets tienen errores y cuántos.
+
+        Args:
+            catalog (str o dict): Catálogo (dict, JSON o XLSX) a ser validado.
+                Si no se pasa, valida este catálogo.
+            broken_links(bool): Activa el checkeo de estados de urls
+            workers (int): Cantidad de procesos entre los que se reparte la
+                validación de los datasets.
+
+        Returns:
+            ValidationErrors: Errores de nivel catálogo y de cada dataset.
+        """
+        catalog = self._read_catalog(catalog) if catalog else self
+        return self.validator.get_validation_errors(
+            catalog, broken_links=broken_links, verify_ssl=self.verify_ssl,
+            url_check_timeout=self.url_check_timeout,
+            broken_links_threads=broken_links_threads,
+            transport=self.transport, **self._validation_kwargs(workers))
+
+    def _validation_kwargs(self, workers=1):
+        # sólo se pasan el caché, los workers y el motor de chequeo de links
+        # si se usan, para no romper las clases de validación propias
+        # (validator_class) que no los soportan
+        kwargs = {}
+        if self.validation_cache is not None:
+            kwargs["validation_cache"] = self.validation_cache
+        if self.link_checker is not None:
+            kwargs["link_checker"] = self.link_checker
+        if workers and workers > 1:
+            kwargs["workers"] = workers
+        return kwargs
+
     @staticmethod
     def _stringify_list(str_or_list):
 
@@ -581,12 +1059,11 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
         url = catalog if isinstance(catalog, string_types) else None
         catalog = self._read_catalog(catalog)
 
-        validation = self.validate_catalog(catalog)
-        catalog_validation = validation["error"]["catalog"]
-        datasets_validations = validation["error"]["dataset"]
+        validation = self.get_validation_errors(catalog)
 
         catalog_fields = self._catalog_report_helper(
-            catalog, catalog_validation, url, catalog_id, catalog_org
+            catalog, {"status": validation.catalog_status}, url, catalog_id,
+            catalog_org
         )
 
         if "dataset" in catalog and isinstance(catalog["dataset"], list):
@@ -597,7 +1074,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
 
         catalog_report = [
             self._dataset_report(
-                dataset, datasets_validations[index], index,
+                dataset, {"status": validation.dataset_status(index)}, index,
                 catalog_fields, harvest, report=report,
                 catalog_homepage=catalog_homepage
             )
@@ -609,7 +1086,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
     def generate_datasets_report(
             self, catalogs, harvest='valid', report=None,
             export_path=None, catalog_ids=None, catalog_homepages=None,
-            catalog_orgs=None
+            catalog_orgs=None, max_workers=constants.DEFAULT_READ_WORKERS
     ):
         """Genera un reporte sobre las condiciones de la metadata de los
         datasets contenidos en uno o varios catálogos.
@@ -630,6 +1107,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
                 implementado el catálogo. Sólo se pasa si el portal es un CKAN
                 o respeta la estructura:
                     https://datos.{organismo}.gob.ar/dataset/{dataset_identifier}
+            max_workers (int): Cantidad de catálogos que se leen en paralelo.
 
         Returns:
             list: Contiene tantos dicts como datasets estén presentes en
@@ -646,7 +1124,8 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
         if isinstance(catalogs, string_types + (dict,)):
             catalogs = [catalogs]
 
-        # convierto los catalogos a objetos DataJson
+        # leo los catalogos en paralelo y los convierto a objetos DataJson
+        catalogs = self._read_catalogs(catalogs, max_workers)
         catalogs = list(map(readers.read_catalog_obj, catalogs))
 
         if not catalog_ids:
@@ -711,7 +1190,8 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
             return full_report
 
     def generate_harvester_config(self, catalogs=None, harvest='valid',
-                                  report=None, export_path=None):
+                                  report=None, export_path=None,
+                                  max_workers=constants.DEFAULT_READ_WORKERS):
         """Genera un archivo de configuración del harvester a partir de un
         reporte, o de un conjunto de catálogos y un criterio de cosecha
         (`harvest`).
@@ -729,6 +1209,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
             export_path (str): Path donde exportar el reporte generado (en
                 formato XLSX o CSV). Si se especifica, el método no devolverá
                 nada.
+            max_workers (int): Cantidad de catálogos que se leen en paralelo.
 
         Returns:
             list of dicts: Un diccionario con variables de configuración
@@ -748,7 +1229,8 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
         elif harvest in ['valid', 'none', 'all']:
             # catalogs no puede faltar para estos criterios
             assert isinstance(catalogs, string_types + (dict, list))
-            datasets_report = self.generate_datasets_report(catalogs, harvest)
+            datasets_report = self.generate_datasets_report(
+                catalogs, harvest, max_workers=max_workers)
         else:
             raise ValueError("""
 {} no es un criterio de harvest reconocido. Pruebe con 'all', 'none', 'valid' o
@@ -816,7 +1298,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
         if isinstance(catalogs, string_types + (dict,)):
             catalogs = [catalogs]
 
-        harvestable_catalogs = [self._read_catalog(c) for c in catalogs]
+        harvestable_catalogs = self._read_catalogs(catalogs)
         catalogs_urls = [catalog if isinstance(catalog, string_types)
                          else None for catalog in catalogs]
 
@@ -899,7 +1381,7 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
             # Si no, considero que no hay datasets presentes
             datasets = []
 
-        validation = self.validate_catalog(catalog)["error"]["dataset"]
+        validation = self.get_validation_errors(catalog)
 
         def info_dataset(index, dataset):
             """Recolecta información básica de un dataset."""
@@ -907,8 +1389,8 @@ el argumento 'report'. Por favor, intentelo nuevamente.""")
             info["indice"] = index
             info["titulo"] = dataset.get("title")
             info["identificador"] = dataset.get("identifier")
-            info["estado_metadatos"] = validation[index]["status"]
-            info["cant_errores"] = len(validation[index]["errors"])
+            info["estado_metadatos"] = validation.dataset_status(index)
+            info["cant_errores"] = validation.dataset_errors_count(index)
             info["cant_distribuciones"] = len(dataset["distribution"])
 
             return info
@@ -969,14 +1451,17 @@ El reporte no contiene la clave obligatoria {}. Pruebe con otro archivo.
                                      central_catalog=None,
                                      identifier_search=False,
                                      broken_links=False,
-                                     broken_links_threads=1):
+                                     broken_links_threads=1,
+                                     max_workers=None):
         catalogs = catalogs or self
+        max_workers = max_workers or constants.DEFAULT_READ_WORKERS
         return indicators.generate_catalogs_indicators(
             catalogs, central_catalog, identifier_search=identifier_search,
             validator=self.validator, broken_links=broken_links,
             verify_ssl=self.verify_ssl,
             url_check_timeout=self.url_check_timeout,
-            broken_links_threads=broken_links_threads)
+            broken_links_threads=broken_links_threads,
+            max_workers=max_workers)
 
     def _count_fields_recursive(self, dataset, fields):
         """Cuenta la información de campos optativos/recomendados/requeridos
@@ -1115,10 +1600,27 @@ El reporte no contiene la clave obligatoria {}. Pruebe con otro archivo.
         # TODO: implementar función
         pass
 
+    def _read_catalogs(self, catalogs,
+                       max_workers=constants.DEFAULT_READ_WORKERS):
+        """Lee varios catálogos en paralelo con la configuración de este
+        objeto. Si alguno no se puede leer, levanta su error."""
+        results = readers.read_catalogs(
+            catalogs, max_workers=max_workers, verify=self.verify_ssl,
+            timeout=self.requests_timeout, http_cache=self.http_cache,
+            transport=self.transport)
+
+        for _, error in results:
+            if error:
+                raise error
+
+        return [catalog for catalog, _ in results]
+
     def _read_catalog(self, catalog):
         return readers.read_catalog(catalog,
                                     verify=self.verify_ssl,
-                                    timeout=self.requests_timeout)
+                                    timeout=self.requests_timeout,
+                                    http_cache=self.http_cache,
+                                    transport=self.transport)
 
 
 def main():
@@ -422,3 +422,20 @@ class FormatNameError(ValueError):
 class NumericDistributionIdentifierError(ValueError):
     """La distribucion tiene un id puramente numerico"""
     pass
+
+
+class InvalidQueryError(ValueError):
+    """La consulta a un catálogo no tiene un formato válido."""
+
+    def __init__(self, query, reason):
+        msg = "Consulta inválida ({}): {}".format(reason, query)
+        super(InvalidQueryError, self).__init__(msg)
+
+
+class LazyCatalogError(ValueError):
+    """La operación necesita el catálogo completo y el DataJson es lazy."""
+
+    def __init__(self, operation):
+        msg = ("No se puede {} un DataJson lazy: cree el DataJson con "
+               "lazy=False para cargar el catálogo completo").format(operation)
+        super(LazyCatalogError, self).__init__(msg)
@@ -3,16 +3,29 @@
 from ckanapi import RemoteCKAN
 
 from pydatajson.constants import REQUESTS_TIMEOUT
+from pydatajson.transport import get_default_transport
 
 
 class CustomRemoteCKAN(RemoteCKAN):
 
     def __init__(self, address, apikey=None, user_agent=None, get_only=False,
-                 verify_ssl=False, requests_timeout=REQUESTS_TIMEOUT):
+                 verify_ssl=False, requests_timeout=REQUESTS_TIMEOUT,
+                 transport=None):
         self.verify_ssl = verify_ssl
         self.requests_timeout = requests_timeout
-        super(CustomRemoteCKAN, self).__init__(address, apikey,
-                                               user_agent, get_only)
+        # usa la sesión del transporte compartido en lugar de abrir una
+        # propia, para reutilizar las conexiones al portal
+        self.transport = transport or get_default_transport()
+        try:
+            super(CustomRemoteCKAN, self).__init__(
+                address, apikey, user_agent, get_only,
+                session=self.transport.session)
+        except TypeError:
+            # ckanapi < 4.1 no recibe la sesión: la crea recién al primer
+            # pedido, así que alcanza con asignarla
+            super(CustomRemoteCKAN, self).__init__(address, apikey,
+                                                   user_agent, get_only)
+            self.session = self.transport.session
 
     def call_action(self, action, data_dict=None, context=None, apikey=None,
                     files=None, requests_kwargs=None):
@@ -21,3 +34,9 @@ class CustomRemoteCKAN(RemoteCKAN):
         requests_kwargs.setdefault('timeout', self.requests_timeout)
         return super(CustomRemoteCKAN, self).call_action(
             action, data_dict, context, apikey, files, requests_kwargs)
+
+    def close(self):
+        # la sesión del transporte compartido la sigue usando el transporte:
+        # sólo se cierra una sesión que haya abierto ckanapi
+        if self.session is not self.transport.session:
+            super(CustomRemoteCKAN, self).close()
@@ -12,11 +12,14 @@ import requests
 import time
 import sys
 
+from pydatajson.transport import get_default_transport
+
 DEFAULT_TRIES = 3
 RETRY_DELAY = 1
 
 
-def download(url, file_path, tries=DEFAULT_TRIES, retry_delay=RETRY_DELAY):
+def download(url, file_path, tries=DEFAULT_TRIES, retry_delay=RETRY_DELAY,
+             transport=None):
     """
     Descarga un archivo a través del protocolo HTTP, en uno o más intentos.
 
@@ -29,20 +32,24 @@ def download(url, file_path, tries=DEFAULT_TRIES, retry_delay=RETRY_DELAY):
         proxies (dict): Proxies a utilizar. El diccionario debe contener los
             valores 'http' y 'https', cada uno asociados a la URL del proxy
             correspondiente.
+        transport (Transport): Transporte HTTP con el que se descarga el
+            archivo. Si no se pasa, se usa el transporte por defecto.
 
     Returns:
         bytes: Contenido del archivo
     """
     timeout = 10
+    transport = transport or get_default_transport()
     for i in range(1, tries + 1):
         try:
-            with requests.get(url, timeout=timeout ** i, stream=True,
-                              verify=False) as r:
+            with transport.get(url, timeout=timeout ** i, stream=True,
+                               verify=False) as r:
                 r.raise_for_status()
                 with open(file_path, 'wb') as f:
                     for chunk in r.iter_content(chunk_size=8192):
                         if chunk:  # filter out keep-alive new chunks
                             f.write(chunk)
+            return
 
         except requests.TooManyRedirects as e:
             raise e
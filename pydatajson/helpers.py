@@ -70,6 +70,14 @@ def dataset_has_data_distributions(dataset):
     return has_data_format
 
 
+def iter_catalog_datasets(catalog):
+    """Itera los datasets de un catálogo ya leído. Los de un DataJson lazy
+    se leen de su fuente de a uno, sin cargarlos todos en memoria."""
+    if getattr(catalog, "lazy", False):
+        return catalog.iter_datasets()
+    return iter(catalog.get("dataset", []))
+
+
 def title_to_name(title, decode=True, max_len=None, use_complete_words=True):
     """Convierte un título en un nombre normalizado para generar urls."""
     # decodifica y pasa a minúsculas
@@ -150,6 +158,39 @@ def ensure_dir_exists(directory):
         os.makedirs(directory)
 
 
+def write_file_atomically(path, content):
+    """Escribe bytes en un archivo sin dejarlo a medio escribir.
+
+    El contenido se escribe primero en un archivo temporal del mismo
+    directorio, que luego se renombra al path final.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or None)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        _replace_file(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _replace_file(src, dst):
+    """Renombra src a dst pisando dst si existe, en un solo paso salvo en
+    Windows con Python 2."""
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    elif os.name == "nt":
+        # os.rename no pisa archivos existentes en Windows
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        os.rename(src, dst)
+    else:
+        os.rename(src, dst)
+
+
 def traverse_dict(dicc, keys, default_value=None):
     """Recorre un diccionario siguiendo una lista de claves, y devuelve
     default_value en caso de que alguna de ellas no exista.
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'http_cache' de Pydatajson
+
+Contiene un caché en disco de respuestas HTTP. Guarda los validadores ETag y
+Last-Modified de cada respuesta y hace pedidos condicionales, de forma que un
+catálogo remoto que no cambió se sirve desde el disco (respuesta 304) sin
+volver a descargarse.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+from pydatajson.constants import REQUESTS_TIMEOUT
+from pydatajson.helpers import ensure_dir_exists, write_file_atomically
+from pydatajson.transport import get_default_transport
+
+logger = logging.getLogger('pydatajson')
+
+DEFAULT_MAX_SIZE = 500 * 1024 * 1024  # 500 MB
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Devuelve el caché HTTP usado por defecto por los readers (o None)."""
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """Configura el caché HTTP usado por defecto por los readers.
+
+    Args:
+        cache (HttpCache): Caché a usar en todas las lecturas de catálogos
+            remotos que no especifiquen uno. None lo desactiva.
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+class HttpCache(object):
+    """Caché en disco de respuestas HTTP con pedidos condicionales.
+
+    Cada URL se guarda en dos archivos: el cuerpo de la respuesta y sus
+    metadatos (ETag, Last-Modified y tamaño). La fecha de modificación del
+    archivo de metadatos registra el último acceso, y cuando el caché supera
+    `max_size` se eliminan las entradas usadas menos recientemente.
+
+    Args:
+        cache_dir (str): Directorio donde se guardan las respuestas.
+        max_size (int): Tamaño máximo, en bytes, de los cuerpos guardados.
+    """
+
+    META_SUFFIX = ".meta"
+    BODY_SUFFIX = ".body"
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        ensure_dir_exists(cache_dir)
+
+    def get(self, url, verify=False, timeout=REQUESTS_TIMEOUT, transport=None,
+            **kwargs):
+        """Descarga una URL, usando la copia en disco si sigue vigente.
+
+        Args:
+            url (str): URL a descargar.
+            verify (bool): Verificar certificados SSL.
+            timeout (int): Timeout del pedido HTTP, en segundos.
+            transport (Transport): Transporte HTTP con el que se hace el
+                pedido. Si no se pasa, se usa el transporte por defecto.
+            kwargs: Otros parámetros para requests.get().
+
+        Returns:
+            bytes: Contenido de la respuesta.
+        """
+        key = self._key(url)
+        meta = self._read_meta(key)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        conditional_headers = dict(headers)
+        if meta:
+            if meta.get("etag"):
+                conditional_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = \
+                    meta["last_modified"]
+
+        transport = transport or get_default_transport()
+        response = transport.get(url, headers=conditional_headers,
+                                 verify=verify, timeout=timeout, **kwargs)
+
+        if response.status_code == 304 and meta:
+            content = self._read_body(key)
+            if content is not None:
+                logger.debug("{} servido desde el cache".format(url))
+                self._touch(key)
+                return content
+
+            # la copia en disco se perdió: el 304 no trae el contenido, así
+            # que se descarta la entrada y se repite el pedido sin validadores
+            logger.debug("{} sin copia en el cache".format(url))
+            with self._lock:
+                self._remove(key)
+            response = transport.get(url, headers=headers, verify=verify,
+                                     timeout=timeout, **kwargs)
+
+        if response.status_code == 200:
+            self._store(key, url, response)
+
+        return response.content
+
+    def clear(self):
+        """Elimina todas las entradas del caché."""
+        with self._lock:
+            for key in self._keys():
+                self._remove(key)
+
+    def size(self):
+        """Devuelve el tamaño total, en bytes, de los cuerpos guardados."""
+        return sum(meta["size"] for _, meta, _ in self._entries())
+
+    def _store(self, key, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        content = response.content
+
+        # sin validadores no hay forma de hacer un pedido condicional
+        if not (etag or last_modified) or len(content) > self.max_size:
+            with self._lock:
+                self._remove(key)
+            return
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(content)
+        }
+        with self._lock:
+            write_file_atomically(
+                self._path(key, self.BODY_SUFFIX), content)
+            write_file_atomically(
+                self._path(key, self.META_SUFFIX),
+                json.dumps(meta).encode("utf-8"))
+            self._evict(keep=key)
+
+    def _evict(self, keep=None):
+        """Elimina las entradas menos usadas hasta respetar `max_size`."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total_size = sum(meta["size"] for _, meta, _ in entries)
+
+        for key, meta, _ in entries:
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            total_size -= meta["size"]
+
+    def _entries(self):
+        """Itera las tuplas (key, metadatos, último acceso) del caché."""
+        for key in self._keys():
+            meta_path = self._path(key, self.META_SUFFIX)
+            meta = self._read_meta(key)
+            if meta:
+                try:
+                    yield key, meta, os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+
+    def _keys(self):
+        return [filename[:-len(self.META_SUFFIX)]
+                for filename in os.listdir(self.cache_dir)
+                if filename.endswith(self.META_SUFFIX)]
+
+    def _read_meta(self, key):
+        try:
+            with io.open(self._path(key, self.META_SUFFIX), "rb") as f:
+                return json.loads(f.read().decode("utf-8"))
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _read_body(self, key):
+        try:
+            with io.open(self._path(key, self.BODY_SUFFIX), "rb") as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def _touch(self, key):
+        try:
+            os.utime(self._path(key, self.META_SUFFIX), None)
+        except OSError:
+            pass
+
+    def _remove(self, key):
+        for suffix in (self.META_SUFFIX, self.BODY_SUFFIX):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
@@ -19,15 +19,19 @@ from datetime import datetime
 from six import string_types
 
 from pydatajson.helpers import fields_to_uppercase
+from pydatajson.link_checker import LinkChecker, UrlCheckPlanner
 from pydatajson.status_indicators_generator import StatusIndicatorsGenerator
+from . import constants
 from . import helpers
 from . import readers
 from .federation_indicators_generator import FederationIndicatorsGenerator
-from .search import get_datasets, get_distributions
+from .search import iter_datasets, iter_distributions
 
 CENTRAL_CATALOG = "http://datos.gob.ar/data.json"
 ABSOLUTE_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 CATALOG_FIELDS_PATH = os.path.join(ABSOLUTE_PROJECT_DIR, "fields")
+# metadatos de los datasets que usan los indicadores de federación
+FEDERATION_DATASET_FIELDS = ('identifier', 'title', 'landingPage')
 
 
 logger = logging.getLogger('pydatajson')
@@ -49,7 +53,8 @@ def generate_catalogs_indicators(catalogs, central_catalog=None,
                                  validator=None,
                                  verify_ssl=True,
                                  url_check_timeout=1,
-                                 broken_links_threads=1):
+                                 broken_links_threads=1,
+                                 max_workers=constants.DEFAULT_READ_WORKERS):
     """Genera una lista de diccionarios con varios indicadores sobre
     los catálogos provistos, tales como la cantidad de datasets válidos,
     días desde su última fecha actualizada, entre otros.
@@ -60,6 +65,10 @@ def generate_catalogs_indicators(catalogs, central_catalog=None,
         central_catalog (str): catálogo central sobre el cual comparar los
             datasets subidos en la lista anterior. De no pasarse no se
             generarán indicadores de federación de datasets.
+        max_workers (int): Cantidad de catálogos que se leen en paralelo.
+        broken_links (bool): Genera indicadores sobre el estado de las URLs
+            de descarga. Las URLs de todos los catálogos se chequean juntas,
+            pidiendo una sola vez las que se repiten.
 
     Returns:
         tuple: 2 elementos, el primero una lista de diccionarios con los
@@ -76,20 +85,33 @@ def generate_catalogs_indicators(catalogs, central_catalog=None,
     # Cuenta la cantidad de campos usados/recomendados a nivel global
     fields = {}
     catalogs_cant = 0
-    for catalog in catalogs:
-        try:
-            catalog = readers.read_catalog(catalog)
-            catalogs_cant += 1
-        except Exception as e:
-            msg = u'Error leyendo catálogo de la lista: {}'.format(str(e))
+    planner = None
+    planned = []
+    if broken_links:
+        planner = UrlCheckPlanner(LinkChecker(
+            timeout=url_check_timeout, verify_ssl=verify_ssl,
+            max_workers=broken_links_threads))
+    for catalog, error in readers.read_catalogs(catalogs,
+                                                max_workers=max_workers):
+        if error:
+            msg = u'Error leyendo catálogo de la lista: {}'.format(str(error))
             logger.warning(msg)
             continue
+        catalogs_cant += 1
 
-        fields_count, result = _generate_indicators(
-            catalog, validator=validator,
-            broken_links=broken_links, verify_ssl=verify_ssl,
+        # el resumen del catálogo se arma (y se valida) una sola vez para
+        # los indicadores de estado y los de URLs
+        generator = _status_indicators_generator(
+            catalog, validator=validator, verify_ssl=verify_ssl,
             url_check_timeout=url_check_timeout,
-            broken_links_threads=broken_links_threads)
+            threads_count=broken_links_threads,
+            link_checker=planner.link_checker if planner else None)
+        fields_count, result = _generate_indicators(
+            catalog, validator=validator, verify_ssl=verify_ssl,
+            generator=generator)
+        if planner and generator:
+            planned.append((result, generator,
+                            generator.plan_download_urls(planner)))
         if central_catalog:
             result.update(_federation_indicators(
                 catalog, central_catalog, identifier_search=identifier_search))
@@ -110,6 +132,16 @@ def generate_catalogs_indicators(catalogs, central_catalog=None,
         # No se pudo leer ningún catálogo
         return [], {}
 
+    if planned:
+        # Chequeo juntas las URLs de todos los catálogos
+        planned_results = planner.run()
+        for result, generator, position in planned:
+            generator.download_url_ok = planned_results[position]
+            urls_indicators = _valid_urls_indicators(generator)
+            result.update(urls_indicators)
+            network_indicators = helpers.add_dicts(network_indicators,
+                                                   urls_indicators)
+
     # Indicadores de la red entera
     network_indicators['catalogos_cant'] = catalogs_cant
     # Genero los indicadores de la red entera,
@@ -120,28 +152,34 @@ def generate_catalogs_indicators(catalogs, central_catalog=None,
 
 def _generate_indicators(catalog, validator=None, only_numeric=False,
                          broken_links=False, verify_ssl=True,
-                         url_check_timeout=1, broken_links_threads=1):
+                         url_check_timeout=1, broken_links_threads=1,
+                         generator=None):
     """Genera los indicadores de un catálogo individual.
 
+    Los datasets de un DataJson lazy se recorren desde su fuente, sin
+    cargarlos todos en memoria.
+
     Args:
         catalog (dict): diccionario de un data.json parseado
+        generator (StatusIndicatorsGenerator): resumen ya armado del
+            catálogo. Si no se pasa, se arma uno.
 
     Returns:
         dict: diccionario con los indicadores del catálogo provisto
     """
-
     result = {}
 
     # Obtengo summary para los indicadores del estado de los metadatos
-    result.update(_generate_status_indicators(catalog, validator=validator,
-                                              verify_ssl=verify_ssl))
+    if generator is None:
+        generator = _status_indicators_generator(
+            catalog, validator=validator, verify_ssl=verify_ssl,
+            url_check_timeout=url_check_timeout,
+            threads_count=broken_links_threads)
+    result.update(_generate_status_indicators(generator))
 
     # Genero indicadores relacionados con validacion de urls
     if broken_links:
-        result.update(_generate_valid_urls_indicators(
-            catalog, validator=validator, verify_ssl=verify_ssl,
-            url_check_timeout=url_check_timeout,
-            threads_count=broken_links_threads))
+        result.update(_generate_valid_urls_indicators(generator))
 
     # Genero los indicadores relacionados con fechas, y los agrego
     result.update(
@@ -149,11 +187,12 @@ def _generate_indicators(catalog, validator=None, only_numeric=False,
 
     # Agrego la cuenta de los formatos de las distribuciones
     if not only_numeric:
-        if 'dataset' in catalog:
-            format_count = count_fields(get_distributions(catalog), 'format')
+        if 'dataset' in catalog or getattr(catalog, 'lazy', False):
+            format_count = count_fields(iter_distributions(catalog),
+                                        'format')
             format_count = fields_to_uppercase(format_count)
-            type_count = count_fields(get_distributions(catalog), 'type')
-            license_count = count_fields(get_datasets(catalog), 'license')
+            type_count = count_fields(iter_distributions(catalog), 'type')
+            license_count = count_fields(iter_datasets(catalog), 'license')
         else:
             format_count = type_count = license_count = {}
 
@@ -205,6 +244,8 @@ def _federation_indicators(catalog, central_catalog,
         logger.warning(msg)
         return result
 
+    if getattr(catalog, 'lazy', False):
+        catalog = _federation_catalog(catalog)
     generator = FederationIndicatorsGenerator(central_catalog, catalog,
                                               id_based=identifier_search)
     result.update({
@@ -228,6 +269,28 @@ def _federation_indicators(catalog, central_catalog,
     return result
 
 
+def _federation_catalog(catalog):
+    """Arma una copia de un DataJson lazy con sólo los metadatos de sus
+    datasets que se comparan con los del catálogo central."""
+    datasets = []
+    for dataset in helpers.iter_catalog_datasets(catalog):
+        federation_dataset = {
+            key: dataset[key] for key in FEDERATION_DATASET_FIELDS
+            if key in dataset
+        }
+        publisher = dataset.get('publisher')
+        if isinstance(publisher, dict):
+            federation_dataset['publisher'] = {
+                key: publisher[key] for key in ('name',) if key in publisher
+            }
+        if 'distribution' in dataset:
+            # de las distribuciones sólo se usa la cantidad
+            federation_dataset['distribution'] = [
+                {} for _ in dataset['distribution']]
+        datasets.append(federation_dataset)
+    return dict(catalog, dataset=datasets)
+
+
 def _network_indicator_percentages(fields, network_indicators):
     """Encapsula el cálculo de indicadores de porcentaje (de errores,
     de campos recomendados/optativos utilizados, de datasets actualizados)
@@ -285,11 +348,12 @@ def _network_indicator_percentages(fields, network_indicators):
         })
 
 
-def _generate_status_indicators(catalog, validator=None, verify_ssl=True):
+def _generate_status_indicators(generator):
     """Genera indicadores básicos sobre el estado de un catálogo
 
     Args:
-        catalog (dict): diccionario de un data.json parseado
+        generator (StatusIndicatorsGenerator): resumen del catálogo, o None
+            si no se pudo armar
 
     Returns:
         dict: indicadores básicos sobre el catálogo, tal como la cantidad
@@ -305,14 +369,7 @@ def _generate_status_indicators(catalog, validator=None, verify_ssl=True):
         'datasets_sin_datos_cant': None,
         'datasets_con_datos_pct': None
     }
-    try:
-        generator = StatusIndicatorsGenerator(catalog,
-                                              validator=validator,
-                                              verify_ssl=verify_ssl)
-    except Exception as e:
-        msg = u'Error generando resumen del catálogo {}: {}'.format(
-            catalog['title'], str(e))
-        logger.warning(msg)
+    if not generator:
         return result
 
     result.update({
@@ -377,9 +434,11 @@ def _generate_date_indicators(catalog, tolerance=0.2, only_numeric=False):
 
     actualizados = 0
     desactualizados = 0
+    datasets_total = 0
     periodicity_amount = {}
 
-    for dataset in catalog.get('dataset', []):
+    for dataset in helpers.iter_catalog_datasets(catalog):
+        datasets_total += 1
         # Parseo la fecha de publicación, y la frecuencia de actualización
         periodicity = dataset.get('accrualPeriodicity')
         if not periodicity:
@@ -421,7 +480,6 @@ def _generate_date_indicators(catalog, tolerance=0.2, only_numeric=False):
         prev_periodicity = periodicity_amount.get(periodicity, 0)
         periodicity_amount[periodicity] = prev_periodicity + 1
 
-    datasets_total = len(catalog.get('dataset', []))
     actualizados_pct = 0
     if datasets_total:
         actualizados_pct = float(actualizados) / datasets_total
@@ -461,7 +519,7 @@ def _days_from_last_update(catalog, date_field="modified"):
         dias_ultima_actualizacion = (
             datetime.now() - date).days if date else None
 
-    for dataset in catalog.get('dataset', []):
+    for dataset in helpers.iter_catalog_datasets(catalog):
         date = helpers.parse_date_string(dataset.get(date_field, ""))
         days_diff = float((datetime.now() - date).days) if date else None
 
@@ -498,8 +556,18 @@ def _count_required_and_optional_fields(catalog):
     with open(catalog_fields_path) as f:
         catalog_fields = json.load(f)
 
-    # Armado recursivo del resultado
-    return _count_fields_recursive(catalog, catalog_fields)
+    if not getattr(catalog, 'lazy', False):
+        # Armado recursivo del resultado
+        return _count_fields_recursive(catalog, catalog_fields)
+
+    # en un DataJson lazy, los datasets se cuentan a medida que se leen
+    key_count = _count_fields_recursive(dict(catalog, dataset=[]),
+                                        catalog_fields)
+    for dataset in catalog.iter_datasets():
+        key_count = helpers.add_dicts(
+            key_count,
+            _count_fields_recursive(dataset, catalog_fields['dataset']))
+    return key_count
 
 
 def _count_fields_recursive(dataset, fields):
@@ -568,37 +636,45 @@ def _eventual_periodicity(periodicity):
     return periodicity in ('eventual', 'EVENTUAL')
 
 
-def _generate_valid_urls_indicators(catalog, validator=None, verify_ssl=True,
-                                    url_check_timeout=1, threads_count=1):
+def _generate_valid_urls_indicators(generator):
     """Genera indicadores sobre el estado de las urls de distribuciones
 
     Args:
-        catalog (dict): diccionario de un data.json parseado
+        generator (StatusIndicatorsGenerator): resumen del catálogo, o None
+            si no se pudo armar
 
     Returns:
         dict: indicadores sobre las urls de las distribuciones del catálogo
     """
+    if not generator:
+        return {}
 
-    result = {}
+    return _valid_urls_indicators(generator)
+
+
+def _status_indicators_generator(catalog, validator=None, verify_ssl=True,
+                                 url_check_timeout=1, threads_count=1,
+                                 link_checker=None):
+    """Arma el resumen de un catálogo del que salen los indicadores de
+    estado y de URLs, o devuelve None si no se pudo armar."""
     try:
-        generator = \
-            StatusIndicatorsGenerator(
-                catalog, validator=validator, verify_ssl=verify_ssl,
-                url_check_timeout=url_check_timeout,
-                threads_count=threads_count)
+        return StatusIndicatorsGenerator(
+            catalog, validator=validator, verify_ssl=verify_ssl,
+            url_check_timeout=url_check_timeout,
+            threads_count=threads_count, link_checker=link_checker)
     except Exception as e:
         msg = u'Error generando resumen del catálogo {}: {}'.format(
             catalog['title'], str(e))
         logger.warning(msg)
-        return result
+        return None
 
-    result.update({
+
+def _valid_urls_indicators(generator):
+    return {
         'distribuciones_download_url_ok_cant':
             generator.distribuciones_download_url_ok_cant(),
         'distribuciones_download_url_error_cant':
             generator.distribuciones_download_url_error_cant(),
         'distribuciones_download_url_ok_pct':
             generator.distribuciones_download_url_ok_pct(),
-    })
-
-    return result
+    }
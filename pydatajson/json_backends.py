@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'json_backends' de Pydatajson
+
+Permite elegir la librería con la que se leen y escriben catálogos en JSON.
+Además de la librería estándar se soportan orjson, python-rapidjson y ujson,
+que se usan sólo si están instaladas.
+
+Con el backend "auto" (el default) se usa la librería más rápida disponible
+que produce exactamente el mismo resultado que la estándar: para leer,
+orjson (rapidjson y ujson no leen más rápido que `json` en Python 3); para
+escribir, rapidjson, cuya salida es idéntica byte a byte. Si un backend no
+puede procesar un documento (por ejemplo, un entero de más de 64 bits o
+claves no string), se reintenta con la librería estándar, de forma que los
+errores son siempre los de `json`.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import json
+import logging
+from collections import OrderedDict
+
+from six import text_type, binary_type
+
+logger = logging.getLogger('pydatajson')
+
+AUTO = "auto"
+
+
+class JSONBackend(object):
+    """Backend basado en la librería estándar `json`.
+
+    Las subclases sobreescriben loads() y dumps() con la librería que
+    envuelven. dumps() debe devolver texto con el mismo formato que
+    json.dumps(obj, indent=indent, ensure_ascii=False) y separadores
+    (",", ": ") al indentar o (",", ":") sin indentación.
+    """
+
+    name = "json"
+
+    def loads(self, content):
+        return json.loads(content)
+
+    def dumps(self, obj, indent=None):
+        separators = (",", ": ") if indent is not None else (",", ":")
+        return text_type(json.dumps(obj, indent=indent, separators=separators,
+                                    ensure_ascii=False))
+
+
+class OrjsonBackend(JSONBackend):
+    """Backend basado en orjson.
+
+    orjson sólo sabe indentar con 2 espacios, por lo que al escribir el
+    resultado es semánticamente equivalente pero no idéntico al de `json`.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, content):
+        return self._orjson.loads(content)
+
+    def dumps(self, obj, indent=None):
+        option = self._orjson.OPT_INDENT_2 if indent else 0
+        return self._orjson.dumps(obj, option=option).decode("utf-8")
+
+
+class RapidjsonBackend(JSONBackend):
+    """Backend basado en python-rapidjson."""
+
+    name = "rapidjson"
+
+    def __init__(self):
+        import rapidjson
+        self._rapidjson = rapidjson
+
+    def loads(self, content):
+        if isinstance(content, binary_type):
+            content = content.decode("utf-8")
+        return self._rapidjson.loads(content)
+
+    def dumps(self, obj, indent=None):
+        return self._rapidjson.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+class UjsonBackend(JSONBackend):
+    """Backend basado en ujson.
+
+    ujson escribe algunos números de punto flotante con otra notación
+    (1e-7 en lugar de 1e-07), por lo que al escribir el resultado es
+    semánticamente equivalente pero no siempre idéntico al de `json`.
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, content):
+        return self._ujson.loads(content)
+
+    def dumps(self, obj, indent=None):
+        return self._ujson.dumps(obj, indent=indent or 0, ensure_ascii=False,
+                                 escape_forward_slashes=False)
+
+
+BACKEND_CLASSES = OrderedDict([
+    (OrjsonBackend.name, OrjsonBackend),
+    (RapidjsonBackend.name, RapidjsonBackend),
+    (UjsonBackend.name, UjsonBackend),
+    (JSONBackend.name, JSONBackend),
+])
+
+# orden de preferencia del backend "auto"
+AUTO_LOADS_BACKENDS = ["orjson", "json"]
+AUTO_DUMPS_BACKENDS = ["rapidjson", "json"]
+
+_stdlib_backend = JSONBackend()
+_backends = {JSONBackend.name: _stdlib_backend}
+_default_backend = AUTO
+
+
+def _load_backend(name):
+    if name not in _backends:
+        try:
+            _backends[name] = BACKEND_CLASSES[name]()
+        except ImportError:
+            _backends[name] = None
+    return _backends[name]
+
+
+def available_backends():
+    """Devuelve los nombres de los backends instalados."""
+    return [name for name in BACKEND_CLASSES if _load_backend(name)]
+
+
+def get_default_backend():
+    """Devuelve el nombre del backend usado por defecto."""
+    return _default_backend
+
+
+def set_default_backend(name):
+    """Configura el backend usado por defecto para leer y escribir JSON.
+
+    Args:
+        name (str): "auto", "orjson", "rapidjson", "ujson" o "json".
+    """
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
+
+
+def get_backend(name=None, operation="loads"):
+    """Devuelve el backend a usar para una operación.
+
+    Args:
+        name (str): Nombre del backend. Si es None se usa el default.
+        operation (str): "loads" o "dumps"; determina qué backend se elige
+            en modo "auto".
+
+    Returns:
+        JSONBackend: Backend a usar.
+    """
+    name = name or _default_backend
+
+    if name == AUTO:
+        preferred = AUTO_LOADS_BACKENDS if operation == "loads" \
+            else AUTO_DUMPS_BACKENDS
+        for candidate in preferred:
+            backend = _load_backend(candidate)
+            if backend:
+                return backend
+
+    if name not in BACKEND_CLASSES:
+        raise ValueError("Backend JSON desconocido: {}. Opciones: {}".format(
+            name, ", ".join([AUTO] + list(BACKEND_CLASSES))))
+
+    backend = _load_backend(name)
+    if not backend:
+        raise ValueError(
+            "El backend JSON {} no está instalado.".format(name))
+
+    return backend
+
+
+def loads(content, backend=None):
+    """Deserializa un documento JSON.
+
+    Args:
+        content (str or bytes): Documento JSON. Si son bytes, deben estar
+            codificados en UTF-8.
+        backend (str): Backend a usar. Si es None se usa el default.
+
+    Returns:
+        object: El objeto deserializado.
+    """
+    json_backend = get_backend(backend, "loads")
+    if json_backend is not _stdlib_backend:
+        try:
+            return json_backend.loads(content)
+        except Exception as e:
+            logger.debug("{} no pudo leer el JSON ({}), se reintenta con "
+                         "json".format(json_backend.name, e))
+
+    return _stdlib_backend.loads(content)
+
+
+def dumps(obj, indent=None, backend=None):
+    """Serializa un objeto a texto JSON, sin escapar caracteres no ASCII.
+
+    Args:
+        obj (object): Objeto a serializar.
+        indent (int): Cantidad de espacios de indentación.
+        backend (str): Backend a usar. Si es None se usa el default.
+
+    Returns:
+        str: El texto JSON.
+    """
+    json_backend = get_backend(backend, "dumps")
+    if json_backend is not _stdlib_backend:
+        try:
+            return json_backend.dumps(obj, indent=indent)
+        except Exception as e:
+            logger.debug("{} no pudo escribir el JSON ({}), se reintenta con "
+                         "json".format(json_backend.name, e))
+
+    return _stdlib_backend.dumps(obj, indent=indent)
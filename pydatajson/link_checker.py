@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'link_checker' de Pydatajson
+
+Contiene el motor que chequea si las URLs de un catálogo funcionan. Reparte
+los chequeos en un pool de threads con un límite global de concurrencia y un
+límite por host, intercalando los hosts para que un servidor con muchos
+recursos no acapare el pool, y corta los chequeos pendientes al superar un
+tiempo límite total.
+
+Lleva además el estado de salud de cada host: ajusta el timeout de cada uno
+según la latencia observada y deja de chequear las URLs de un host que no
+responde varias veces seguidas, hasta que pasado un tiempo una URL de
+prueba vuelve a responder.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import logging
+import re
+import threading
+import math
+import time
+from collections import OrderedDict, deque
+
+from requests import RequestException, Timeout
+from six import string_types
+from six.moves.urllib_parse import urlparse
+
+from pydatajson.constants import EXCEPTION_STATUS_CODES, \
+    INVALID_STATUS_CODES_REGEX, DEFAULT_CHECK_TIMEOUT, \
+    DEFAULT_LINK_CHECK_PER_HOST, DEFAULT_HOST_MAX_FAILURES, \
+    DEFAULT_HOST_RETRY_AFTER
+from pydatajson.threading_helper import WorkerPool, get_default_pool
+from pydatajson.transport import get_default_transport
+from pydatajson.url_health_cache import get_default_cache
+
+logger = logging.getLogger('pydatajson')
+
+# códigos con los que algunos servidores rechazan pedidos HEAD aunque el
+# recurso exista: se reintenta con un GET del primer byte
+HEAD_FALLBACK_STATUS_CODES = [403, 405, 501]
+# un GET de rango sobre un recurso vacío devuelve 416, pero el recurso existe
+RANGE_NOT_SATISFIABLE = 416
+# resultado de las URLs que no se llegaron a chequear antes del tiempo
+# límite: no se reportan como rotas porque no se sabe si lo están
+UNCHECKED_RESULT = (True, None)
+# código de estado con el que se reportan los timeouts
+TIMEOUT_STATUS_CODE = 408
+
+# timeouts adaptativos: el timeout de un host lento es un múltiplo del
+# percentil de sus latencias observadas, hasta el timeout máximo
+LATENCY_PERCENTILE = 95
+LATENCY_TIMEOUT_FACTOR = 4
+MIN_LATENCY_SAMPLES = 5
+MAX_LATENCY_SAMPLES = 100
+MAX_TIMEOUT_FACTOR = 4
+
+HOST_OK = "OK"
+HOST_SKIPPED = "SKIPPED"
+
+
+def is_working_status(status_code):
+    """Indica si un código de estado HTTP corresponde a una URL que
+    funciona."""
+    if status_code in EXCEPTION_STATUS_CODES:
+        return True
+    return not any(re.match(pattern, str(status_code))
+                   for pattern in INVALID_STATUS_CODES_REGEX)
+
+
+def url_host(url):
+    """Devuelve el host de una URL, o "" si no se puede determinar."""
+    try:
+        return urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+
+class LinkChecker(object):
+    """Chequea el estado de URLs con concurrencia acotada.
+
+    Args:
+        transport (Transport): Transporte con el que se hacen los pedidos.
+            Por defecto, el de la librería.
+        timeout (float): Tiempo máximo de cada pedido, en segundos.
+        verify_ssl (bool): Verifica los certificados SSL.
+        max_workers (int): Cantidad máxima de URLs que se chequean a la vez.
+        max_per_host (int): Cantidad máxima de URLs de un mismo host que se
+            chequean a la vez.
+        deadline (float): Tiempo máximo, en segundos, de cada llamada a
+            check_urls(). Las URLs que no se llegaron a chequear se
+            consideran funcionando. Por defecto no hay límite.
+        health_cache (UrlHealthCache): Caché con el estado de URLs ya
+            chequeadas. Por defecto, el configurado con
+            url_health_cache.set_default_cache(), si hay uno.
+        pool (WorkerPool): Pool de threads compartido en el que se hacen
+            los chequeos. Por defecto, el configurado con
+            threading_helper.set_default_pool() o, si no hay uno, un pool
+            propio en cada llamada a check_urls().
+        max_host_failures (int): Cantidad de fallas seguidas de un host
+            (sin respuesta, o timeout con el timeout máximo) tras las que
+            no se chequean sus URLs restantes: se reportan con el resultado
+            de la última falla. None lo desactiva.
+        host_retry_after (float): Segundos tras los que se vuelve a
+            chequear una URL de un host que se dejó de chequear. Si
+            responde, se chequean de nuevo todas sus URLs. None no lo
+            vuelve a chequear.
+        adaptive_timeout (bool): Extiende el timeout de los hosts lentos
+            según la latencia observada, hasta `max_timeout`.
+        max_timeout (float): Timeout máximo de un host lento. Por defecto,
+            4 veces `timeout`.
+    """
+
+    def __init__(self, transport=None, timeout=DEFAULT_CHECK_TIMEOUT,
+                 verify_ssl=True, max_workers=1,
+                 max_per_host=DEFAULT_LINK_CHECK_PER_HOST, deadline=None,
+                 health_cache=None, pool=None,
+                 max_host_failures=DEFAULT_HOST_MAX_FAILURES,
+                 adaptive_timeout=True, max_timeout=None,
+                 host_retry_after=DEFAULT_HOST_RETRY_AFTER):
+        self.transport = transport or get_default_transport()
+        self.health_cache = health_cache
+        self.pool = pool
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.max_workers = max(1, max_workers or 1)
+        self.max_per_host = max(1, max_per_host or 1)
+        self.deadline = deadline
+        self.max_host_failures = max_host_failures
+        self.host_retry_after = host_retry_after
+        self.adaptive_timeout = adaptive_timeout
+        self.max_timeout = max_timeout or (
+            timeout * MAX_TIMEOUT_FACTOR if timeout else None)
+        self.unchecked = 0
+        self.requests_saved = 0
+        self.hosts = {}
+        self._host_semaphores = {}
+        self._lock = threading.Lock()
+        # tiempo límite de la llamada a check_urls() que se está atendiendo
+        # en cada thread: varias llamadas pueden compartir el checker
+        self._local = threading.local()
+
+    def check(self, url):
+        """Chequea una URL con un HEAD y, si el servidor no lo acepta, con
+        un GET del primer byte.
+
+        Returns:
+            tuple: (bool, int) indicando si la URL funciona y el código de
+                estado obtenido (408 si hubo timeout, None si hubo otro
+                error).
+        """
+        try:
+            response = self.transport.head(url, timeout=self._timeout(url),
+                                           verify=self.verify_ssl)
+            status_code = response.status_code
+            if status_code in HEAD_FALLBACK_STATUS_CODES:
+                status_code = self._ranged_get_status(url) or status_code
+            return is_working_status(status_code), status_code
+        except Timeout:
+            return False, TIMEOUT_STATUS_CODE
+        except (RequestException, Exception):
+            return False, None
+
+    def check_urls(self, urls, check=None):
+        """Chequea una lista de URLs en paralelo.
+
+        Las URLs repetidas o con un resultado vigente en el caché de estado
+        no se vuelven a pedir; la cantidad de pedidos ahorrados se acumula
+        en `requests_saved`. Tampoco se piden las URLs de hosts que dejaron
+        de responder (ver `hosts`).
+
+        Args:
+            urls (list): URLs a chequear.
+            check (function): Función que chequea una URL y devuelve una
+                tupla (bool, int). Por defecto, check().
+
+        Returns:
+            list: Resultado del chequeo de cada URL, en el mismo orden.
+        """
+        check = check or self.check
+        results = [None] * len(urls)
+        if not urls:
+            return results
+
+        health_cache = self.health_cache
+        if health_cache is None:
+            health_cache = get_default_cache()
+        cached = {} if health_cache is None else health_cache.get_many(
+            urls, self.verify_ssl)
+
+        # cada URL se chequea una sola vez, aunque aparezca repetida
+        pending = []
+        first_index = {}
+        duplicates = {}
+        for index, url in enumerate(urls):
+            cacheable = isinstance(url, string_types)
+            if cacheable and url in cached:
+                results[index] = cached[url]
+            elif cacheable and url in first_index:
+                duplicates[index] = first_index[url]
+            else:
+                if cacheable:
+                    first_index[url] = index
+                pending.append(index)
+
+        deadline_at = time.time() + self.deadline if self.deadline \
+            else None
+        unchecked = set()
+        skipped = set()
+
+        def check_url(index):
+            url = urls[index]
+            with self._host_semaphore(url):
+                if deadline_at is not None and time.time() >= deadline_at:
+                    unchecked.add(index)
+                    return index, UNCHECKED_RESULT
+
+                health = self._host_health(url)
+                if health.should_skip(self.host_retry_after):
+                    skipped.add(index)
+                    return index, health.skip()
+
+                at_max_timeout = (not self.adaptive_timeout or
+                                  self._host_timeout(url) == self.max_timeout)
+                started = time.time()
+                self._local.deadline_at = deadline_at
+                try:
+                    result = check(url)
+                finally:
+                    self._local.deadline_at = None
+                health.record(result, time.time() - started, at_max_timeout,
+                              self.max_host_failures)
+                return index, result
+
+        order = self._interleave_hosts(urls, pending)
+        workers = min(self.max_workers, len(order))
+        pool = self.pool or get_default_pool()
+        if pool is not None:
+            for index, result in pool.imap_unordered(
+                    check_url, order, max_pending=workers):
+                results[index] = result
+        elif workers <= 1:
+            for index in order:
+                results[index] = check_url(index)[1]
+        else:
+            with WorkerPool(workers) as pool:
+                for index, result in pool.imap_unordered(check_url, order):
+                    results[index] = result
+
+        for index, original_index in duplicates.items():
+            results[index] = results[original_index]
+
+        if health_cache is not None:
+            health_cache.set_many(dict(
+                (urls[index], results[index]) for index in pending
+                if index not in unchecked and index not in skipped and
+                isinstance(urls[index], string_types)), self.verify_ssl)
+
+        self.unchecked += len(unchecked)
+        self.requests_saved += len(urls) - len(pending)
+        if unchecked:
+            logger.warning("No se chequearon %s URLs por superar el tiempo "
+                           "límite de %s segundos", len(unchecked),
+                           self.deadline)
+        if skipped:
+            logger.warning("No se chequearon %s URLs de hosts que no "
+                           "responden: %s", len(skipped), ", ".join(
+                               health.host for health in self.hosts.values()
+                               if health.is_open))
+        return results
+
+    def hosts_report(self):
+        """Devuelve el estado de salud de los hosts chequeados.
+
+        Returns:
+            list: Un diccionario por host, ordenados por nombre, con su
+                estado ("OK" o "SKIPPED" si se dejaron de chequear sus
+                URLs), la cantidad de URLs chequeadas, fallidas y salteadas,
+                el percentil 95 de su latencia y el último timeout usado.
+        """
+        with self._lock:
+            hosts = sorted(self.hosts.values(), key=lambda h: h.host)
+        return [dict(health.to_dict(), timeout=self._host_timeout(
+            health=health)) for health in hosts]
+
+    def _ranged_get_status(self, url):
+        try:
+            response = self.transport.get(
+                url, headers={"Range": "bytes=0-0"}, stream=True,
+                timeout=self._timeout(), verify=self.verify_ssl)
+        except Exception:
+            return None
+
+        response.close()
+        if response.status_code == RANGE_NOT_SATISFIABLE:
+            return 200
+        return response.status_code
+
+    def _timeout(self, url=None):
+        timeout = self._host_timeout(url)
+        deadline_at = getattr(self._local, "deadline_at", None)
+        if deadline_at is None:
+            return timeout
+        remaining = max(deadline_at - time.time(), 0.001)
+        return min(timeout, remaining) if timeout else remaining
+
+    def _host_timeout(self, url=None, health=None):
+        """Timeout de un host según su latencia observada."""
+        if health is None and url is not None:
+            health = self.hosts.get(url_host(url))
+        if not self.adaptive_timeout or not self.timeout or health is None:
+            return self.timeout
+
+        latency = health.latency_percentile(LATENCY_PERCENTILE)
+        if latency is None:
+            return self.timeout
+        timeout = max(latency * LATENCY_TIMEOUT_FACTOR, self.timeout)
+        return min(timeout, self.max_timeout)
+
+    def _host_health(self, url):
+        host = url_host(url)
+        with self._lock:
+            health = self.hosts.get(host)
+            if health is None:
+                health = self.hosts[host] = HostHealth(host)
+        return health
+
+    def _host_semaphore(self, url):
+        host = url_host(url)
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _interleave_hosts(urls, indexes=None):
+        """Ordena las posiciones de las URLs alternando entre hosts, para
+        que los workers no queden esperando el límite de un mismo host."""
+        if indexes is None:
+            indexes = range(len(urls))
+        by_host = OrderedDict()
+        for index in indexes:
+            by_host.setdefault(url_host(urls[index]), []).append(index)
+
+        order = []
+        queues = [iter(indexes) for indexes in by_host.values()]
+        while queues:
+            pending = []
+            for queue in queues:
+                index = next(queue, None)
+                if index is not None:
+                    order.append(index)
+                    pending.append(queue)
+            queues = pending
+        return order
+
+
+class HostHealth(object):
+    """Estado de salud de un host: latencias observadas y fallas seguidas.
+
+    Tras varias fallas seguidas el host se abre y sus URLs no se chequean;
+    pasado un tiempo se deja pasar una URL de prueba, y si responde el host
+    vuelve a chequearse normalmente.
+
+    Args:
+        host (str): Nombre del host.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.checked = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.is_open = False
+        self.opened_at = None
+        self.last_failure = None
+        self._probing = False
+        self.latencies = deque(maxlen=MAX_LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, result, elapsed, at_max_timeout=True,
+               max_failures=DEFAULT_HOST_MAX_FAILURES):
+        """Registra el resultado del chequeo de una URL del host.
+
+        Un timeout con un timeout menor al máximo no cuenta como falla del
+        host: su duración sube la latencia observada, y con ella el
+        timeout de las próximas URLs.
+        """
+        status_code = result[1]
+        timed_out = status_code == TIMEOUT_STATUS_CODE
+        with self._lock:
+            self.checked += 1
+            self._probing = False
+            if status_code is not None:
+                self.latencies.append(elapsed)
+
+            if status_code is None or (timed_out and at_max_timeout):
+                self.failures += 1
+                self.consecutive_failures += 1
+                self.last_failure = result
+                if max_failures and \
+                        self.consecutive_failures >= max_failures:
+                    self.is_open = True
+                    self.opened_at = time.time()
+            elif not timed_out:
+                self.consecutive_failures = 0
+                self.is_open = False
+            elif self.is_open:
+                # una prueba sin respuesta concluyente: se espera otra vez
+                self.opened_at = time.time()
+
+    def should_skip(self, retry_after=DEFAULT_HOST_RETRY_AFTER):
+        """Indica si hay que saltear una URL del host. Con el host abierto,
+        pasados `retry_after` segundos deja pasar una sola URL de prueba.
+        """
+        with self._lock:
+            if not self.is_open:
+                return False
+            if self._probing or retry_after is None or \
+                    time.time() - self.opened_at < retry_after:
+                return True
+            self._probing = True
+            return False
+
+    def skip(self):
+        """Registra una URL no chequeada y devuelve su resultado."""
+        with self._lock:
+            self.skipped += 1
+            return self.last_failure
+
+    def latency_percentile(self, percentile):
+        """Devuelve un percentil de las latencias observadas, o None si hay
+        pocas muestras."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        position = int(math.ceil(percentile / 100.0 * len(latencies))) - 1
+        return latencies[max(position, 0)]
+
+    def to_dict(self):
+        latency = self.latency_percentile(LATENCY_PERCENTILE)
+        return {
+            "host": self.host,
+            "status": HOST_SKIPPED if self.is_open else HOST_OK,
+            "checked": self.checked,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "latency_p95": round(latency, 4) if latency is not None else None
+        }
+
+
+class UrlCheckPlanner(object):
+    """Junta los chequeos de URLs de varios validadores (de uno o varios
+    catálogos) para chequear cada URL distinta una sola vez.
+
+    Cada validador agregado con add() aporta sus URLs; run() las chequea
+    todas juntas y devuelve a cada validador los resultados de las suyas.
+
+    Args:
+        link_checker (LinkChecker): Motor con el que se chequean las URLs.
+        check (function): Función que chequea una URL. Por defecto, la
+            del primer validador agregado.
+    """
+
+    def __init__(self, link_checker=None, check=None):
+        self.link_checker = link_checker or LinkChecker()
+        self.check = check
+        self.urls_count = 0
+        self.requests_saved = 0
+        self._plans = []
+
+    def add(self, validator):
+        """Agrega los chequeos de un validador de URLs.
+
+        Args:
+            validator (UrlValidator): Validador cuyas URLs se chequean.
+
+        Returns:
+            int: Posición del resultado del validador en la lista que
+                devuelve run().
+        """
+        if self.check is None:
+            self.check = validator.is_working_url
+        self._plans.append(validator.plan())
+        return len(self._plans) - 1
+
+    def run(self):
+        """Chequea las URLs de todos los validadores agregados.
+
+        Returns:
+            list: Resultado de cada validador, equivalente al que devuelve
+                su método validate(), en el orden en que se agregaron.
+        """
+        plans, self._plans = self._plans, []
+        urls = [url for plan_urls, _ in plans for url in plan_urls]
+
+        saved_before = self.link_checker.requests_saved
+        results = self.link_checker.check_urls(urls, self.check)
+        requests_saved = self.link_checker.requests_saved - saved_before
+        self.urls_count += len(urls)
+        self.requests_saved += requests_saved
+        if urls:
+            logger.info("Se chequearon %s URLs con %s pedidos (%s pedidos "
+                        "ahorrados)", len(urls), len(urls) - requests_saved,
+                        requests_saved)
+
+        outputs = []
+        start = 0
+        for plan_urls, report in plans:
+            outputs.append(report(results[start:start + len(plan_urls)]))
+            start += len(plan_urls)
+        return outputs
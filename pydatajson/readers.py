@@ -10,15 +10,16 @@ catálogos de metadatos, en distintos fomatos.
 from __future__ import unicode_literals, print_function
 from __future__ import with_statement, absolute_import
 
+import codecs
 import io
 import json
 import logging
+import multiprocessing
 import os.path
 import warnings
 from tempfile import NamedTemporaryFile
 
 import openpyxl as pyxl
-import requests
 import unicodecsv as csv
 from zipfile import BadZipfile
 from openpyxl.utils.exceptions import *
@@ -28,7 +29,10 @@ from unidecode import unidecode
 
 import pydatajson
 from . import custom_exceptions as ce
-from . import helpers, constants
+from . import helpers, constants, threading_helper
+from . import http_cache as pydj_http_cache
+from . import json_backends
+from . import transport as pydj_transport
 from .ckan_reader import read_ckan_catalog
 
 import urllib3
@@ -42,6 +46,15 @@ openpyxl_exceptions = (CellCoordinatesException, IllegalCharacterError,
                        InvalidFileException,
                        ReadOnlyWorkbookException, WorkbookAlreadySaved)
 
+# Tamaño (en bytes o caracteres) de los bloques leídos en modo streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = " \t\n\r"
+
+# Los XLSX son archivos ZIP: se reconocen por sus primeros bytes
+ZIP_MAGIC_BYTES = b"PK\x03\x04"
+# Bytes iniciales del contenido que se inspeccionan para inferir su formato
+SNIFF_BYTES = 1024
+
 
 def read_catalog_obj(catalog):
     try:
@@ -54,7 +67,8 @@ def read_catalog_obj(catalog):
 
 
 def read_catalog(catalog, default_values=None, catalog_format=None,
-                 verify=False, timeout=constants.REQUESTS_TIMEOUT):
+                 verify=False, timeout=constants.REQUESTS_TIMEOUT,
+                 http_cache=None, json_backend=None, transport=None):
     """Toma una representación cualquiera de un catálogo, y devuelve su
     representación interna (un diccionario de Python con su metadata.)
 
@@ -67,6 +81,19 @@ def read_catalog(catalog, default_values=None, catalog_format=None,
             Una representación _externa_ es un path local o una URL remota a un
             archivo con la metadata de un catálogo, en formato JSON o XLSX. La
             representación _interna_ de un catálogo es un diccionario.
+        catalog_format (str): Formato del catálogo ("json", "xlsx" o
+            "ckan"). Con "auto" se infiere del contenido, ignorando el
+            sufijo. Si no se especifica, se usa el sufijo y, si no lo
+            tiene, se infiere del contenido.
+        http_cache (HttpCache): Caché en disco para las descargas de
+            catálogos remotos. Si no se especifica, se usa el configurado con
+            http_cache.set_default_cache(), de haberlo.
+        json_backend (str): Librería con la que se leen los catálogos JSON
+            (ver json_backends). Si no se especifica, se usa la configurada
+            con json_backends.set_default_backend().
+        transport (Transport): Transporte HTTP con el que se descargan los
+            catálogos remotos. Si no se especifica, se usa el compartido por
+            toda la librería (ver transport.get_default_transport()).
 
     Returns:
         dict: Representación interna de un catálogo para uso en las funciones
@@ -84,13 +111,15 @@ def read_catalog(catalog, default_values=None, catalog_format=None,
     else:
         # catalog es una URL remota o un path local
         suffix = catalog.split(".")[-1].strip("/")
-        if suffix in ('json', 'xlsx'):
+        if suffix in ('json', 'xlsx') and catalog_format != "auto":
             catalog_format = catalog_format or suffix
         if catalog_format == "xlsx":
             try:
                 catalog_dict = read_xlsx_catalog(catalog,
                                                  verify=verify,
-                                                 timeout=timeout)
+                                                 timeout=timeout,
+                                                 http_cache=http_cache,
+                                                 transport=transport)
             except openpyxl_exceptions + (KeyError, ValueError, AssertionError,
                                           IOError, BadZipfile) as e:
                 raise ce.NonParseableCatalog(catalog, str(e))
@@ -98,13 +127,19 @@ def read_catalog(catalog, default_values=None, catalog_format=None,
             try:
                 catalog_dict = read_json(catalog,
                                          verify=verify,
-                                         timeout=timeout)
+                                         timeout=timeout,
+                                         http_cache=http_cache,
+                                         json_backend=json_backend,
+                                         transport=transport)
             except(ValueError, TypeError, IOError) as e:
                 raise ce.NonParseableCatalog(catalog, str(e))
         elif catalog_format == "ckan":
             catalog_dict = read_ckan_catalog(catalog)
         else:
-            catalog_dict = read_suffixless_catalog(catalog)
+            catalog_dict = read_suffixless_catalog(
+                catalog, verify=verify, timeout=timeout,
+                http_cache=http_cache, json_backend=json_backend,
+                transport=transport, ckan_fallback=catalog_format != "auto")
 
     # si se pasaron valores default, los aplica al catálogo leído
     if default_values:
@@ -113,6 +148,121 @@ def read_catalog(catalog, default_values=None, catalog_format=None,
     return catalog_dict
 
 
+def read_catalogs(catalogs, max_workers=constants.DEFAULT_READ_WORKERS,
+                  xlsx_processes=0, default_values=None, catalog_format=None,
+                  verify=False, timeout=constants.REQUESTS_TIMEOUT,
+                  http_cache=None, json_backend=None, transport=None):
+    """Lee varios catálogos en paralelo.
+
+    Las descargas y el parseo de JSON se hacen en threads. El parseo de
+    catálogos XLSX, que es intensivo en CPU, puede hacerse además en un pool
+    de procesos. Un catálogo que no se puede leer no interrumpe la lectura
+    de los demás: su error se devuelve junto al resto de los resultados.
+
+    Args:
+        catalogs (list): Representaciones externas/internas de catálogos,
+            como las que acepta read_catalog().
+        max_workers (int): Cantidad de catálogos que se leen a la vez.
+        xlsx_processes (int): Cantidad de procesos para parsear catálogos
+            XLSX. Si es 0, se parsean en los mismos threads de lectura.
+        default_values, catalog_format, verify, timeout, http_cache,
+        json_backend, transport: Parámetros de read_catalog(), que se
+            aplican a todos los catálogos.
+
+    Returns:
+        list: Una tupla (catálogo, error) por cada elemento de `catalogs`, en
+            el mismo orden. Si el catálogo se leyó correctamente, error es
+            None; si no, catálogo es None y error es la excepción levantada.
+    """
+    catalogs = list(catalogs)
+    read_kwargs = {
+        "default_values": default_values,
+        "catalog_format": catalog_format,
+        "verify": verify,
+        "timeout": timeout,
+        "http_cache": http_cache,
+        "json_backend": json_backend,
+        "transport": transport
+    }
+    process_pool = multiprocessing.Pool(xlsx_processes) \
+        if xlsx_processes else None
+
+    def read(catalog):
+        try:
+            if process_pool and _is_xlsx_source(catalog, catalog_format):
+                catalog_dict = _read_xlsx_catalog_in_pool(
+                    catalog, process_pool, read_kwargs)
+            else:
+                catalog_dict = read_catalog(catalog, **read_kwargs)
+            return catalog_dict, None
+        except Exception as e:
+            return None, e
+
+    try:
+        workers = max(1, min(max_workers, len(catalogs)))
+        return threading_helper.apply_threading(catalogs, read, workers)
+    finally:
+        if process_pool:
+            process_pool.close()
+            process_pool.join()
+
+
+def _is_xlsx_source(catalog, catalog_format=None):
+    """Indica si una representación externa de un catálogo es un XLSX,
+    según su sufijo o el formato forzado."""
+    if not isinstance(catalog, string_types):
+        return False
+    if catalog_format:
+        return catalog_format == "xlsx"
+    return catalog.split(".")[-1].strip("/") == "xlsx"
+
+
+def _read_xlsx_catalog_in_pool(catalog, process_pool, read_kwargs):
+    """Lee un catálogo XLSX parseándolo en un pool de procesos.
+
+    Los catálogos remotos se descargan en el thread actual a un archivo
+    temporal, que luego se parsea en otro proceso.
+    """
+    tmp_path = None
+    path = catalog
+    if urlparse(catalog).scheme in ["http", "https"]:
+        content = _get_remote_content(
+            catalog, read_kwargs["verify"], read_kwargs["timeout"],
+            read_kwargs["http_cache"], read_kwargs["transport"])
+        with NamedTemporaryFile(suffix=".xlsx", delete=False) as tmpfile:
+            tmpfile.write(content)
+            tmp_path = path = tmpfile.name
+
+    try:
+        catalog_dict, error = process_pool.apply(
+            _read_local_xlsx_catalog_safe, (path,))
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+    if error is not None:
+        raise ce.NonParseableCatalog(catalog, error)
+
+    if read_kwargs["default_values"]:
+        _apply_default_values(catalog_dict, read_kwargs["default_values"])
+
+    return catalog_dict
+
+
+def _read_local_xlsx_catalog_safe(xlsx_path):
+    """Lee un catálogo XLSX local devolviendo el error como texto, para que
+    pueda volver desde otro proceso.
+
+    Returns:
+        tuple: (catálogo, None) o (None, mensaje de error).
+    """
+    try:
+        return read_local_xlsx_catalog(xlsx_path), None
+    except openpyxl_exceptions + (KeyError, ValueError, AssertionError,
+                                  IOError, BadZipfile) as e:
+        return None, str(e)
+
+
 def _apply_default_values(catalog, default_values):
     """Aplica valores default a los campos de un catálogo.
 
@@ -189,7 +339,8 @@ def _set_default_value(dict_obj, keys, value):
 
 
 def read_json(json_path_or_url, verify=False,
-              timeout=constants.REQUESTS_TIMEOUT):
+              timeout=constants.REQUESTS_TIMEOUT, http_cache=None,
+              json_backend=None, transport=None):
     """Toma el path a un JSON y devuelve el diccionario que representa.
 
     Se asume que el parámetro es una URL si comienza con 'http' o 'https', o
@@ -198,6 +349,10 @@ def read_json(json_path_or_url, verify=False,
     Args:
         json_path_or_url (str): Path local o URL remota a un archivo de texto
             plano en formato JSON.
+        http_cache (HttpCache): Caché en disco para descargas remotas.
+        json_backend (str): Librería con la que se deserializa el JSON (ver
+            json_backends).
+        transport (Transport): Transporte HTTP para descargas remotas.
 
     Returns:
         dict: El diccionario que resulta de deserializar json_path_or_url.
@@ -207,8 +362,9 @@ def read_json(json_path_or_url, verify=False,
 
     parsed_url = urlparse(json_path_or_url)
     if parsed_url.scheme in ["http", "https"]:
-        res = requests.get(json_path_or_url, verify=verify, timeout=timeout)
-        json_dict = json.loads(res.content, encoding='utf-8')
+        content = _get_remote_content(json_path_or_url, verify, timeout,
+                                      http_cache, transport)
+        json_dict = json_backends.loads(content, json_backend)
 
     else:
         # Si json_path_or_url parece ser una URL remota, lo advierto.
@@ -220,13 +376,237 @@ con 'http' o 'https' así que será tratada como una dirección local. ¿Tal vez
 quiso decir 'http://{}'?""".format(json_path_or_url).encode("utf-8"))
 
         with io.open(json_path_or_url, encoding='utf-8') as json_file:
-            json_dict = json.load(json_file)
+            json_dict = json_backends.loads(json_file.read(), json_backend)
 
     return json_dict
 
 
+def iter_datasets(json_path_or_url, default_values=None, verify=False,
+                  timeout=constants.REQUESTS_TIMEOUT, transport=None):
+    """Itera los datasets de un catálogo en formato JSON, de a uno por vez.
+
+    A diferencia de read_json(), no carga el archivo entero en memoria: los
+    datasets se parsean a medida que se leen del archivo local o de la
+    respuesta HTTP.
+
+    Args:
+        json_path_or_url (str): Path local o URL remota a un data.json.
+        default_values (dict): Valores default a aplicar a cada dataset (y a
+            sus distribuciones y campos), como en read_catalog().
+        transport (Transport): Transporte HTTP para catálogos remotos.
+
+    Yields:
+        dict: Cada uno de los datasets del catálogo, en orden.
+    """
+    default_values = _entity_default_values(default_values)
+    for key, value in _iter_json_catalog(json_path_or_url, verify, timeout,
+                                         transport):
+        if key == "dataset":
+            if default_values:
+                _apply_default_values({"dataset": [value]}, default_values)
+            yield value
+
+
+def read_catalog_metadata(json_path_or_url, default_values=None,
+                          verify=False, timeout=constants.REQUESTS_TIMEOUT,
+                          transport=None):
+    """Lee los metadatos de nivel catálogo de un data.json, sin conservar en
+    memoria sus datasets.
+
+    Args:
+        json_path_or_url (str): Path local o URL remota a un data.json.
+        default_values (dict): Valores default, como en read_catalog(). Sólo
+            se aplican los de nivel catálogo.
+        transport (Transport): Transporte HTTP para catálogos remotos.
+
+    Returns:
+        dict: Metadatos del catálogo, sin la clave "dataset".
+    """
+    metadata = {}
+    for key, value in _iter_json_catalog(json_path_or_url, verify, timeout,
+                                         transport):
+        if key != "dataset":
+            metadata[key] = value
+
+    if default_values:
+        _apply_default_values(metadata, {
+            field: value for field, value in iteritems(default_values)
+            if field.startswith("catalog_")
+        })
+
+    return metadata
+
+
+def is_json_source(catalog, catalog_format=None):
+    """Indica si una representación externa de un catálogo es un data.json,
+    según su sufijo o el formato forzado."""
+    if not isinstance(catalog, string_types):
+        return False
+    if catalog_format:
+        return catalog_format == "json"
+    return catalog.split(".")[-1].strip("/") == "json"
+
+
+def _entity_default_values(default_values):
+    """Filtra los valores default de nivel dataset o inferior."""
+    return {
+        field: value for field, value in iteritems(default_values or {})
+        if not field.startswith("catalog_")
+    }
+
+
+def _iter_json_catalog(json_path_or_url, verify=False,
+                       timeout=constants.REQUESTS_TIMEOUT, transport=None):
+    """Itera los pares (clave, valor) del objeto raíz de un data.json. Los
+    elementos de "dataset" se devuelven de a uno, con la clave "dataset"."""
+    assert isinstance(json_path_or_url, string_types)
+
+    parser = _JsonStreamParser(
+        _iter_text_chunks(json_path_or_url, verify, timeout, transport))
+    return parser.iter_items(array_key="dataset")
+
+
+def _iter_text_chunks(path_or_url, verify=False,
+                      timeout=constants.REQUESTS_TIMEOUT, transport=None):
+    """Lee un archivo de texto UTF-8 local o remoto en bloques."""
+    parsed_url = urlparse(path_or_url)
+    if parsed_url.scheme in ["http", "https"]:
+        transport = transport or pydj_transport.get_default_transport()
+        res = transport.get(path_or_url, verify=verify, timeout=timeout,
+                            stream=True)
+        try:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for chunk in res.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+        finally:
+            res.close()
+
+    else:
+        with io.open(path_or_url, encoding='utf-8') as text_file:
+            chunk = text_file.read(STREAM_CHUNK_SIZE)
+            while chunk:
+                yield chunk
+                chunk = text_file.read(STREAM_CHUNK_SIZE)
+
+
+class _JsonStreamParser(object):
+    """Parser incremental para recorrer un objeto JSON sin cargarlo entero.
+
+    Decodifica con el módulo `json` cada valor del objeto raíz por separado,
+    y los elementos de un array elegido de a uno, manteniendo en memoria
+    sólo el texto que todavía no fue consumido.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Descarta el texto consumido y lee al menos tantos caracteres como
+        los que quedan pendientes, para que los reintentos de decodificación
+        de valores grandes no sean cuadráticos.
+
+        Returns:
+            bool: False si ya no hay más texto para leer.
+        """
+        if self._eof:
+            return False
+
+        pending = self._buffer[self._pos:]
+        chunks = [pending]
+        read = 0
+        while read <= len(pending):
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+
+        self._buffer = "".join(chunks)
+        self._pos = 0
+        return read > 0
+
+    def _peek(self):
+        """Devuelve el próximo caracter que no sea un espacio en blanco, sin
+        consumirlo."""
+        while True:
+            while (self._pos < len(self._buffer) and
+                   self._buffer[self._pos] in JSON_WHITESPACE):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("El JSON termina de forma inesperada")
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise ValueError("Se esperaba '{}' y se encontro '{}'".format(
+                "' o '".join(chars), char))
+        self._pos += 1
+        return char
+
+    def _decode(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # un número al final del buffer puede seguir en el próximo bloque
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_items(self, array_key=None):
+        """Itera los pares (clave, valor) del objeto raíz.
+
+        Args:
+            array_key (str): Clave de un array cuyos elementos se devuelven de
+                a uno, como pares (array_key, elemento).
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            key = self._decode()
+            if not isinstance(key, string_types):
+                raise ValueError("Clave invalida en el JSON: {}".format(key))
+            self._expect(":")
+
+            if key == array_key and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._decode()
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                yield key, self._decode()
+
+            if self._expect(",}") == "}":
+                return
+
+
 def read_xlsx_catalog(xlsx_path_or_url, logger=None, verify=False,
-                      timeout=constants.REQUESTS_TIMEOUT):
+                      timeout=constants.REQUESTS_TIMEOUT, http_cache=None,
+                      transport=None):
     """Toma el path a un catálogo en formato XLSX y devuelve el diccionario
     que representa.
 
@@ -236,6 +616,8 @@ def read_xlsx_catalog(xlsx_path_or_url, logger=None, verify=False,
     Args:
         xlsx_path_or_url (str): Path local o URL remota a un libro XLSX de
             formato específico para guardar los metadatos de un catálogo.
+        http_cache (HttpCache): Caché en disco para descargas remotas.
+        transport (Transport): Transporte HTTP para descargas remotas.
 
     Returns:
         dict: El diccionario que resulta de procesar xlsx_path_or_url.
@@ -246,11 +628,9 @@ def read_xlsx_catalog(xlsx_path_or_url, logger=None, verify=False,
 
     parsed_url = urlparse(xlsx_path_or_url)
     if parsed_url.scheme in ["http", "https"]:
-        res = requests.get(xlsx_path_or_url, verify=verify, timeout=timeout)
-        with NamedTemporaryFile() as tmpfile:
-            tmpfile.write(res.content)
-            tmpfile.flush()
-            catalog_dict = read_local_xlsx_catalog(tmpfile.name, logger)
+        content = _get_remote_content(xlsx_path_or_url, verify, timeout,
+                                      http_cache, transport)
+        catalog_dict = read_local_xlsx_catalog(io.BytesIO(content), logger)
 
     else:
         # Si xlsx_path_or_url parece ser una URL remota, lo advierto.
@@ -267,6 +647,19 @@ quiso decir 'http://{}'?
     return catalog_dict
 
 
+def _get_remote_content(url, verify=False, timeout=constants.REQUESTS_TIMEOUT,
+                        http_cache=None, transport=None):
+    """Descarga el contenido de una URL, a través del caché HTTP si hay uno
+    configurado."""
+    http_cache = http_cache or pydj_http_cache.get_default_cache()
+    if http_cache:
+        return http_cache.get(url, verify=verify, timeout=timeout,
+                              transport=transport)
+
+    transport = transport or pydj_transport.get_default_transport()
+    return transport.get(url, verify=verify, timeout=timeout).content
+
+
 def _make_publisher(catalog_or_dataset):
     """De estar presentes las claves necesarias, genera el diccionario
     "publisher" a nivel catálogo o dataset."""
@@ -291,25 +684,47 @@ def _make_contact_point(dataset):
     return dataset
 
 
+def _index_by_identifier(entities, identifier_key):
+    """Agrupa las posiciones de una lista de entidades por identificador.
+
+    Returns:
+        dict: Identificador -> lista de posiciones de las entidades que lo
+            tienen, en orden.
+    """
+    index = {}
+    for idx, entity in enumerate(entities):
+        index.setdefault(entity[identifier_key], []).append(idx)
+    return index
+
+
 def _get_dataset_index(catalog, dataset_identifier, dataset_title,
-                       logger=None):
+                       logger=None, datasets_index=None):
     """Devuelve el índice de un dataset en el catálogo en función de su
-    identificador"""
+    identificador
+
+    Args:
+        datasets_index (dict): Índice de los datasets del catálogo por
+            identificador, según lo genera _index_by_identifier(). Si no se
+            pasa, se genera recorriendo el catálogo.
+    """
     logger = logger or pydj_logger
+    if datasets_index is None:
+        datasets_index = _index_by_identifier(
+            catalog["catalog_dataset"], "dataset_identifier")
     matching_datasets = []
 
-    for idx, dataset in enumerate(catalog["catalog_dataset"]):
-        if dataset["dataset_identifier"] == dataset_identifier:
-            if dataset["dataset_title"] == dataset_title:
-                matching_datasets.append(idx)
-            else:
-                logger.warning(
-                    ce.DatasetUnexpectedTitle(
-                        dataset_identifier,
-                        dataset["dataset_title"],
-                        dataset_title
-                    )
+    for idx in datasets_index.get(dataset_identifier, []):
+        dataset = catalog["catalog_dataset"][idx]
+        if dataset["dataset_title"] == dataset_title:
+            matching_datasets.append(idx)
+        else:
+            logger.warning(
+                ce.DatasetUnexpectedTitle(
+                    dataset_identifier,
+                    dataset["dataset_title"],
+                    dataset_title
                 )
+            )
 
     # Debe haber exactamente un dataset con el identificador provisto.
     no_dsets_msg = "No hay ningun dataset con el identifier {}".format(
@@ -328,32 +743,47 @@ def _get_dataset_index(catalog, dataset_identifier, dataset_title,
 
 def _get_distribution_indexes(catalog, dataset_identifier, dataset_title,
                               distribution_identifier, distribution_title,
-                              logger=None):
+                              logger=None, datasets_index=None,
+                              distributions_indexes=None):
     """Devuelve el índice de una distribución en su dataset en función de su
     título, junto con el índice de su dataset padre en el catálogo, en
-    función de su identificador"""
+    función de su identificador
+
+    Args:
+        datasets_index (dict): Índice de los datasets del catálogo por
+            identificador. Si no se pasa, se genera recorriendo el catálogo.
+        distributions_indexes (dict): Índice por identificador de las
+            distribuciones de cada dataset, por posición del dataset. Si no
+            se pasa, se genera recorriendo las distribuciones del dataset.
+    """
     logger = logger or pydj_logger
     dataset_index = _get_dataset_index(
-        catalog, dataset_identifier, dataset_title)
+        catalog, dataset_identifier, dataset_title,
+        datasets_index=datasets_index)
     if dataset_index is None:
         return None, None
     else:
         dataset = catalog["catalog_dataset"][dataset_index]
 
+    if distributions_indexes is None:
+        distributions_index = _index_by_identifier(
+            dataset["dataset_distribution"], "distribution_identifier")
+    else:
+        distributions_index = distributions_indexes[dataset_index]
     matching_distributions = []
 
-    for idx, distribution in enumerate(dataset["dataset_distribution"]):
-        if distribution["distribution_identifier"] == distribution_identifier:
-            if distribution["distribution_title"] == distribution_title:
-                matching_distributions.append(idx)
-            else:
-                logger.warning(
-                    ce.DistributionUnexpectedTitle(
-                        distribution_identifier,
-                        distribution["distribution_title"],
-                        distribution_title
-                    )
+    for idx in distributions_index.get(distribution_identifier, []):
+        distribution = dataset["dataset_distribution"][idx]
+        if distribution["distribution_title"] == distribution_title:
+            matching_distributions.append(idx)
+        else:
+            logger.warning(
+                ce.DistributionUnexpectedTitle(
+                    distribution_identifier,
+                    distribution["distribution_title"],
+                    distribution_title
                 )
+            )
 
     # Debe haber exactamente una distribución con los identicadores provistos
     if len(matching_distributions) == 0:
@@ -379,16 +809,17 @@ def read_local_xlsx_catalog(xlsx_path, logger=None):
     formado.
 
     Args:
-        xlsx_path (str): Path a un archivo XLSX "template" para describir la
-            metadata de un catálogo.
+        xlsx_path (str o file): Path (o archivo binario abierto) a un XLSX
+            "template" para describir la metadata de un catálogo.
 
     Returns:
         dict: Diccionario con los metadatos de un catálogo.
     """
     logger = logger or pydj_logger
 
-    wb = pyxl.load_workbook(open(xlsx_path, 'rb'), data_only=True,
-                            read_only=True)
+    if isinstance(xlsx_path, string_types):
+        xlsx_path = open(xlsx_path, 'rb')
+    wb = pyxl.load_workbook(xlsx_path, data_only=True, read_only=True)
 
     # Toma las hojas del modelo, resistente a mayúsuculas/minúsculas
     ws_catalog = helpers.get_ws_case_insensitive(wb, "catalog")
@@ -419,6 +850,11 @@ def read_local_xlsx_catalog(xlsx_path, logger=None):
     for dataset in catalog["catalog_dataset"]:
         dataset["dataset_distribution"] = []
 
+    # Indexo los datasets por identificador para ubicar distribuciones y
+    # campos sin recorrer todo el catálogo cada vez
+    datasets_index = _index_by_identifier(
+        catalog["catalog_dataset"], "dataset_identifier")
+
     # Ubico cada distribución en su dataset
     distributions = helpers.sheet_to_table(ws_distribution)
     for distribution in distributions:
@@ -430,7 +866,7 @@ def read_local_xlsx_catalog(xlsx_path, logger=None):
 
         dataset_index = _get_dataset_index(
             catalog, distribution["dataset_identifier"],
-            distribution["dataset_title"], logger)
+            distribution["dataset_title"], logger, datasets_index)
         if dataset_index is None:
             logger.warning("""La distribucion con ID '{}' y titulo '{}' no se
 pudo asignar a un dataset, y no figurara en el data.json de salida.""".format(
@@ -440,6 +876,12 @@ pudo asignar a un dataset, y no figurara en el data.json de salida.""".format(
             dataset = catalog["catalog_dataset"][dataset_index]
             dataset["dataset_distribution"].append(distribution)
 
+    distributions_indexes = {
+        dataset_index: _index_by_identifier(
+            dataset["dataset_distribution"], "distribution_identifier")
+        for dataset_index, dataset in enumerate(catalog["catalog_dataset"])
+    }
+
     # Ubico cada campo en su distribución
     fields = helpers.sheet_to_table(ws_field)
     for idx, field in enumerate(fields):
@@ -451,7 +893,7 @@ pudo asignar a un dataset, y no figurara en el data.json de salida.""".format(
         dataset_index, distribution_index = _get_distribution_indexes(
             catalog, field["dataset_identifier"], field["dataset_title"],
             field["distribution_identifier"], field["distribution_title"],
-            logger)
+            logger, datasets_index, distributions_indexes)
 
         if dataset_index is None:
             logger.warning(
@@ -525,25 +967,113 @@ pudo asignar a un dataset, y no figurara en el data.json de salida.""".format(
     return catalog
 
 
-def read_suffixless_catalog(catalog):
-    try:
-        catalog_dict = read_ckan_catalog(catalog)
-        return catalog_dict
-    except ce.NonParseableCatalog:
-        pass
-    try:
-        catalog_dict = read_json(catalog)
-        return catalog_dict
-    except(ValueError, TypeError, IOError):
-        pass
+def sniff_catalog_format(content, content_type=None):
+    """Infiere el formato de un catálogo a partir de su contenido.
+
+    Un XLSX es un archivo ZIP, así que se reconoce por sus bytes mágicos; un
+    JSON por su primer caracter significativo. Si el contenido no permite
+    decidir, se usa el header Content-Type de la respuesta, de haberlo.
+
+    Args:
+        content (bytes): Contenido del catálogo.
+        content_type (str): Header Content-Type con el que se sirvió.
+
+    Returns:
+        str: "json", "xlsx" o None si no se pudo inferir el formato.
+    """
+    if content.startswith(ZIP_MAGIC_BYTES):
+        return "xlsx"
+
+    leading = content[:SNIFF_BYTES]
+    if leading.startswith(codecs.BOM_UTF8):
+        leading = leading[len(codecs.BOM_UTF8):]
+    leading = leading.lstrip()
+    if leading[:1] in (b"{", b"["):
+        return "json"
+
+    content_type = (content_type or "").lower()
+    if "json" in content_type:
+        return "json"
+    if "spreadsheetml" in content_type or "excel" in content_type:
+        return "xlsx"
+
+    return None
+
+
+def _fetch_catalog_content(catalog, verify=False,
+                           timeout=constants.REQUESTS_TIMEOUT,
+                           http_cache=None, transport=None):
+    """Lee los bytes de un catálogo local o remoto en un único pedido.
+
+    Returns:
+        tuple: (contenido, Content-Type). El Content-Type es None para
+        archivos locales y para respuestas servidas por el caché HTTP.
+    """
+    if urlparse(catalog).scheme not in ["http", "https"]:
+        with open(catalog, "rb") as catalog_file:
+            return catalog_file.read(), None
+
+    http_cache = http_cache or pydj_http_cache.get_default_cache()
+    if http_cache:
+        return http_cache.get(catalog, verify=verify, timeout=timeout,
+                              transport=transport), None
+
+    transport = transport or pydj_transport.get_default_transport()
+    response = transport.get(catalog, verify=verify, timeout=timeout)
+    return response.content, response.headers.get("Content-Type")
+
+
+def read_suffixless_catalog(catalog, verify=False,
+                            timeout=constants.REQUESTS_TIMEOUT,
+                            http_cache=None, json_backend=None,
+                            transport=None, ckan_fallback=True):
+    """Lee un catálogo cuyo formato no se deduce de su sufijo.
+
+    Descarga el catálogo una única vez e infiere su formato del contenido
+    (ver sniff_catalog_format()). Si no se puede leer o su formato no es
+    JSON ni XLSX, se lo intenta leer como un portal CKAN.
+
+    Args:
+        catalog (str): Path local o URL remota al catálogo.
+        http_cache (HttpCache): Caché en disco para descargas remotas.
+        json_backend (str): Librería con la que se deserializa el JSON (ver
+            json_backends).
+        transport (Transport): Transporte HTTP para descargas remotas.
+        ckan_fallback (bool): Si es False, no se intenta leer el catálogo
+            como un portal CKAN.
+
+    Returns:
+        dict: Representación interna del catálogo.
+    """
     try:
-        catalog_dict = read_xlsx_catalog(catalog)
-        return catalog_dict
-    except openpyxl_exceptions + (KeyError, ValueError, AssertionError,
-                                  IOError, BadZipfile) as e:
-        msg = 'No es posible discernir el formato del catalogo: {}'\
-            .format(str(e))
-        raise ce.NonParseableCatalog(catalog, msg)
+        content, content_type = _fetch_catalog_content(
+            catalog, verify, timeout, http_cache, transport)
+        catalog_format = sniff_catalog_format(content, content_type)
+    except IOError as e:
+        content, catalog_format, error = None, None, str(e)
+    else:
+        error = 'contenido que no es JSON ni XLSX'
+
+    if catalog_format == "json":
+        try:
+            return json_backends.loads(content, json_backend)
+        except(ValueError, TypeError) as e:
+            raise ce.NonParseableCatalog(catalog, str(e))
+    elif catalog_format == "xlsx":
+        try:
+            return read_local_xlsx_catalog(io.BytesIO(content))
+        except openpyxl_exceptions + (KeyError, ValueError, AssertionError,
+                                      IOError, BadZipfile) as e:
+            raise ce.NonParseableCatalog(catalog, str(e))
+
+    if ckan_fallback:
+        try:
+            return read_ckan_catalog(catalog)
+        except ce.NonParseableCatalog:
+            pass
+
+    msg = 'No es posible discernir el formato del catalogo: {}'.format(error)
+    raise ce.NonParseableCatalog(catalog, msg)
 
 
 def read_table(path):
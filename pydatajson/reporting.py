@@ -14,7 +14,7 @@ from collections import OrderedDict
 from pydatajson import writers
 from . import helpers
 from . import readers
-from .validation import validate_catalog
+from .validation import get_validation_errors
 
 
 def generate_datasets_summary(catalog, export_path=None, validator=None,
@@ -44,17 +44,21 @@ def generate_datasets_summary(catalog, export_path=None, validator=None,
     catalog = readers.read_catalog(catalog)
 
     # Trato de leer todos los datasets bien formados de la lista
-    # catalog["dataset"], si existe.
-    if "dataset" in catalog and isinstance(catalog["dataset"], list):
+    # catalog["dataset"], si existe. Los de un DataJson lazy se leen de a
+    # uno desde su fuente.
+    if getattr(catalog, "lazy", False):
+        datasets = (d if isinstance(d, dict) else {} for d in
+                    catalog.iter_datasets())
+    elif "dataset" in catalog and isinstance(catalog["dataset"], list):
         datasets = [d if isinstance(d, dict) else {} for d in
                     catalog["dataset"]]
     else:
         # Si no, considero que no hay datasets presentes
         datasets = []
 
-    validation = validate_catalog(
+    validation = get_validation_errors(
         catalog, validator=validator, verify_ssl=verify_ssl,
-        url_check_timeout=url_check_timeout)["error"]["dataset"]
+        url_check_timeout=url_check_timeout)
 
     def info_dataset(index, dataset):
         """Recolecta información básica de un dataset."""
@@ -62,8 +66,8 @@ def generate_datasets_summary(catalog, export_path=None, validator=None,
         info["indice"] = index
         info["titulo"] = dataset.get("title")
         info["identificador"] = dataset.get("identifier")
-        info["estado_metadatos"] = validation[index]["status"]
-        info["cant_errores"] = len(validation[index]["errors"])
+        info["estado_metadatos"] = validation.dataset_status(index)
+        info["cant_errores"] = validation.dataset_errors_count(index)
         info["cant_distribuciones"] = len(dataset["distribution"])
         if helpers.dataset_has_data_distributions(dataset):
             info["tiene_datos"] = "SI"
@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'schema_compiler' de Pydatajson
+
+Compila un jsonschema (Draft 4) a código Python especializado, al estilo de
+fastjsonschema: cada subschema se traduce a un par de funciones generadas,
+una que sólo responde si la instancia es válida y otra que genera los
+errores. Las instancias válidas se recorren únicamente con las primeras, sin
+crear generadores ni errores intermedios.
+
+Los errores generados son `jsonschema.ValidationError` con los mismos
+`message`, `validator`, `validator_value`, `instance`, `path`, `schema_path`
+y `context` que produce `jsonschema.Draft4Validator`, y en el mismo orden, de
+forma que los validadores compilados son intercambiables con los de
+jsonschema.
+
+Se soportan las palabras clave usadas por los schemas del perfil de
+metadatos. Los schemas con otras palabras clave de Draft 4 no se compilan y
+levantan SchemaCompilationError.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import numbers
+import re
+
+import jsonschema
+from jsonschema import _utils
+from jsonschema.exceptions import FormatError, ValidationError
+from six import integer_types, iteritems, string_types
+
+# palabras clave de Draft 4 que el compilador sabe traducir
+SUPPORTED_KEYWORDS = {
+    "$ref", "allOf", "anyOf", "enum", "format", "items", "maxItems",
+    "maxLength", "minItems", "minLength", "not", "pattern", "properties",
+    "required", "type", "uniqueItems",
+}
+
+# cantidad máxima de resultados de chequeos de formato que se recuerdan
+FORMAT_CACHE_SIZE = 10000
+
+# tipos que _shallow_key() compara por valor
+_SCALAR_TYPES = string_types + (numbers.Number, type(None))
+_NESTED = object()
+
+# chequeos de tipo de Draft 4, equivalentes a Draft4Validator.is_type()
+TYPE_CHECKS = {
+    "array": "isinstance({0}, list)",
+    "boolean": "isinstance({0}, bool)",
+    "integer": "(isinstance({0}, _integer_types) and "
+               "not isinstance({0}, bool))",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, _number_types) and "
+              "not isinstance({0}, bool))",
+    "object": "isinstance({0}, dict)",
+    "string": "isinstance({0}, _string_types)",
+}
+
+
+class SchemaCompilationError(ValueError):
+    """El schema usa construcciones que el compilador no soporta."""
+
+
+class CompiledValidator(object):
+    """Validador generado a partir de un jsonschema.
+
+    Expone la misma interfaz que usa pydatajson de un Draft4Validator:
+    iter_errors(), is_valid() y el atributo schema.
+
+    Args:
+        schema (dict): Schema compilado.
+        source (str): Código Python generado, útil para depurar.
+        is_valid (function): Función generada que valida una instancia.
+        iter_errors (function): Función generada que devuelve los errores de
+            una instancia.
+    """
+
+    def __init__(self, schema, source, is_valid, iter_errors):
+        self.schema = schema
+        self.source = source
+        self._is_valid = is_valid
+        self._iter_errors = iter_errors
+
+    def is_valid(self, instance):
+        return self._is_valid(instance)
+
+    def iter_errors(self, instance):
+        if self._is_valid(instance):
+            return iter(())
+        return self._iter_errors(instance)
+
+
+def compile_validator(jsonschema_validator):
+    """Compila el schema de un validador de jsonschema.
+
+    Args:
+        jsonschema_validator (jsonschema.Draft4Validator): Validador cuyo
+            schema, resolver de referencias y format checker se compilan.
+
+    Returns:
+        CompiledValidator: Validador generado.
+    """
+    resolver = jsonschema.RefResolver(
+        base_uri=jsonschema_validator.resolver.resolution_scope,
+        referrer=jsonschema_validator.resolver.referrer,
+        store=jsonschema_validator.resolver.store)
+    compiler = _SchemaCompiler(resolver,
+                               jsonschema_validator.format_checker)
+    return compiler.compile(jsonschema_validator.schema)
+
+
+def _make_error(message, validator, validator_value, instance, schema,
+                schema_path, cause=None, context=()):
+    return ValidationError(message, validator=validator,
+                           validator_value=validator_value,
+                           instance=instance, schema=schema,
+                           schema_path=schema_path, cause=cause,
+                           context=context)
+
+
+def _shallow_key(element):
+    """Clave hasheable tal que dos valores iguales tienen la misma clave.
+
+    Para objetos sólo considera los valores escalares de primer nivel, así
+    que distintos objetos pueden compartir clave; alcanza con que los
+    datasets distintos de un catálogo casi nunca la compartan.
+    """
+    if isinstance(element, dict):
+        return frozenset(
+            (key, value if isinstance(value, _SCALAR_TYPES) else _NESTED)
+            for key, value in iteritems(element))
+    if isinstance(element, list):
+        return _NESTED, len(element)
+    hash(element)
+    return element
+
+
+def uniq(container):
+    """Equivalente a jsonschema._utils.uniq(), en tiempo lineal también para
+    listas de objetos (jsonschema compara cada par de elementos).
+
+    Agrupa los elementos por _shallow_key() y sólo compara entre sí los que
+    comparten clave.
+    """
+    groups = {}
+    try:
+        for element in container:
+            element = _utils.unbool(element)
+            groups.setdefault(_shallow_key(element), []).append(element)
+    except TypeError:
+        return _utils.uniq(container)
+
+    return all(len(group) == 1 or _utils.uniq(group)
+               for group in groups.values())
+
+
+class _FormatCache(object):
+    """Recuerda qué valores cumplen cada formato: los chequeos de fechas y
+    URIs son caros y los mismos valores se repiten en muchos datasets."""
+
+    def __init__(self, format_checker, size=FORMAT_CACHE_SIZE):
+        self.format_checker = format_checker
+        self.size = size
+        self.results = {}
+
+    def conforms(self, instance, format_name):
+        if not isinstance(instance, string_types):
+            return self.format_checker.conforms(instance, format_name)
+
+        key = (format_name, instance)
+        result = self.results.get(key)
+        if result is None:
+            if len(self.results) >= self.size:
+                self.results.clear()
+            result = self.results[key] = self.format_checker.conforms(
+                instance, format_name)
+        return result
+
+
+def _prefix_error(error, path, schema_path):
+    """Antepone a un error la ubicación del subschema que lo produjo."""
+    if path is not None:
+        error.path.appendleft(path)
+    for key in reversed(schema_path):
+        error.schema_path.appendleft(key)
+    return error
+
+
+class _SchemaCompiler(object):
+    """Genera el código de las funciones de validación de un schema.
+
+    Cada subschema distinto (por identidad) se compila una sola vez, así que
+    los subschemas referenciados desde varios lugares comparten funciones y
+    las referencias recursivas no generan código infinito.
+    """
+
+    def __init__(self, resolver, format_checker):
+        self.resolver = resolver
+        self.format_checker = format_checker
+        self.function_ids = {}
+        self.functions = []
+        self.namespace = {
+            "_integer_types": integer_types,
+            "_number_types": numbers.Number,
+            "_string_types": string_types,
+            "_error": _make_error,
+            "_prefix": _prefix_error,
+            "_uniq": uniq,
+            "_types_msg": _utils.types_msg,
+            "_FormatError": FormatError,
+            "_format_checker": format_checker,
+            "_format_cache": _FormatCache(format_checker),
+        }
+        self.constants = {}
+
+    def compile(self, schema):
+        root = self._function_for(schema)
+        source = "\n\n".join(self.functions) + "\n"
+        exec(compile(source, "<pydatajson.schema_compiler>", "exec"),
+             self.namespace)
+        return CompiledValidator(schema, source,
+                                 self.namespace["_valid_{}".format(root)],
+                                 self.namespace["_errors_{}".format(root)])
+
+    def _const(self, value):
+        """Expone un valor del schema al código generado."""
+        key = id(value)
+        if key not in self.constants:
+            name = "_c{}".format(len(self.constants))
+            self.constants[key] = name
+            self.namespace[name] = value
+        return self.constants[key]
+
+    def _function_for(self, schema):
+        """Devuelve el número de las funciones que validan un subschema,
+        generándolas si todavía no existen."""
+        if not isinstance(schema, dict):
+            raise SchemaCompilationError(
+                "Subschema no soportado: {!r}".format(schema))
+
+        key = id(schema)
+        if key in self.function_ids:
+            return self.function_ids[key]
+
+        number = len(self.function_ids)
+        self.function_ids[key] = number
+        # mantiene vivo el subschema para que su id no se reutilice
+        self._const(schema)
+
+        if "$ref" in schema:
+            # como en jsonschema, $ref ignora las demás palabras clave
+            with self.resolver.resolving(schema["$ref"]) as resolved:
+                target = self._function_for(resolved)
+            valid = ["return _valid_{}(x)".format(target)]
+            errors = ["return _errors_{}(x)".format(target)]
+        else:
+            unsupported = [
+                keyword for keyword in schema
+                if keyword in jsonschema.Draft4Validator.VALIDATORS and
+                keyword not in SUPPORTED_KEYWORDS]
+            if unsupported:
+                raise SchemaCompilationError(
+                    "Palabras clave no soportadas: {}".format(
+                        ", ".join(sorted(unsupported))))
+
+            valid, errors = [], []
+            for keyword, value in iteritems(schema):
+                if keyword in SUPPORTED_KEYWORDS:
+                    method = getattr(self, "_compile_" + keyword)
+                    keyword_valid, keyword_errors = method(value, schema)
+                    valid.extend(keyword_valid)
+                    errors.extend(keyword_errors)
+            valid.append("return True")
+            errors = errors or ["return iter(())"]
+
+        self.functions.append(_function("_valid_{}".format(number), valid))
+        self.functions.append(_function("_errors_{}".format(number), errors))
+
+        return number
+
+    def _error(self, message, keyword, value, schema, extra=""):
+        return "yield _error({0}, {1!r}, {2}, x, {3}, ({1!r},){4})".format(
+            message, keyword, self._const(value), self._const(schema), extra)
+
+    def _compile_type(self, value, schema):
+        types = _utils.ensure_list(value)
+        try:
+            checks = [TYPE_CHECKS[type_name].format("x")
+                      for type_name in types]
+        except (KeyError, TypeError):
+            raise SchemaCompilationError(
+                "Tipo no soportado: {!r}".format(value))
+
+        condition = "not ({})".format(" or ".join(checks))
+        message = "_types_msg(x, {})".format(self._const(types))
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition),
+                 "    " + self._error(message, "type", value, schema)])
+
+    def _compile_required(self, required, schema):
+        required_name = self._const(required)
+        return (["if isinstance(x, dict):",
+                 "    for p in {}:".format(required_name),
+                 "        if p not in x: return False"],
+                ["if isinstance(x, dict):",
+                 "    for p in {}:".format(required_name),
+                 "        if p not in x:",
+                 "            " + self._error(
+                     '"%r is a required property" % p', "required",
+                     required, schema)])
+
+    def _compile_properties(self, properties, schema):
+        valid = ["if isinstance(x, dict):"]
+        errors = ["if isinstance(x, dict):"]
+        for prop, subschema in iteritems(properties):
+            number = self._function_for(subschema)
+            prop_name = self._const(prop)
+            valid.append(
+                "    if {0} in x and not _valid_{1}(x[{0}]): "
+                "return False".format(prop_name, number))
+            errors.extend([
+                "    if {0} in x and not _valid_{1}(x[{0}]):".format(
+                    prop_name, number),
+                "        for e in _errors_{}(x[{}]):".format(
+                    number, prop_name),
+                "            yield _prefix(e, {0}, ('properties', {0}))"
+                .format(prop_name)])
+        if len(valid) == 1:
+            return [], []
+        return valid, errors
+
+    def _compile_items(self, items, schema):
+        if isinstance(items, dict):
+            number = self._function_for(items)
+            return (["if isinstance(x, list):",
+                     "    for item in x:",
+                     "        if not _valid_{}(item): return False".format(
+                         number)],
+                    ["if isinstance(x, list):",
+                     "    for i, item in enumerate(x):",
+                     "        if not _valid_{}(item):".format(number),
+                     "            for e in _errors_{}(item):".format(number),
+                     "                yield _prefix(e, i, ('items',))"])
+
+        valid = ["if isinstance(x, list):"]
+        errors = ["if isinstance(x, list):"]
+        for index, subschema in enumerate(items):
+            number = self._function_for(subschema)
+            valid.append(
+                "    if len(x) > {0} and not _valid_{1}(x[{0}]): "
+                "return False".format(index, number))
+            errors.extend([
+                "    if len(x) > {0} and not _valid_{1}(x[{0}]):".format(
+                    index, number),
+                "        for e in _errors_{}(x[{}]):".format(number, index),
+                "            yield _prefix(e, {0}, ('items', {0}))".format(
+                    index)])
+        if len(valid) == 1:
+            return [], []
+        return valid, errors
+
+    def _compile_length(self, keyword, limit, schema, type_name, operator,
+                        message):
+        condition = "{} and len(x) {} {!r}".format(
+            TYPE_CHECKS[type_name].format("x"), operator, limit)
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition),
+                 "    " + self._error(message, keyword, limit, schema)])
+
+    def _compile_minLength(self, limit, schema):
+        return self._compile_length("minLength", limit, schema, "string",
+                                    "<", '"%r is too short" % (x,)')
+
+    def _compile_maxLength(self, limit, schema):
+        return self._compile_length("maxLength", limit, schema, "string",
+                                    ">", '"%r is too long" % (x,)')
+
+    def _compile_minItems(self, limit, schema):
+        return self._compile_length("minItems", limit, schema, "array",
+                                    "<", '"%r is too short" % (x,)')
+
+    def _compile_maxItems(self, limit, schema):
+        return self._compile_length("maxItems", limit, schema, "array",
+                                    ">", '"%r is too long" % (x,)')
+
+    def _compile_uniqueItems(self, unique, schema):
+        if not unique:
+            return [], []
+        condition = "isinstance(x, list) and not _uniq(x)"
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition),
+                 "    " + self._error('"%r has non-unique elements" % (x,)',
+                                      "uniqueItems", unique, schema)])
+
+    def _compile_pattern(self, pattern, schema):
+        search = self._const(re.compile(pattern).search)
+        condition = "isinstance(x, _string_types) and not {}(x)".format(
+            search)
+        message = '"%r does not match %r" % (x, {})'.format(
+            self._const(pattern))
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition),
+                 "    " + self._error(message, "pattern", pattern, schema)])
+
+    def _compile_format(self, format_name, schema):
+        if self.format_checker is None or \
+                format_name not in self.format_checker.checkers:
+            return [], []
+        format_const = self._const(format_name)
+        return (["if not _format_cache.conforms(x, {}): "
+                 "return False".format(format_const)],
+                ["try:",
+                 "    _format_checker.check(x, {})".format(format_const),
+                 "except _FormatError as error:",
+                 "    " + self._error("error.message", "format",
+                                      format_name, schema,
+                                      ", cause=error.cause")])
+
+    def _compile_enum(self, enums, schema):
+        enums_name = self._const(enums)
+        condition = "x not in {}".format(enums_name)
+        message = '"%r is not one of %r" % (x, {})'.format(enums_name)
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition),
+                 "    " + self._error(message, "enum", enums, schema)])
+
+    def _compile_not(self, not_schema, schema):
+        number = self._function_for(not_schema)
+        message = '"%r is not allowed for %r" % ({}, x)'.format(
+            self._const(not_schema))
+        return (["if _valid_{}(x): return False".format(number)],
+                ["if _valid_{}(x):".format(number),
+                 "    " + self._error(message, "not", not_schema, schema)])
+
+    def _compile_allOf(self, subschemas, schema):
+        numbers = [self._function_for(s) for s in subschemas]
+        valid = ["if not _valid_{}(x): return False".format(number)
+                 for number in numbers]
+        errors = []
+        for index, number in enumerate(numbers):
+            errors.extend([
+                "if not _valid_{}(x):".format(number),
+                "    for e in _errors_{}(x):".format(number),
+                "        yield _prefix(e, None, ('allOf', {}))".format(
+                    index)])
+        return valid, errors
+
+    def _compile_anyOf(self, subschemas, schema):
+        numbers = [self._function_for(s) for s in subschemas]
+        condition = "not ({})".format(" or ".join(
+            "_valid_{}(x)".format(number) for number in numbers))
+        message = '"%r is not valid under any of the given schemas" % (x,)'
+        # el contexto reúne los errores de cada alternativa, como jsonschema
+        context = ["    context = []"]
+        for index, number in enumerate(numbers):
+            context.extend([
+                "    for e in _errors_{}(x):".format(number),
+                "        context.append(_prefix(e, None, ({},)))".format(
+                    index)])
+        return (["if {}: return False".format(condition)],
+                ["if {}:".format(condition)] + context +
+                ["    " + self._error(message, "anyOf", subschemas, schema,
+                                      ", context=context")])
+
+
+def _function(name, body):
+    return "def {}(x):\n{}".format(
+        name, "\n".join("    " + line for line in body))
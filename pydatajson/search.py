@@ -10,10 +10,17 @@ un catálogo.
 from __future__ import with_statement, absolute_import
 from __future__ import unicode_literals, print_function
 
+from itertools import islice
+
 from six import iteritems
 from pydatajson.custom_exceptions import ThemeIdRepeated, ThemeLabelRepeated
 from . import custom_exceptions as ce
 from .readers import read_catalog_obj
+from .catalog_query import compile_query
+from .catalog_views import distribution_view, field_view
+from .search_indexes import SearchIndexes, DATASET, DISTRIBUTION, FIELD
+from .search_indexes import LEVELS, PARENT_KEYS, iter_entities
+from .text_search import TextIndex
 from .time_series import distribution_has_time_index
 from .time_series import dataset_has_time_series, field_is_time_series
 
@@ -64,13 +71,16 @@ def get_datasets(catalog, filter_in=None, filter_out=None, meta_field=None,
     filter_in = filter_in or {}
     filter_out = filter_out or {}
     catalog = read_catalog_obj(catalog)
+    indexes = _get_search_indexes(catalog) if filter_in or filter_out \
+        else None
 
-    if filter_in or filter_out:
+    if indexes is not None:
         filtered_datasets = [
-            dataset for dataset in catalog["dataset"] if
-            _filter_dictionary(dataset, filter_in.get(
-                "dataset"), filter_out.get("dataset"))
-        ]
+            entities[0]
+            for entities in indexes.filter(DATASET, filter_in, filter_out)]
+    elif filter_in or filter_out or _is_lazy(catalog):
+        filtered_datasets = _iter_filtered_datasets(
+            catalog, filter_in, filter_out)
     else:
         filtered_datasets = catalog["dataset"]
 
@@ -94,6 +104,9 @@ def get_datasets(catalog, filter_in=None, filter_out=None, meta_field=None,
 
         return meta_filtered_datasets
 
+    elif not isinstance(filtered_datasets, list):
+        return list(filtered_datasets)
+
     else:
         return filtered_datasets
 
@@ -141,43 +154,16 @@ def get_distributions(catalog, filter_in=None, filter_out=None,
     filter_in = filter_in or {}
     filter_out = filter_out or {}
     catalog = read_catalog_obj(catalog)
+    views = _get_catalog_views(catalog)
 
-    distributions = []
-    for dataset in get_datasets(catalog, filter_in, filter_out):
-        for distribution in dataset.get("distribution", []):
-            # agrega el id del dataset
-            distribution["dataset_identifier"] = dataset["identifier"]
-            distributions.append(distribution)
-
-    filtered_distributions = [
-        distribution for distribution in distributions if
-        _filter_dictionary(distribution, filter_in.get("distribution"),
-                           filter_out.get("distribution"))
-    ]
-
-    # realiza filtros especiales
-    if only_time_series:
-        filtered_distributions = [distribution for distribution in
-                                  filtered_distributions if
-                                  distribution_has_time_index(distribution)]
-
-    if meta_field:
-        return [distribution[meta_field]
-                for distribution in filtered_distributions
-                if meta_field in distribution]
-
-    if exclude_meta_fields:
-        meta_filtered_distributions = []
-        for distribution in filtered_distributions:
-            distribution_meta_filtered = distribution.copy()
-            for excluded_meta_field in exclude_meta_fields:
-                distribution_meta_filtered.pop(excluded_meta_field, None)
-            meta_filtered_distributions.append(distribution_meta_filtered)
-
-        return meta_filtered_distributions
+    if views is not None and not filter_in and not filter_out and \
+            not only_time_series and not meta_field and \
+            not exclude_meta_fields:
+        return views.distributions()
 
-    else:
-        return filtered_distributions
+    return list(_iter_results(catalog, DISTRIBUTION, filter_in, filter_out,
+                              meta_field, exclude_meta_fields,
+                              only_time_series, 0, None, None))
 
 
 def get_fields(catalog, filter_in=None, filter_out=None, meta_field=None,
@@ -229,33 +215,366 @@ def get_fields(catalog, filter_in=None, filter_out=None, meta_field=None,
             filter_in["distribution"] = {}
         filter_in["distribution"]["identifier"] = distribution_identifier
 
-    fields = []
-    for distribution in get_distributions(catalog, filter_in, filter_out,
-                                          only_time_series=only_time_series):
+    views = _get_catalog_views(catalog)
+    if views is not None and not filter_in and not filter_out and \
+            not meta_field:
+        return views.time_series() if only_time_series else views.fields()
+
+    return list(_iter_results(catalog, FIELD, filter_in, filter_out,
+                              meta_field, None, only_time_series, 0, None,
+                              None))
+
+
+def iter_datasets(catalog, filter_in=None, filter_out=None, meta_field=None,
+                  exclude_meta_fields=None, only_time_series=False, offset=0,
+                  limit=None, cursor=None):
+    """Itera los datasets del catálogo o uno de sus metadatos, en el orden
+    del catálogo.
 
-        distribution_fields = distribution.get("field", [])
-        if isinstance(distribution_fields, list):
-            for field in distribution_fields:
-                if not only_time_series or field_is_time_series(field,
-                                                                distribution):
-                    # agrega el id del dataset
-                    field["dataset_identifier"] = distribution[
-                        "dataset_identifier"]
-                    # agrega el id de la distribución
-                    field["distribution_identifier"] = distribution.get(
-                        "identifier")
+    Igual que get_datasets(), pero no arma la lista de resultados: sirve
+    para recorrer catálogos grandes o devolver una página de resultados.
+    Con exclude_meta_fields sólo se copian los datasets devueltos.
 
-                    fields.append(field)
+    Args:
+        catalog (dict, str or DataJson): Representación externa/interna de un
+            catálogo.
+        filter_in (dict): Ver get_datasets().
+        filter_out (dict): Ver get_datasets().
+        meta_field (str): Ver get_datasets().
+        exclude_meta_fields (list): Ver get_datasets().
+        only_time_series (bool): Ver get_datasets().
+        offset (int): Cantidad de resultados a saltear.
+        limit (int): Cantidad máxima de resultados.
+        cursor (str): Identifier del último dataset de la página anterior.
+            Se devuelven los resultados que le siguen, aunque el catálogo
+            haya cambiado entre páginas.
+
+    Raises:
+        DatasetIdNonExistentError: Al iterar, si no hay ningún dataset con
+            el identifier del cursor.
+    """
+    return _iter_results(catalog, DATASET, filter_in, filter_out, meta_field,
+                         exclude_meta_fields, only_time_series, offset, limit,
+                         cursor)
 
-    filtered_fields = [field for field in fields if
-                       _filter_dictionary(field, filter_in.get("field"),
-                                          filter_out.get("field"))]
 
+def iter_distributions(catalog, filter_in=None, filter_out=None,
+                       meta_field=None, exclude_meta_fields=None,
+                       only_time_series=False, offset=0, limit=None,
+                       cursor=None):
+    """Itera las distribuciones del catálogo o uno de sus metadatos, en el
+    orden del catálogo.
+
+    Igual que get_distributions(), pero no arma la lista de resultados. Sólo
+    se arman (y, con exclude_meta_fields, se copian) las vistas de las
+    distribuciones devueltas.
+
+    Args:
+        catalog (dict, str or DataJson): Representación externa/interna de un
+            catálogo.
+        filter_in (dict): Ver get_distributions().
+        filter_out (dict): Ver get_distributions().
+        meta_field (str): Ver get_distributions().
+        exclude_meta_fields (list): Ver get_distributions().
+        only_time_series (bool): Ver get_distributions().
+        offset (int): Cantidad de resultados a saltear.
+        limit (int): Cantidad máxima de resultados.
+        cursor (str): Identifier de la última distribución de la página
+            anterior. Se devuelven los resultados que le siguen.
+
+    Raises:
+        DistributionIdNonExistentError: Al iterar, si no hay ninguna
+            distribución con el identifier del cursor.
+    """
+    return _iter_results(catalog, DISTRIBUTION, filter_in, filter_out,
+                         meta_field, exclude_meta_fields, only_time_series,
+                         offset, limit, cursor)
+
+
+def iter_fields(catalog, filter_in=None, filter_out=None, meta_field=None,
+                only_time_series=False, distribution_identifier=None,
+                offset=0, limit=None, cursor=None):
+    """Itera los campos del catálogo o uno de sus metadatos, en el orden del
+    catálogo.
+
+    Igual que get_fields(), pero no arma la lista de resultados. Sólo se
+    arman las vistas de los campos devueltos.
+
+    Args:
+        catalog (dict, str or DataJson): Representación externa/interna de un
+            catálogo.
+        filter_in (dict): Ver get_fields().
+        filter_out (dict): Ver get_fields().
+        meta_field (str): Ver get_fields().
+        only_time_series (bool): Ver get_fields().
+        distribution_identifier (str): Ver get_fields().
+        offset (int): Cantidad de resultados a saltear.
+        limit (int): Cantidad máxima de resultados.
+        cursor (str): Id del último campo de la página anterior. Se
+            devuelven los resultados que le siguen.
+
+    Raises:
+        FieldIdNonExistentError: Al iterar, si no hay ningún campo con el id
+            del cursor.
+    """
+    if distribution_identifier:
+        filter_in = dict(filter_in or {})
+        filter_in["distribution"] = dict(filter_in.get("distribution", {}),
+                                         identifier=distribution_identifier)
+    return _iter_results(catalog, FIELD, filter_in, filter_out, meta_field,
+                         None, only_time_series, offset, limit, cursor)
+
+
+def _iter_results(catalog, level, filter_in, filter_out, meta_field,
+                  exclude_meta_fields, only_time_series, offset, limit,
+                  cursor):
+    """Itera los resultados de iter_datasets(), iter_distributions() e
+    iter_fields(), get_distributions() y get_fields(). Las entidades se
+    filtran sin copiarlas, y sólo se arman las vistas de las que se
+    devuelven."""
+    filter_in = filter_in or {}
+    filter_out = filter_out or {}
+    catalog = read_catalog_obj(catalog)
+    indexes = _get_search_indexes(catalog)
+    views = _get_catalog_views(catalog)
+
+    if indexes is not None:
+        matched = _iter_indexed_entities(catalog, indexes, level, filter_in,
+                                         filter_out, cursor)
+    else:
+        matched = _iter_scanned_entities(catalog, level, filter_in,
+                                         filter_out, cursor)
+    if only_time_series:
+        matched = (item for item in matched if _is_time_series(item[1]))
     if meta_field:
-        return [field[meta_field] for field in filtered_fields
-                if meta_field in field]
+        # las vistas siempre tienen los ids de las entidades contenedoras
+        matched = (item for item in matched
+                   if meta_field in item[1][-1] or
+                   meta_field in PARENT_KEYS.get(level, {}))
+
+    stop = offset + limit if limit is not None else None
+    for position, entities in islice(matched, offset, stop):
+        entity = _make_entity(catalog, views, level, position, entities)
+
+        if meta_field:
+            yield entity[meta_field]
+        elif exclude_meta_fields:
+            entity = entity.copy()
+            for excluded_meta_field in exclude_meta_fields:
+                entity.pop(excluded_meta_field, None)
+            yield entity
+        else:
+            yield entity
+
+
+def _iter_indexed_entities(catalog, indexes, level, filter_in, filter_out,
+                           cursor):
+    """Itera las posiciones y entidades que pasan los filtros con los
+    índices de un DataJson. El cursor se ubica con los índices por
+    identificador, sin recorrer las entidades anteriores."""
+    if filter_in or filter_out:
+        candidates = indexes.filter_positions(level, filter_in, filter_out)
+    else:
+        candidates = indexes.entities(level)
+
+    start = 0
+    if cursor is not None:
+        position = _cursor_position(catalog, level, cursor)
+        # búsqueda binaria de la primera posición posterior al cursor
+        end = len(candidates)
+        while start < end:
+            middle = (start + end) // 2
+            if candidates[middle][0] <= position:
+                start = middle + 1
+            else:
+                end = middle
+    return islice(candidates, start, None)
+
+
+def _cursor_position(catalog, level, identifier):
+    try:
+        return _indexed_position(catalog, level, identifier)
+    except (KeyError, IndexError, AssertionError):
+        catalog._build_index()
+    try:
+        return _indexed_position(catalog, level, identifier)
+    except (KeyError, IndexError, AssertionError):
+        raise _cursor_error(level, identifier)
+
+
+def _indexed_position(catalog, level, identifier):
+    """Devuelve la posición de una entidad según los índices por
+    identificador de un DataJson."""
+    if level == DATASET:
+        _get_dataset_by_identifier(catalog, identifier)
+        return (catalog._datasets_index[identifier]["dataset_index"],)
+    if level == DISTRIBUTION:
+        _get_distribution_by_identifier(catalog, identifier)
+        entry = catalog._distributions_index[identifier]
+        return _indexed_position(catalog, DATASET,
+                                 entry["dataset_identifier"]) + (
+            entry["distribution_index"],)
+
+    _get_field_by_identifier(catalog, identifier)
+    entry = catalog._fields_index[identifier]
+    return _indexed_position(catalog, DISTRIBUTION,
+                             entry["distribution_identifier"]) + (
+        entry["field_index"],)
+
+
+def _cursor_error(level, identifier):
+    if level == DATASET:
+        return ce.DatasetIdNonExistentError(identifier)
+    if level == DISTRIBUTION:
+        return ce.DistributionIdNonExistentError(identifier)
+    return ce.FieldIdNonExistentError(identifier)
+
+
+def _iter_scanned_entities(catalog, level, filter_in, filter_out, cursor):
+    """Itera las posiciones y entidades que pasan los filtros recorriendo
+    el catálogo (o su fuente, si es lazy)."""
+    datasets = catalog.iter_datasets() if _is_lazy(catalog) \
+        else catalog["dataset"]
+    entities_iter = iter_entities(datasets, level)
+    if cursor is not None:
+        entities_iter = _iter_after_cursor(entities_iter, level, cursor)
+
+    # filtros de los niveles hasta el buscado, como en get_*()
+    filters = [(depth, filter_level, filter_in.get(filter_level),
+                filter_out.get(filter_level))
+               for depth, filter_level in enumerate(
+                   LEVELS[:LEVELS.index(level) + 1])
+               if filter_in.get(filter_level) or
+               filter_out.get(filter_level)]
+
+    for position, entities in entities_iter:
+        if all(_filter_entity(entities[:depth + 1], filter_level,
+                              level_filter_in, level_filter_out)
+               for depth, filter_level, level_filter_in, level_filter_out
+               in filters):
+            yield position, entities
+
+
+def _iter_after_cursor(entities_iter, level, cursor):
+    key = "id" if level == FIELD else "identifier"
+    for position, entities in entities_iter:
+        if entities[-1].get(key) == cursor:
+            break
     else:
-        return filtered_fields
+        raise _cursor_error(level, cursor)
+
+    for item in entities_iter:
+        yield item
+
+
+def _filter_entity(entities, level, filter_in=None, filter_out=None):
+    """Igual que _filter_dictionary() sobre la vista de la última entidad,
+    pero sin armarla."""
+    entity = entities[-1]
+    parent_keys = PARENT_KEYS.get(level, {})
+
+    def value_of(key):
+        parent = parent_keys.get(key)
+        if parent:
+            return entities[parent[0]].get(parent[1])
+        return entity.get(key)
+
+    if filter_in:
+        for key, value in iteritems(filter_in):
+            if value_of(key) != value:
+                return False
+
+    if filter_out:
+        for key, value in iteritems(filter_out):
+            if value_of(key) == value:
+                return False
+
+    return True
+
+
+def _is_time_series(entities):
+    if len(entities) == 1:
+        return dataset_has_time_series(entities[0])
+    if len(entities) == 2:
+        return distribution_has_time_index(entities[1])
+    return distribution_has_time_index(entities[1]) and \
+        field_is_time_series(entities[2], entities[1])
+
+
+def query(catalog, query, level=DATASET, meta_field=None):
+    """Devuelve las entidades de un nivel del catálogo que cumplen una
+    consulta, o uno de sus metadatos.
+
+    A diferencia de los filtros de get_datasets(), get_distributions() y
+    get_fields(), una consulta admite paths a campos anidados, pertenencia
+    a una lista de valores ("in"), rangos de fechas, números o textos
+    ("gt", "gte", "lt", "lte"), existencia de un campo ("exists") y
+    combinaciones con "and", "or" y "not" entre niveles. Sobre un DataJson
+    creado con indexed_search=True las condiciones de igualdad se resuelven
+    con sus índices secundarios.
+
+    Args:
+        catalog (dict, str or DataJson): Representación externa/interna de un
+            catálogo.
+        query (dict o CatalogQuery): Consulta, o consulta ya compilada con
+            catalog_query.compile_query(). Ejemplo::
+                {
+                    "dataset.publisher.name": {"in": ["INDEC", "BCRA"]},
+                    "distribution.issued": {"gte": "2018-01-01"},
+                    "not": {"field.units": {"exists": True}}
+                }
+            Ver el módulo catalog_query para la sintaxis completa.
+        level (str): Entidades a devolver: "dataset", "distribution" o
+            "field". Las distribuciones y los fields se devuelven como en
+            get_distributions() y get_fields().
+        meta_field (str): Nombre de un metadato. En lugar de devolver las
+            entidades, devuelve una lista de valores para ese metadato.
+
+    Raises:
+        InvalidQueryError: La consulta no tiene un formato válido.
+    """
+    compiled = compile_query(query)
+    catalog = read_catalog_obj(catalog)
+    indexes = _get_search_indexes(catalog)
+    views = _get_catalog_views(catalog)
+
+    entities = [_make_entity(catalog, views, level, position, matched)
+                for position, matched
+                in compiled.filter(catalog, level, indexes)]
+
+    if meta_field:
+        return [entity[meta_field] for entity in entities
+                if meta_field in entity]
+    return entities
+
+
+def search_text(catalog, query, level=DATASET, limit=None,
+                with_scores=False):
+    """Busca un texto libre en los títulos, descripciones y palabras clave
+    del catálogo y devuelve los identificadores de las entidades ordenados
+    por relevancia (BM25).
+
+    La búsqueda ignora acentos, mayúsculas, stop words y plurales. Sobre un
+    DataJson el índice de texto se arma en la primera búsqueda y se
+    actualiza al quitar datasets o distribuciones con sus métodos.
+
+    Args:
+        catalog (dict, str or DataJson): Representación externa/interna de un
+            catálogo.
+        query (str): Texto a buscar. Ejemplo: "precios de combustibles".
+        level (str): Entidades a buscar: "dataset", "distribution" o
+            "field".
+        limit (int): Cantidad máxima de resultados.
+        with_scores (bool): Si es verdadero, devuelve tuplas
+            (identificador, puntaje).
+
+    Returns:
+        list: Identificadores ("identifier" de datasets y distribuciones,
+            "id" de fields) de las entidades que contienen algún término de
+            la búsqueda, de la más a la menos relevante.
+    """
+    catalog = read_catalog_obj(catalog)
+    return _get_text_index(catalog).search(query, level, limit, with_scores)
 
 
 def get_time_series(catalog, **kwargs):
@@ -535,6 +854,99 @@ def get_catalog_metadata(catalog, exclude_meta_fields=None):
     return catalog_dict_copy
 
 
+def _is_lazy(catalog):
+    return getattr(catalog, "lazy", False)
+
+
+def _get_search_indexes(catalog):
+    """Devuelve los índices secundarios de un DataJson creado con
+    indexed_search=True, o None."""
+    if not getattr(catalog, "indexed_search", False):
+        return None
+    return _get_catalog_indexes(catalog)
+
+
+def _get_catalog_views(catalog):
+    """Devuelve las vistas guardadas de un DataJson creado con
+    cached_views=True, o None."""
+    if not getattr(catalog, "cached_views", False):
+        return None
+    indexes = _get_catalog_indexes(catalog)
+    return indexes.views if indexes is not None else None
+
+
+def _get_catalog_indexes(catalog):
+    """Devuelve los índices y las vistas de un DataJson, creándolos si no
+    existen o si cambió su lista de datasets. Los catálogos que no son un
+    DataJson, que son lazy o que no tienen datasets devuelven None."""
+    if _is_lazy(catalog) or not hasattr(catalog, "_search_indexes") or \
+            "dataset" not in catalog:
+        return None
+    indexes = catalog._search_indexes
+    if indexes is None or not indexes.is_current(catalog):
+        indexes = catalog._search_indexes = SearchIndexes(catalog)
+    return indexes
+
+
+def _get_text_index(catalog):
+    """Devuelve el índice de texto de un DataJson, creándolo si no existe.
+    Los catálogos que no son un DataJson se indexan en cada llamada."""
+    if not hasattr(catalog, "_text_index"):
+        return TextIndex(catalog)
+
+    if catalog._text_index is None:
+        catalog._text_index = TextIndex(catalog)
+    return catalog._text_index
+
+
+def _iter_filtered_datasets(catalog, filter_in, filter_out):
+    """Itera los datasets que pasan los filtros de nivel dataset. Si el
+    catálogo es lazy, los datasets se leen de su fuente a medida que se
+    recorren."""
+    datasets = catalog.iter_datasets() if _is_lazy(catalog) \
+        else catalog["dataset"]
+    dataset_filter_in = filter_in.get("dataset")
+    dataset_filter_out = filter_out.get("dataset")
+
+    for dataset in datasets:
+        if _filter_dictionary(dataset, dataset_filter_in, dataset_filter_out):
+            yield dataset
+
+
+def _make_entity(catalog, views, level, position, entities):
+    """Devuelve una entidad encontrada por una búsqueda, con los ids de las
+    entidades que la contienen.
+
+    Un DataJson con vistas guardadas devuelve sus vistas, y el resto de los
+    DataJson devuelven sus propias entidades. Los catálogos lazy, que no se
+    modifican, devuelven una vista armada en cada llamada.
+    """
+    if level == DATASET:
+        return entities[0]
+    if views is not None:
+        return views.view(level, position)
+    if hasattr(catalog, "_build_index") and not _is_lazy(catalog):
+        return _with_parent_ids(entities)
+    if level == DISTRIBUTION:
+        return distribution_view(*entities)
+    return field_view(*entities)
+
+
+def _with_parent_ids(entities):
+    """Devuelve la última entidad, agregándole los ids de las entidades que
+    la contienen sólo si no los tiene o cambiaron."""
+    entity = entities[-1]
+    dataset_identifier = entities[0]["identifier"]
+    if entity.get("dataset_identifier") != dataset_identifier:
+        entity["dataset_identifier"] = dataset_identifier
+    if len(entities) == 3:
+        distribution_identifier = entities[1].get("identifier")
+        if "distribution_identifier" not in entity or \
+                entity["distribution_identifier"] != distribution_identifier:
+            entity["distribution_identifier"] = distribution_identifier
+    return entity
+
+
 def _filter_dictionary(dictionary, filter_in=None, filter_out=None):
     if filter_in:
         # chequea que el objeto tenga las propiedades de filtro positivo
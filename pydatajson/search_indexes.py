@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'search_indexes' de Pydatajson
+
+Contiene índices secundarios sobre los metadatos de un catálogo: para un
+campo (o un path a un campo anidado) de datasets, distribuciones o fields,
+guarda las posiciones de las entidades que tienen cada valor. Los índices se
+construyen a demanda, la primera vez que una búsqueda filtra por ese campo,
+y convierten los filtros por igualdad en búsquedas en un diccionario más
+intersecciones de conjuntos. Los índices ordenados resuelven los filtros por
+rango de las consultas de catalog_query con búsquedas binarias.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import threading
+
+from six import iteritems, string_types
+
+from .catalog_views import CatalogViews
+
+DATASET = "dataset"
+DISTRIBUTION = "distribution"
+FIELD = "field"
+LEVELS = (DATASET, DISTRIBUTION, FIELD)
+
+# metadatos que las vistas de search agregan a distribuciones y fields con el
+# identificador de las entidades que los contienen
+PARENT_KEYS = {
+    DISTRIBUTION: {"dataset_identifier": (0, "identifier")},
+    FIELD: {"dataset_identifier": (0, "identifier"),
+            "distribution_identifier": (1, "identifier")},
+}
+
+
+def index_key(value):
+    """Devuelve una representación hashable de un valor de metadato, igual
+    para dos valores iguales (por ejemplo, dos diccionarios con las mismas
+    claves y valores)."""
+    if isinstance(value, dict):
+        return frozenset((key, index_key(item))
+                         for key, item in iteritems(value))
+    if isinstance(value, list):
+        return tuple(index_key(item) for item in value)
+    return value
+
+
+def parse_path(path):
+    """Convierte un path a un campo anidado ("publisher.name" o una lista de
+    claves) en una tupla de claves."""
+    if isinstance(path, string_types):
+        return tuple(path.split("."))
+    return tuple(path)
+
+
+def get_path(entity, path):
+    """Devuelve el valor de un campo anidado, o None si no existe."""
+    value = entity
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def iter_entities(datasets, level):
+    """Itera las posiciones y las entidades de un nivel de una lista de
+    datasets.
+
+    Yields:
+        tuple: (posición, entidades), donde entidades es la lista de la
+            entidad y sus contenedoras, desde el dataset.
+    """
+    depth = LEVELS.index(level)
+    for i, dataset in enumerate(datasets):
+        if depth == 0:
+            yield (i,), [dataset]
+            continue
+        distributions = dataset.get("distribution") or []
+        for j, distribution in enumerate(distributions):
+            if depth == 1:
+                yield (i, j), [dataset, distribution]
+                continue
+            fields = distribution.get("field")
+            if isinstance(fields, list):
+                for k, field in enumerate(fields):
+                    yield (i, j, k), [dataset, distribution, field]
+
+
+class SearchIndexes(object):
+    """Índices secundarios de los metadatos de un catálogo.
+
+    Las entidades se identifican por su posición: (i,) para el dataset i,
+    (i, j) para su distribución j y (i, j, k) para el field k de ésta.
+
+    Los índices y las vistas reflejan el catálogo al momento de construirse.
+    DataJson los descarta cuando se modifica con sus métodos; si el catálogo
+    se modifica directamente hay que descartarlos con
+    DataJson.clear_search_indexes().
+
+    Args:
+        catalog (dict): Catálogo a indexar.
+    """
+
+    def __init__(self, catalog):
+        self.datasets = catalog.get("dataset") or []
+        self.datasets_count = len(self.datasets)
+        self._entities = {}
+        self._indexes = {}
+        self._views = None
+        self._lock = threading.Lock()
+
+    def is_current(self, catalog):
+        """Indica si los índices corresponden a la lista de datasets actual
+        del catálogo."""
+        datasets = catalog.get("dataset") or []
+        return datasets is self.datasets and \
+            len(datasets) == self.datasets_count
+
+    @property
+    def views(self):
+        """Vistas planas de las distribuciones y los fields del catálogo
+        (ver catalog_views.CatalogViews)."""
+        if self._views is None:
+            self._views = CatalogViews(self.entities)
+        return self._views
+
+    def entities(self, level):
+        """Devuelve las posiciones y las entidades de un nivel, en el orden
+        del catálogo.
+
+        Returns:
+            list: Tuplas (posición, entidades), donde entidades es la lista
+                de la entidad y sus contenedoras, desde el dataset.
+        """
+        entities = self._entities.get(level)
+        if entities is None:
+            entities = self._entities[level] = list(self._iter_entities(
+                level))
+        return entities
+
+    def lookup(self, level, path, value):
+        """Devuelve las posiciones de las entidades de un nivel cuyo campo
+        es igual a un valor.
+
+        Args:
+            level (str): "dataset", "distribution" o "field".
+            path (str o list): Campo, o path a un campo anidado.
+            value: Valor buscado. Las entidades sin el campo se indexan con
+                el valor None.
+
+        Returns:
+            frozenset: Posiciones de las entidades.
+        """
+        index = self.index(level, path)
+        return index.get(index_key(value), frozenset())
+
+    def index(self, level, path):
+        """Devuelve el índice de un campo, construyéndolo si no existe.
+
+        Returns:
+            dict: Posiciones de las entidades por valor del campo.
+        """
+        key = (level, parse_path(path))
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._indexes[key] = self._build(*key)
+        return index
+
+    def ordered(self, level, path, key):
+        """Devuelve el índice ordenado de un campo, para búsquedas por
+        rango, construyéndolo si no existe.
+
+        Args:
+            level (str): "dataset", "distribution" o "field".
+            path (str o list): Campo, o path a un campo anidado.
+            key (function): Convierte cada valor en una clave ordenable, o
+                en None para no indexarlo.
+
+        Returns:
+            tuple: Listas (claves, posiciones), ordenadas por clave.
+        """
+        cache_key = (level, parse_path(path), key)
+        index = self._indexes.get(cache_key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(cache_key)
+                if index is None:
+                    index = self._indexes[cache_key] = self._build_ordered(
+                        *cache_key)
+        return index
+
+    def matching(self, level, filter_in=None, filter_out=None):
+        """Devuelve las posiciones de las entidades de un nivel que pasan un
+        filtro positivo y uno negativo, con la semántica de los filtros de
+        search: cada par campo-valor compara el valor completo del campo.
+
+        Returns:
+            set: Posiciones de las entidades, o None si no hay filtros.
+        """
+        if not filter_in and not filter_out:
+            return None
+
+        positions = None
+        for key, value in iteritems(filter_in or {}):
+            found = self.lookup(level, [key], value)
+            positions = set(found) if positions is None \
+                else positions.intersection(found)
+            if not positions:
+                return positions
+
+        if positions is None:
+            positions = set(position for position, _
+                            in self.entities(level))
+        for key, value in iteritems(filter_out or {}):
+            positions.difference_update(self.lookup(level, [key], value))
+        return positions
+
+    def filter(self, level, filter_in, filter_out):
+        """Devuelve las entidades de un nivel que pasan los filtros de todos
+        los niveles hasta él.
+
+        Args:
+            level (str): "dataset", "distribution" o "field".
+            filter_in (dict): Filtros positivos, por nivel.
+            filter_out (dict): Filtros negativos, por nivel.
+
+        Returns:
+            list: Listas con la entidad y sus contenedoras, desde el
+                dataset, en el orden del catálogo.
+        """
+        return [entities for _, entities
+                in self.filter_positions(level, filter_in, filter_out)]
+
+    def filter_positions(self, level, filter_in, filter_out):
+        """Igual que filter(), pero devuelve tuplas (posición, entidades).
+        """
+        depth = LEVELS.index(level)
+        conditions = []
+        for position_depth, condition_level in enumerate(LEVELS[:depth + 1]):
+            positions = self.matching(condition_level,
+                                      filter_in.get(condition_level),
+                                      filter_out.get(condition_level))
+            if positions is not None:
+                conditions.append((position_depth + 1, positions))
+        return self.select(level, conditions)
+
+    def select(self, level, conditions):
+        """Devuelve las entidades de un nivel cuya ubicación cumple todas
+        las condiciones.
+
+        Args:
+            level (str): "dataset", "distribution" o "field".
+            conditions (list): Tuplas (largo, posiciones): la entidad pasa
+                la condición si las primeras "largo" posiciones de su
+                ubicación están en "posiciones". Por ejemplo, (1, {(0,)})
+                selecciona las entidades del primer dataset.
+
+        Returns:
+            list: Tuplas (posición, entidades), en el orden del catálogo.
+        """
+        if not conditions:
+            return list(self.entities(level))
+
+        # recorre sólo las entidades bajo las posiciones del filtro más
+        # selectivo, y verifica el resto de los filtros sobre ellas
+        conditions = sorted(conditions,
+                            key=lambda condition: len(condition[1]))
+        length, positions = conditions[0]
+        groups = self._entities_by_prefix(level, length)
+        return [(position, entities) for prefix in sorted(positions)
+                for position, entities in groups.get(prefix, ())
+                if all(position[:other_length] in other_positions
+                       for other_length, other_positions in conditions[1:])]
+
+    def _entities_by_prefix(self, level, length):
+        """Agrupa las entidades de un nivel por las primeras posiciones de
+        su ubicación (por ejemplo, las distribuciones por dataset)."""
+        key = (level, length)
+        groups = self._entities.get(key)
+        if groups is None:
+            groups = {}
+            for position, entities in self.entities(level):
+                groups.setdefault(position[:length], []).append(
+                    (position, entities))
+            self._entities[key] = groups
+        return groups
+
+    def _iter_entities(self, level):
+        return iter_entities(self.datasets, level)
+
+    def _build(self, level, path):
+        index = {}
+        for position, value in self._values(level, path):
+            index.setdefault(index_key(value), set()).add(position)
+
+        return dict((key, frozenset(positions))
+                    for key, positions in iteritems(index))
+
+    def _build_ordered(self, level, path, key):
+        entries = []
+        for position, value in self._values(level, path):
+            sort_key = key(value)
+            if sort_key is not None:
+                entries.append((sort_key, position))
+        entries.sort()
+        return [sort_key for sort_key, _ in entries], \
+            [position for _, position in entries]
+
+    def _values(self, level, path):
+        parent = PARENT_KEYS.get(level, {}).get(path[0]) \
+            if len(path) == 1 else None
+
+        for position, entities in self.entities(level):
+            if parent:
+                # la vista de la entidad agrega este metadato
+                yield position, entities[parent[0]].get(parent[1])
+            else:
+                yield position, get_path(entities[-1], path)
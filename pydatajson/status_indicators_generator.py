@@ -10,7 +10,7 @@ from pydatajson.validators\
 class StatusIndicatorsGenerator(object):
 
     def __init__(self, catalog, validator=None, verify_ssl=True,
-                 url_check_timeout=1, threads_count=1):
+                 url_check_timeout=1, threads_count=1, link_checker=None):
         self.download_url_ok = None
         self.catalog = read_catalog(catalog)
         self.summary = generate_datasets_summary(self.catalog,
@@ -19,6 +19,7 @@ class StatusIndicatorsGenerator(object):
         self.verify_url = verify_ssl
         self.url_check_timeout = url_check_timeout
         self.threads_count = threads_count
+        self.link_checker = link_checker
 
     def datasets_cant(self):
         return len(self.summary)
@@ -45,14 +46,21 @@ class StatusIndicatorsGenerator(object):
         return self._get_dataset_percentage(self.datasets_con_datos_cant)
 
     def distribuciones_download_url_ok_cant(self):
-        if self.download_url_ok:
+        if self.download_url_ok is not None:
             return self.download_url_ok
-        validator = DistributionDownloadUrlsValidator(
-            self.catalog, self.verify_url, self.url_check_timeout,
-            self.threads_count)
-        self.download_url_ok = validator.validate()
+        self.download_url_ok = self._download_urls_validator().validate()
         return self.download_url_ok
 
+    def plan_download_urls(self, planner):
+        """Agrega el chequeo de las URLs de descarga a un UrlCheckPlanner,
+        para chequearlas junto con las de otros catálogos.
+
+        Returns:
+            int: Posición del resultado en la lista que devuelve
+                planner.run(). Hay que asignarlo a `download_url_ok`.
+        """
+        return planner.add(self._download_urls_validator())
+
     def distribuciones_download_url_error_cant(self):
         return self.distribuciones_cant() - \
                self.distribuciones_download_url_ok_cant()
@@ -64,6 +72,11 @@ class StatusIndicatorsGenerator(object):
         return \
             round(float(self.distribuciones_download_url_ok_cant()) / total, 4)
 
+    def _download_urls_validator(self):
+        return DistributionDownloadUrlsValidator(
+            self.catalog, self.verify_url, self.url_check_timeout,
+            self.threads_count, link_checker=self.link_checker)
+
     def _get_dataset_percentage(self, indicator):
         total = self.datasets_cant()
         if not total:
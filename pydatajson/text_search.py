@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'text_search' de Pydatajson
+
+Contiene un índice invertido sobre los textos de los metadatos de un
+catálogo (títulos, descripciones y palabras clave de datasets,
+distribuciones y fields) para hacer búsquedas de texto libre ordenadas por
+relevancia con BM25. Los textos se normalizan como en
+helpers.title_to_name(): sin acentos, en minúsculas y sin stop words.
+
+El índice se arma de a un dataset, por lo que puede construirse recorriendo
+un catálogo lazy, y admite quitar datasets y distribuciones sin
+reconstruirse.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import heapq
+import math
+import re
+import threading
+
+from six import iteritems, string_types
+from unidecode import unidecode
+
+from .helpers import STOP_WORDS
+from .search_indexes import DATASET, DISTRIBUTION, FIELD, LEVELS
+
+# metadatos de texto indexados en cada nivel y su peso en la relevancia
+TEXT_FIELDS = {
+    DATASET: {"title": 3, "keyword": 2, "description": 1},
+    DISTRIBUTION: {"title": 3, "description": 1},
+    FIELD: {"title": 3, "description": 1},
+}
+
+# parámetros de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# terminaciones de plurales que se quitan con "es" (regiones, ciudades,
+# mujeres); el resto de los plurales pierde sólo la "s"
+PLURAL_ES_CONSONANTS = "lnrdz"
+
+STOP_WORDS_SET = frozenset(STOP_WORDS)
+
+
+def normalize_word(word):
+    """Reduce una palabra ya normalizada a su singular aproximado."""
+    if len(word) > 4 and word.endswith("es") and \
+            word[-3] in PLURAL_ES_CONSONANTS:
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Devuelve los términos de un texto: sin acentos, en minúsculas, sin
+    stop words y con los plurales llevados al singular.
+
+    Args:
+        text (str o list): Texto, o lista de textos (como las palabras
+            clave de un dataset).
+
+    Returns:
+        list: Términos del texto, en orden.
+    """
+    if isinstance(text, list):
+        return [term for item in text for term in tokenize(item)]
+    if not isinstance(text, string_types):
+        return []
+
+    words = re.split(r'[^a-z0-9]+', unidecode(text).lower())
+    return [normalize_word(word) for word in words
+            if word and word not in STOP_WORDS_SET]
+
+
+class _LevelIndex(object):
+    """Índice invertido de los documentos de un nivel del catálogo.
+
+    Los puntajes BM25 de cada término se calculan la primera vez que se
+    busca el término y se guardan, junto con sus documentos ordenados por
+    puntaje, hasta que el índice cambia. Las búsquedas con límite recorren
+    esas listas con el algoritmo de umbral de Fagin y se detienen cuando
+    ningún documento no visto puede entrar en el resultado.
+    """
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.postings = {}
+        self.documents = {}
+        self.total_length = 0
+        self._term_scores = {}
+
+    def add(self, key, entity):
+        if key in self.documents:
+            self.remove(key)
+
+        frequencies = {}
+        for meta_field, weight in iteritems(self.weights):
+            for term in tokenize(entity.get(meta_field)):
+                frequencies[term] = frequencies.get(term, 0) + weight
+        if not frequencies:
+            return
+
+        length = sum(frequencies.values())
+        for term, frequency in iteritems(frequencies):
+            self.postings.setdefault(term, {})[key] = frequency
+        self.documents[key] = (length, list(frequencies))
+        self.total_length += length
+        # la cantidad de documentos y su longitud media cambian los puntajes
+        # de todos los términos
+        self._term_scores = {}
+
+    def remove(self, key):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+
+        length, terms = document
+        for term in terms:
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= length
+        self._term_scores = {}
+
+    def search(self, terms, limit=None):
+        terms = sorted(set(term for term in terms if term in self.postings))
+        term_scores = [self._scores(term) for term in terms]
+
+        if limit is None:
+            scores = {}
+            for scores_by_key, _ in term_scores:
+                for key, score in iteritems(scores_by_key):
+                    scores[key] = scores.get(key, 0) + score
+            return sorted(iteritems(scores),
+                          key=lambda item: (-item[1], item[0]))
+
+        # algoritmo de umbral: recorre los documentos de cada término de
+        # mayor a menor puntaje, calculando el puntaje completo de cada
+        # documento nuevo, hasta que el umbral (la suma de los puntajes de
+        # la fila actual) no supera al peor de los mejores resultados
+        scores = {}
+        best = []
+        depth = 0
+        max_depth = max([len(ranked) for _, ranked in term_scores] or [0])
+        while depth < max_depth:
+            threshold = 0
+            for _, ranked in term_scores:
+                if depth >= len(ranked):
+                    continue
+                score, key = ranked[depth]
+                threshold += score
+                if key in scores:
+                    continue
+                total = scores[key] = sum(
+                    scores_by_key.get(key, 0)
+                    for scores_by_key, _ in term_scores)
+                if len(best) < limit:
+                    heapq.heappush(best, total)
+                elif total > best[0]:
+                    heapq.heapreplace(best, total)
+            if len(best) == limit and best[0] >= threshold:
+                break
+            depth += 1
+
+        return heapq.nsmallest(limit, iteritems(scores),
+                               key=lambda item: (-item[1], item[0]))
+
+    def _scores(self, term):
+        """Devuelve los puntajes BM25 de un término por documento y los
+        documentos ordenados de mayor a menor puntaje."""
+        cached = self._term_scores.get(term)
+        if cached is not None:
+            return cached
+
+        documents_count = len(self.documents)
+        postings = self.postings[term]
+        k1 = BM25_K1
+        base = k1 * (1 - BM25_B)
+        length_factor = k1 * BM25_B * documents_count / self.total_length
+        idf = math.log(1 + (documents_count - len(postings) + 0.5) /
+                       (len(postings) + 0.5))
+        documents = self.documents
+
+        scores_by_key = dict(
+            (key, idf * frequency * (k1 + 1) / (
+                frequency + base + length_factor * documents[key][0]))
+            for key, frequency in iteritems(postings))
+        ranked = sorted(((score, key) for key, score
+                         in iteritems(scores_by_key)),
+                        key=lambda item: (-item[0], item[1]))
+        cached = self._term_scores[term] = (scores_by_key, ranked)
+        return cached
+
+
+class TextIndex(object):
+    """Índice invertido de los textos de un catálogo, con ranking BM25.
+
+    Los datasets y las distribuciones se identifican por su "identifier" y
+    los fields por su "id"; los fields sin "id" no se indexan.
+
+    Args:
+        catalog (dict o DataJson): Catálogo a indexar. Si es un DataJson
+            lazy, los datasets se indexan a medida que se leen de la fuente.
+    """
+
+    def __init__(self, catalog=None):
+        self._levels = dict((level, _LevelIndex(TEXT_FIELDS[level]))
+                            for level in LEVELS)
+        # fields de cada distribución y distribuciones de cada dataset, para
+        # quitarlos junto con la entidad que los contiene
+        self._fields = {}
+        self._distributions = {}
+        self._parents = {}
+        self._lock = threading.Lock()
+        if catalog is not None:
+            self.add_catalog(catalog)
+
+    def add_catalog(self, catalog):
+        """Agrega al índice todos los datasets de un catálogo."""
+        datasets = catalog.iter_datasets() \
+            if hasattr(catalog, "iter_datasets") else catalog.get("dataset")
+        for dataset in datasets or []:
+            self.add_dataset(dataset)
+
+    def add_dataset(self, dataset):
+        """Agrega (o reemplaza) un dataset y sus distribuciones y fields.
+        Los datasets sin "identifier" no se indexan."""
+        identifier = dataset.get("identifier")
+        if not identifier:
+            return
+
+        with self._lock:
+            self._remove_dataset(identifier)
+            self._levels[DATASET].add(identifier, dataset)
+            self._distributions[identifier] = distributions = []
+            for distribution in dataset.get("distribution") or []:
+                if distribution.get("identifier"):
+                    self._add_distribution(distribution)
+                    distributions.append(distribution["identifier"])
+                    self._parents[distribution["identifier"]] = identifier
+
+    def remove_dataset(self, identifier):
+        """Quita un dataset y sus distribuciones y fields del índice."""
+        with self._lock:
+            self._remove_dataset(identifier)
+
+    def remove_distribution(self, identifier):
+        """Quita una distribución y sus fields del índice."""
+        with self._lock:
+            dataset_identifier = self._parents.pop(identifier, None)
+            if dataset_identifier is not None:
+                self._distributions[dataset_identifier].remove(identifier)
+                self._remove_distribution(identifier)
+
+    def search(self, query, level=DATASET, limit=None, with_scores=False):
+        """Busca un texto libre en los metadatos de un nivel.
+
+        Args:
+            query (str): Texto a buscar. Se normaliza igual que los
+                metadatos indexados.
+            level (str): "dataset", "distribution" o "field".
+            limit (int): Cantidad máxima de resultados.
+            with_scores (bool): Si es verdadero, devuelve tuplas
+                (identificador, puntaje).
+
+        Returns:
+            list: Identificadores de las entidades que contienen algún
+                término de la búsqueda, de la más a la menos relevante.
+        """
+        with self._lock:
+            ranked = self._levels[level].search(tokenize(query), limit)
+        if with_scores:
+            return ranked
+        return [key for key, _ in ranked]
+
+    def _add_distribution(self, distribution):
+        identifier = distribution["identifier"]
+        self._levels[DISTRIBUTION].add(identifier, distribution)
+        self._fields[identifier] = field_ids = []
+        fields = distribution.get("field")
+        if isinstance(fields, list):
+            for field in fields:
+                if isinstance(field, dict) and field.get("id"):
+                    self._levels[FIELD].add(field["id"], field)
+                    field_ids.append(field["id"])
+
+    def _remove_dataset(self, identifier):
+        self._levels[DATASET].remove(identifier)
+        for distribution_identifier in self._distributions.pop(identifier,
+                                                               []):
+            self._parents.pop(distribution_identifier, None)
+            self._remove_distribution(distribution_identifier)
+
+    def _remove_distribution(self, identifier):
+        self._levels[DISTRIBUTION].remove(identifier)
+        for field_id in self._fields.pop(identifier, []):
+            self._levels[FIELD].remove(field_id)
@@ -1,13 +1,170 @@
 # -*- coding: utf-8 -*-
 
-from multiprocessing.pool import ThreadPool
+"""Módulo 'threading_helper' de Pydatajson
 
+Contiene un pool de threads reutilizable, con una cola de tareas acotada,
+que pueden compartir todos los chequeos de URLs y descargas de un proceso.
+El ciclo de vida del pool lo controla quien lo crea: sus threads se reusan
+entre llamadas hasta que se cierra.
+"""
 
-def apply_threading(l, function, cant_threads, **kwargs):
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import sys
+import threading
+from functools import partial
+
+import six
+from six.moves import queue
+
+_default_pool = None
+
+
+def get_default_pool():
+    """Devuelve el pool de threads usado por defecto por los chequeos de
+    links (o None)."""
+    return _default_pool
+
+
+def set_default_pool(pool):
+    """Configura el pool de threads usado por defecto por los chequeos de
+    links.
+
+    Args:
+        pool (WorkerPool): Pool a usar en todos los chequeos de links que no
+            especifiquen uno. None hace que cada chequeo cree el suyo.
+    """
+    global _default_pool
+    _default_pool = pool
+
+
+class WorkerPool(object):
+    """Pool de threads de larga vida con una cola de tareas acotada.
+
+    Los threads se crean con la primera tarea y atienden a todas las
+    llamadas hasta que se cierra el pool, por lo que varios validadores (o
+    varios catálogos) pueden repartir su trabajo en el mismo pool sin crear
+    y destruir threads en cada llamada. Las tareas no deben encolar otras
+    tareas en el mismo pool y esperar su resultado.
+
+    Args:
+        workers (int): Cantidad de threads.
+        queue_size (int): Cantidad máxima de tareas esperando un thread
+            libre. Por defecto, el doble de la cantidad de threads.
+    """
+
+    def __init__(self, workers=1, queue_size=None):
+        self.workers = max(1, workers or 1)
+        self.queue_size = queue_size or 2 * self.workers
+        self._tasks = queue.Queue(self.queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def imap_unordered(self, function, iterable, max_pending=None):
+        """Aplica una función a cada elemento y devuelve los resultados a
+        medida que terminan.
+
+        Args:
+            function (function): Función a aplicar.
+            iterable (iterable): Elementos a procesar. Se consumen a medida
+                que hay lugar en el pool.
+            max_pending (int): Cantidad máxima de elementos de esta llamada
+                procesándose a la vez. Por defecto, lo que entra en el pool.
+
+        Raises:
+            Exception: La primera excepción lanzada por la función.
+        """
+        self._start()
+        max_pending = max_pending or self.workers + self.queue_size
+        results = queue.Queue()
+        pending = 0
+        for item in iterable:
+            if pending >= max_pending:
+                pending -= 1
+                yield self._result(results.get())
+            self._tasks.put((function, item, results))
+            pending += 1
+
+        while pending:
+            pending -= 1
+            yield self._result(results.get())
+
+    def map(self, function, iterable, max_pending=None):
+        """Aplica una función a cada elemento.
+
+        Returns:
+            list: Resultados, en el orden de los elementos.
+        """
+        items = list(iterable)
+        results = [None] * len(items)
+        for index, result in self.imap_unordered(
+                partial(_indexed_call, function), enumerate(items),
+                max_pending):
+            results[index] = result
+        return results
+
+    def close(self):
+        """Espera a que terminen las tareas encoladas y detiene los
+        threads."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads, self._threads = self._threads, []
+
+        for _ in threads:
+            self._tasks.put(None)
+        for thread in threads:
+            thread.join()
+
+    def _start(self):
+        with self._lock:
+            if self._closed:
+                raise ValueError("El pool de threads está cerrado")
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            function, item, results = task
+            try:
+                results.put((True, function(item)))
+            except Exception:
+                results.put((False, sys.exc_info()))
+
+    @staticmethod
+    def _result(result):
+        success, value = result
+        if not success:
+            six.reraise(*value)
+        return value
+
+
+def _indexed_call(function, indexed_item):
+    index, item = indexed_item
+    return index, function(item)
+
+
+def apply_threading(l, function, cant_threads, pool=None, **kwargs):
+    if kwargs:
+        function = partial(function, **kwargs)
+    if pool is not None:
+        return pool.map(function, l, max_pending=cant_threads)
     if cant_threads == 1:
-        return [function(x, **kwargs) for x in l]
-    pool = ThreadPool(processes=cant_threads)
-    results = pool.map(function, l)
-    pool.close()
-    pool.join()
-    return results
+        return [function(x) for x in l]
+    with WorkerPool(cant_threads) as pool:
+        return pool.map(function, l)
@@ -23,3 +23,7 @@ def generate_distribution_ids(catalog):
             if "identifier" not in distribution:
                 distribution["identifier"] = "{}_{}".format(
                     dataset["identifier"], distribution_index)
+
+    # un DataJson reindexa los identificadores y descarta sus vistas
+    if hasattr(catalog, "_build_index"):
+        catalog._build_index()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'transport' de Pydatajson
+
+Contiene el transporte HTTP compartido por toda la librería: una sesión de
+`requests` con pools de conexiones por host y keep-alive, de forma que los
+pedidos sucesivos a un mismo servidor (descargas de catálogos, chequeos de
+URLs, llamadas a la API de CKAN) reutilizan las conexiones TCP/TLS abiertas.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# cantidad de hosts distintos para los que se mantiene un pool de conexiones
+DEFAULT_POOL_CONNECTIONS = 20
+# cantidad de conexiones abiertas que se mantienen por host
+DEFAULT_POOL_MAXSIZE = 20
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport():
+    """Devuelve el transporte usado por defecto por la librería.
+
+    Se crea en el primer uso, con los tamaños de pool por defecto.
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def set_default_transport(transport):
+    """Configura el transporte usado por defecto por la librería.
+
+    Args:
+        transport (Transport): Transporte a usar en todos los pedidos HTTP
+            que no especifiquen uno. None vuelve a crear uno por defecto en
+            el próximo uso.
+    """
+    global _default_transport
+    _default_transport = transport
+
+
+class Transport(object):
+    """Sesión HTTP con pools de conexiones por host.
+
+    Args:
+        pool_connections (int): Cantidad de hosts para los que se mantiene
+            un pool de conexiones.
+        pool_maxsize (int): Cantidad máxima de conexiones abiertas que se
+            mantienen por host. Conviene que sea al menos la cantidad de
+            threads que hacen pedidos en paralelo.
+        max_retries (int): Reintentos ante errores de conexión.
+        session (requests.Session): Sesión a usar. Si no se pasa, se crea
+            una nueva.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, max_retries=0,
+                 session=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = session or requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              max_retries=max_retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """Hace un pedido HTTP con la sesión compartida.
+
+        Args:
+            method (str): Método HTTP.
+            url (str): URL del pedido.
+            kwargs: Parámetros para requests.Session.request().
+
+        Returns:
+            requests.Response: Respuesta obtenida.
+        """
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """Cierra todas las conexiones abiertas."""
+        self.session.close()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'url_health_cache' de Pydatajson
+
+Contiene un caché persistente del estado de las URLs chequeadas. Guarda en
+una base SQLite, para cada URL y modo de verificación SSL, si funcionaba, el
+código de estado obtenido y cuándo se chequeó. Mientras el resultado no
+venza, los chequeos de links lo reutilizan sin volver a pedir la URL, también
+entre ejecuciones distintas y entre catálogos que comparten recursos.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import os
+import sqlite3
+import threading
+import time
+
+from six import string_types
+
+from pydatajson.helpers import ensure_dir_exists
+
+# tiempo, en segundos, durante el que se reutiliza el resultado de una URL
+DEFAULT_OK_TTL = 24 * 60 * 60
+DEFAULT_ERROR_TTL = 60 * 60
+# cantidad de URLs que se consultan por query (SQLite limita la cantidad de
+# parámetros a 999)
+QUERY_CHUNK_SIZE = 500
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Devuelve el caché de estado de URLs usado por defecto por los chequeos
+    de links (o None)."""
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """Configura el caché de estado de URLs usado por defecto por los
+    chequeos de links.
+
+    Args:
+        cache (UrlHealthCache): Caché a usar en todos los chequeos de links
+            que no especifiquen uno. None lo desactiva.
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+class UrlHealthCache(object):
+    """Caché del estado de URLs con vencimiento.
+
+    Los resultados exitosos y los fallidos vencen con tiempos distintos,
+    para volver a chequear antes las URLs rotas (que pueden haberse
+    arreglado o haber fallado por un problema transitorio). Los resultados
+    de un chequeo con verificación de certificados SSL se guardan aparte de
+    los de uno sin verificación.
+
+    Args:
+        path (str): Path de la base SQLite. Si no se especifica, el caché
+            sólo vive en memoria.
+        ok_ttl (float): Segundos durante los que se reutiliza el resultado
+            de una URL que funcionaba.
+        error_ttl (float): Segundos durante los que se reutiliza el
+            resultado de una URL que no funcionaba.
+    """
+
+    def __init__(self, path=None, ok_ttl=DEFAULT_OK_TTL,
+                 error_ttl=DEFAULT_ERROR_TTL):
+        self.path = path
+        self.ok_ttl = ok_ttl
+        self.error_ttl = error_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path:
+            ensure_dir_exists(os.path.dirname(path))
+        self._connection = sqlite3.connect(path or ":memory:",
+                                           check_same_thread=False)
+        with self._connection:
+            columns = [row[1] for row in self._connection.execute(
+                "PRAGMA table_info(url_health)")]
+            if columns and "verify_ssl" not in columns:
+                # las bases de versiones anteriores no distinguen el modo
+                # de verificación SSL: se descartan sus resultados
+                self._connection.execute("DROP TABLE url_health")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS url_health ("
+                "url TEXT NOT NULL, "
+                "verify_ssl INTEGER NOT NULL, "
+                "valid INTEGER NOT NULL, "
+                "status_code INTEGER, "
+                "checked_at REAL NOT NULL, "
+                "PRIMARY KEY (url, verify_ssl))")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM url_health").fetchone()[0]
+
+    def get(self, url, verify_ssl=True):
+        """Devuelve el resultado vigente de una URL, o None.
+
+        Args:
+            url (str): URL chequeada.
+            verify_ssl (bool): Si el chequeo verificaba los certificados
+                SSL.
+
+        Returns:
+            tuple: (bool, int) indicando si la URL funcionaba y el código de
+                estado obtenido.
+        """
+        return self.get_many([url], verify_ssl).get(url)
+
+    def get_many(self, urls, verify_ssl=True):
+        """Devuelve los resultados vigentes de varias URLs.
+
+        Args:
+            urls (list): URLs chequeadas.
+            verify_ssl (bool): Si los chequeos verificaban los certificados
+                SSL.
+
+        Returns:
+            dict: Resultado (bool, int) de cada URL con un resultado
+                vigente. Las URLs sin resultado no se incluyen.
+        """
+        urls = list(set(url for url in urls if _is_cacheable(url)))
+        now = time.time()
+        results = {}
+        with self._lock:
+            for start in range(0, len(urls), QUERY_CHUNK_SIZE):
+                chunk = urls[start:start + QUERY_CHUNK_SIZE]
+                rows = self._connection.execute(
+                    "SELECT url, valid, status_code, checked_at "
+                    "FROM url_health WHERE verify_ssl = ? AND "
+                    "url IN ({})".format(", ".join("?" * len(chunk))),
+                    [int(bool(verify_ssl))] + chunk)
+                for url, valid, status_code, checked_at in rows:
+                    ttl = self.ok_ttl if valid else self.error_ttl
+                    if now - checked_at < ttl:
+                        results[url] = (bool(valid), status_code)
+            self.hits += len(results)
+            self.misses += len(urls) - len(results)
+        return results
+
+    def set(self, url, result, verify_ssl=True):
+        """Guarda el resultado del chequeo de una URL.
+
+        Args:
+            url (str): URL chequeada.
+            result (tuple): (bool, int) indicando si la URL funciona y el
+                código de estado obtenido.
+            verify_ssl (bool): Si el chequeo verificó los certificados SSL.
+        """
+        self.set_many({url: result}, verify_ssl)
+
+    def set_many(self, results, verify_ssl=True):
+        """Guarda los resultados del chequeo de varias URLs.
+
+        Args:
+            results (dict): Resultado (bool, int) de cada URL.
+            verify_ssl (bool): Si los chequeos verificaron los certificados
+                SSL.
+        """
+        now = time.time()
+        verify_ssl = int(bool(verify_ssl))
+        rows = [(url, verify_ssl, int(bool(valid)), status_code, now)
+                for url, (valid, status_code) in results.items()
+                if _is_cacheable(url)]
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO url_health "
+                    "(url, verify_ssl, valid, status_code, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def purge(self):
+        """Elimina los resultados vencidos."""
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM url_health WHERE "
+                    "(valid = 1 AND checked_at <= ?) OR "
+                    "(valid = 0 AND checked_at <= ?)",
+                    (now - self.ok_ttl, now - self.error_ttl))
+
+    def clear(self):
+        """Elimina todos los resultados guardados."""
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM url_health")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _is_cacheable(url):
+    return isinstance(url, string_types) and bool(url)
@@ -9,21 +9,30 @@ Contiene los métodos para validar el perfil de metadatos de un catálogo.
 from __future__ import unicode_literals, print_function
 from __future__ import with_statement, absolute_import
 
+import glob
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import platform
+import threading
 
 import jsonschema
 
+import pydatajson
+from pydatajson.custom_exceptions import BaseValidationError, \
+    LazyCatalogError
+from pydatajson.link_checker import LinkChecker
+from pydatajson.validators.broken_links_validator \
+    import BrokenLinksValidator
 from pydatajson.validators.consistent_distribution_fields_validator \
     import ConsistentDistributionFieldsValidator
-from pydatajson.validators.distribution_urls_validator \
-    import DistributionUrlsValidator
-from pydatajson.validators.landing_pages_validator \
-    import LandingPagesValidator
 from pydatajson.validators.theme_ids_not_repeated_validator \
     import ThemeIdsNotRepeatedValidator
 from . import readers
+from . import schema_compiler
+from .validation_errors import ValidationErrors, fill_response
 
 ABSOLUTE_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 ABSOLUTE_SCHEMA_DIR = os.path.join(ABSOLUTE_PROJECT_DIR, "schemas")
@@ -31,50 +40,314 @@ DEFAULT_CATALOG_SCHEMA_FILENAME = "catalog.json"
 
 logger = logging.getLogger('pydatajson')
 
+# motores con los que se valida un catálogo contra el schema
+JSONSCHEMA_ENGINE = "jsonschema"
+COMPILED_ENGINE = "compiled"
+VALIDATION_ENGINES = (JSONSCHEMA_ENGINE, COMPILED_ENGINE)
+_default_engine = JSONSCHEMA_ENGINE
+
+# partes de un schema de catálogo que se pueden validar por separado
+ENVELOPE_PART = "envelope"
+DATASET_PART = "dataset"
+# chunks de datasets en los que se reparte la validación por proceso, para
+# balancear la carga cuando hay datasets más costosos que otros
+CHUNKS_PER_WORKER = 4
+# datasets de un DataJson lazy que se leen y validan juntos
+LAZY_CHUNK_SIZE = 200
+
+# Schemas leídos y con sus referencias resueltas, compartidos por todo el
+# proceso. La clave incluye la fecha de modificación de los schemas, de forma
+# que editarlos invalida la entrada.
+_compiled_schemas = {}
+_compiled_schemas_lock = threading.Lock()
+# Validadores generados con schema_compiler. No tienen estado mutable, así
+# que se comparten entre threads.
+_compiled_validators = {}
+# El RefResolver de jsonschema mantiene una pila de scopes mientras valida,
+# así que cada thread usa su propio Draft4Validator sobre el schema compartido
+_thread_validators = threading.local()
+
+
+def _unique_items(validator, unique, instance, schema):
+    if unique and validator.is_type(instance, "array") and \
+            not schema_compiler.uniq(instance):
+        yield jsonschema.ValidationError(
+            "%r has non-unique elements" % (instance,))
+
+
+class _Draft4Validator(jsonschema.Draft4Validator):
+    """Draft4Validator que chequea uniqueItems en tiempo lineal: el de
+    jsonschema compara cada par de datasets del catálogo."""
+
+    VALIDATORS = dict(jsonschema.Draft4Validator.VALIDATORS,
+                      uniqueItems=_unique_items)
+
+
+def _schema_uri(schema_path):
+    # Según https://github.com/Julian/jsonschema/issues/98
+    # Permite resolver referencias locales a otros esquemas.
+    if platform.system() == 'Windows':
+        return "file:///" + schema_path.replace("\\", "/")
+    return "file://" + schema_path
+
+
+def _schema_cache_key(schema_dir, schema_filename):
+    schema_dir = os.path.abspath(schema_dir)
+    schema_path = os.path.join(schema_dir, schema_filename)
+    # las referencias apuntan a otros schemas del mismo directorio
+    mtimes = [os.path.getmtime(path) for path in
+              glob.glob(os.path.join(schema_dir, "*.json"))]
+    mtimes.append(os.path.getmtime(schema_path))
+    return schema_dir, schema_filename, max(mtimes)
+
+
+def _compile_schema(schema_dir, schema_filename):
+    """Lee un schema y todos los del mismo directorio, para que las
+    referencias ($ref) entre ellos se resuelvan sin volver a leer disco."""
+    store = {}
+    for path in glob.glob(os.path.join(schema_dir, "*.json")):
+        try:
+            store[_schema_uri(path)] = readers.read_json(path)
+        except ValueError:
+            logger.warning("No se pudo leer el schema %s", path)
+
+    schema_path = os.path.join(schema_dir, schema_filename)
+    base_uri = _schema_uri(schema_path)
+    schema = store.get(base_uri) or readers.read_json(schema_path)
+
+    return schema, store, base_uri
+
+
+def _schema_part(schema, part):
+    """Devuelve la parte de un schema de catálogo con la que se valida.
+
+    Args:
+        schema (dict): Schema de catálogo.
+        part (str): None para el schema completo, DATASET_PART para el
+            schema de cada dataset o ENVELOPE_PART para el catálogo sin
+            descender en sus datasets (incluye las validaciones de la lista
+            "dataset" en sí, como uniqueItems).
+    """
+    if part is None:
+        return schema
+
+    dataset_schema = schema.get("properties", {}).get("dataset")
+    if not isinstance(dataset_schema, dict) or \
+            not isinstance(dataset_schema.get("items"), dict):
+        raise ValueError("El schema no define un schema para cada dataset")
+
+    if part == DATASET_PART:
+        return dataset_schema["items"]
+
+    envelope = schema.copy()
+    envelope["properties"] = schema["properties"].copy()
+    envelope["properties"]["dataset"] = dataset_schema.copy()
+    del envelope["properties"]["dataset"]["items"]
+    return envelope
+
+
+def get_jsonschema_validator(schema_filename=DEFAULT_CATALOG_SCHEMA_FILENAME,
+                             schema_dir=ABSOLUTE_SCHEMA_DIR, part=None):
+    """Devuelve un validador de jsonschema para un schema.
+
+    El schema se lee y se resuelven sus referencias una única vez por
+    proceso; las siguientes llamadas reutilizan el resultado mientras los
+    archivos no cambien.
+
+    Args:
+        schema_filename (str): Nombre del archivo del schema.
+        schema_dir (str): Directorio donde se encuentra el schema.
+        part (str): Parte del schema a validar (ver _schema_part()). Por
+            defecto, el schema completo.
+
+    Returns:
+        jsonschema.Draft4Validator: Validador del schema.
+
+    Raises:
+        ValueError: Si se pide una parte que el schema no define.
+    """
+    key = _schema_cache_key(schema_dir, schema_filename)
+
+    validators = getattr(_thread_validators, "validators", None)
+    if validators is None:
+        validators = _thread_validators.validators = {}
+    if key + (part,) in validators:
+        return validators[key + (part,)]
+
+    with _compiled_schemas_lock:
+        if key not in _compiled_schemas:
+            _discard_stale_entries(_compiled_schemas, key)
+            _compiled_schemas[key] = _compile_schema(key[0], schema_filename)
+        schema, store, base_uri = _compiled_schemas[key]
+
+    # las referencias de cualquier parte se resuelven desde el schema raíz
+    resolver = jsonschema.RefResolver(base_uri=base_uri, referrer=schema,
+                                      store=store)
+    validator = _Draft4Validator(
+        schema=_schema_part(schema, part), resolver=resolver,
+        format_checker=jsonschema.FormatChecker())
+    _discard_stale_entries(validators, key)
+    validators[key + (part,)] = validator
+
+    return validator
+
+
+def _discard_stale_entries(cache, key):
+    """Elimina las entradas del mismo schema con otra fecha de
+    modificación."""
+    for stale_key in [k for k in cache
+                      if k[:2] == key[:2] and k[2] != key[2]]:
+        del cache[stale_key]
+
+
+def get_compiled_validator(schema_filename=DEFAULT_CATALOG_SCHEMA_FILENAME,
+                           schema_dir=ABSOLUTE_SCHEMA_DIR, part=None):
+    """Devuelve un validador generado con schema_compiler para un schema.
+
+    La compilación se hace una única vez por proceso y el validador
+    resultante se comparte entre threads.
+
+    Args:
+        schema_filename (str): Nombre del archivo del schema.
+        schema_dir (str): Directorio donde se encuentra el schema.
+        part (str): Parte del schema a validar (ver _schema_part()). Por
+            defecto, el schema completo.
+
+    Returns:
+        schema_compiler.CompiledValidator: Validador del schema.
+
+    Raises:
+        schema_compiler.SchemaCompilationError: Si el schema usa palabras
+            clave que el compilador no soporta.
+    """
+    key = _schema_cache_key(schema_dir, schema_filename) + (part,)
+    with _compiled_schemas_lock:
+        compiled = _compiled_validators.get(key)
+    if compiled is None:
+        compiled = schema_compiler.compile_validator(
+            get_jsonschema_validator(schema_filename, schema_dir, part))
+        with _compiled_schemas_lock:
+            _discard_stale_entries(_compiled_validators, key)
+            _compiled_validators[key] = compiled
+    return compiled
+
+
+def clear_validators_cache():
+    """Descarta los schemas cacheados por get_jsonschema_validator() y los
+    validadores generados por get_compiled_validator()."""
+    with _compiled_schemas_lock:
+        _compiled_schemas.clear()
+        _compiled_validators.clear()
+    _thread_validators.validators = {}
+
+
+def set_default_engine(engine):
+    """Configura el motor de validación usado por defecto.
+
+    Args:
+        engine (str): "jsonschema" (Draft4Validator) o "compiled" (código
+            generado por schema_compiler, más rápido en catálogos grandes).
+    """
+    global _default_engine
+    if engine not in VALIDATION_ENGINES:
+        raise ValueError("Motor de validación desconocido: {}".format(engine))
+    _default_engine = engine
+
+
+def get_default_engine():
+    return _default_engine
+
 
 class Validator(object):
 
     def __init__(self, schema_filename=DEFAULT_CATALOG_SCHEMA_FILENAME,
-                 schema_dir=ABSOLUTE_SCHEMA_DIR):
+                 schema_dir=ABSOLUTE_SCHEMA_DIR, engine=None):
+        self.engine = engine or get_default_engine()
+        if self.engine not in VALIDATION_ENGINES:
+            raise ValueError(
+                "Motor de validación desconocido: {}".format(self.engine))
+        self.schema_filename = schema_filename
+        self.schema_dir = schema_dir
         self.jsonschema_validator = \
             self.init_jsonschema_validator(schema_dir, schema_filename)
 
-    def init_jsonschema_validator(self, schema_dir, schema_filename):
-        schema_path = os.path.join(schema_dir, schema_filename)
-        schema = readers.read_json(schema_path)
-        # Según https://github.com/Julian/jsonschema/issues/98
-        # Permite resolver referencias locales a otros esquemas.
-        if platform.system() == 'Windows':
-            base_uri = "file:///" + schema_path.replace("\\", "/")
-        else:
-            base_uri = "file://" + schema_path
-        resolver = jsonschema.RefResolver(base_uri=base_uri, referrer=schema)
-        format_checker = jsonschema.FormatChecker()
-        return jsonschema.Draft4Validator(
-            schema=schema, resolver=resolver, format_checker=format_checker)
+    def init_jsonschema_validator(self, schema_dir, schema_filename,
+                                  part=None):
+        if self.engine == COMPILED_ENGINE:
+            try:
+                return get_compiled_validator(schema_filename, schema_dir,
+                                              part)
+            except schema_compiler.SchemaCompilationError as e:
+                logger.warning("No se pudo compilar el schema %s, se valida "
+                               "con jsonschema: %s", schema_filename, e)
+        return get_jsonschema_validator(schema_filename, schema_dir, part)
 
     def is_valid(self, catalog, broken_links=False, verify_ssl=True,
-                 url_check_timeout=1, broken_links_threads=1):
+                 url_check_timeout=1, broken_links_threads=1,
+                 transport=None, validation_cache=None, workers=1,
+                 link_checker=None):
+        if _is_lazy(catalog):
+            errors = self._iter_lazy_errors(
+                catalog, broken_links=broken_links, verify_ssl=verify_ssl,
+                url_check_timeout=url_check_timeout,
+                broken_links_threads=broken_links_threads,
+                transport=transport, link_checker=link_checker,
+                validation_cache=validation_cache, workers=workers)
+            return next(errors, None) is None
+
+        if validation_cache is None and (workers or 1) <= 1:
+            errors = self._iter_errors(
+                catalog, broken_links=broken_links, verify_ssl=verify_ssl,
+                url_check_timeout=url_check_timeout,
+                broken_links_threads=broken_links_threads,
+                transport=transport, link_checker=link_checker)
+            return next(errors, None) is None
+
         return not self._get_errors(catalog,
                                     broken_links=broken_links,
                                     verify_ssl=verify_ssl,
                                     url_check_timeout=url_check_timeout,
-                                    broken_links_threads=broken_links_threads)
+                                    broken_links_threads=broken_links_threads,
+                                    transport=transport,
+                                    link_checker=link_checker,
+                                    validation_cache=validation_cache,
+                                    workers=workers)
 
     def validate_catalog(self, catalog, only_errors=False,
                          broken_links=False, verify_ssl=True,
-                         url_check_timeout=1, broken_links_threads=1):
+                         url_check_timeout=1, broken_links_threads=1,
+                         transport=None, validation_cache=None, workers=1,
+                         link_checker=None):
+        """Valida un catálogo y arma el reporte de sus errores.
 
-        default_response = self._default_response(catalog)
-        errors = self._get_errors(catalog, broken_links=broken_links,
-                                  verify_ssl=verify_ssl,
-                                  url_check_timeout=url_check_timeout,
-                                  broken_links_threads=broken_links_threads)
+        Si se chequean los links (`broken_links`), el reporte incluye en la
+        clave "hosts" el estado de salud de cada host chequeado, indicando
+        los que se dejaron de chequear por no responder.
+        """
+        if broken_links and link_checker is None:
+            link_checker = LinkChecker(transport, url_check_timeout,
+                                       verify_ssl, broken_links_threads)
 
-        response = default_response.copy()
-        for error in errors:
-            response = self._update_validation_response(
-                error, response)
+        if _is_lazy(catalog):
+            # los datasets recorridos reemplazan a la lista del catálogo
+            datasets = []
+            errors = list(self._iter_lazy_errors(
+                catalog, datasets, broken_links=broken_links,
+                verify_ssl=verify_ssl, url_check_timeout=url_check_timeout,
+                broken_links_threads=broken_links_threads,
+                transport=transport, link_checker=link_checker,
+                validation_cache=validation_cache, workers=workers))
+            default_response = self._default_response(
+                dict(catalog, dataset=datasets))
+        else:
+            default_response = self._default_response(catalog)
+            errors = self._get_errors(
+                catalog, broken_links=broken_links, verify_ssl=verify_ssl,
+                url_check_timeout=url_check_timeout,
+                broken_links_threads=broken_links_threads,
+                transport=transport, link_checker=link_checker,
+                validation_cache=validation_cache, workers=workers)
+        response = fill_response(default_response, errors)
 
         # filtra los resultados que están ok, para hacerlo más compacto
         if only_errors:
@@ -82,25 +355,395 @@ class Validator(object):
                 dataset for dataset in response["error"]["dataset"] if
                 dataset["status"] == "ERROR"]
 
+        if broken_links:
+            response["hosts"] = link_checker.hosts_report()
+
         return response
 
+    def get_validation_errors(self, catalog, broken_links=False,
+                              verify_ssl=True, url_check_timeout=1,
+                              broken_links_threads=1, transport=None,
+                              validation_cache=None, workers=1,
+                              link_checker=None):
+        """Devuelve los errores del catálogo agrupados por dataset, sin
+        armar la respuesta completa de validate_catalog().
+
+        Returns:
+            ValidationErrors: Errores de nivel catálogo y de cada dataset.
+        """
+        if _is_lazy(catalog):
+            datasets = []
+            errors = list(self._iter_lazy_errors(
+                catalog, datasets, broken_links=broken_links,
+                verify_ssl=verify_ssl, url_check_timeout=url_check_timeout,
+                broken_links_threads=broken_links_threads,
+                transport=transport, link_checker=link_checker,
+                validation_cache=validation_cache, workers=workers))
+            return ValidationErrors(errors, len(datasets))
+
+        errors = self._get_errors(catalog, broken_links=broken_links,
+                                  verify_ssl=verify_ssl,
+                                  url_check_timeout=url_check_timeout,
+                                  broken_links_threads=broken_links_threads,
+                                  transport=transport,
+                                  link_checker=link_checker,
+                                  validation_cache=validation_cache,
+                                  workers=workers)
+        datasets_count = (len(catalog["dataset"])
+                          if _has_dataset_list(catalog) else None)
+        return ValidationErrors(errors, datasets_count)
+
     def _get_errors(self, catalog, broken_links=False, verify_ssl=True,
-                    url_check_timeout=1, broken_links_threads=1):
+                    url_check_timeout=1, broken_links_threads=1,
+                    transport=None, validation_cache=None, workers=1,
+                    link_checker=None):
+        split = validation_cache is not None or (workers or 1) > 1
+        if split and _has_dataset_list(catalog):
+            errors = self._get_split_errors(catalog, validation_cache,
+                                            workers or 1)
+            if errors is not None:
+                validators = self._catalog_validators_for_catalog(catalog)
+                return self._add_custom_errors(
+                    errors, catalog, validators, broken_links=broken_links,
+                    verify_ssl=verify_ssl,
+                    url_check_timeout=url_check_timeout,
+                    broken_links_threads=broken_links_threads,
+                    transport=transport, link_checker=link_checker)
+
         errors = list(
             self.jsonschema_validator.iter_errors(catalog)
         )
+        return self._add_custom_errors(
+            errors, catalog, self._validators_for_catalog(catalog),
+            broken_links=broken_links, verify_ssl=verify_ssl,
+            url_check_timeout=url_check_timeout,
+            broken_links_threads=broken_links_threads, transport=transport,
+            link_checker=link_checker)
+
+    def _iter_errors(self, catalog, broken_links=False, verify_ssl=True,
+                     url_check_timeout=1, broken_links_threads=1,
+                     transport=None, link_checker=None):
+        """Itera los errores del catálogo de forma perezosa.
+
+        Las validaciones se ordenan de más barata a más costosa: las custom
+        de nivel catálogo, el schema de los metadatos de nivel catálogo, el
+        schema de cada dataset, las custom de cada dataset y por último el
+        chequeo de links. Quien sólo necesita saber si hay algún error puede
+        dejar de iterar en el primero sin pagar por el resto.
+
+        Los errores de los datasets conservan su path relativo al dataset,
+        por lo que no sirven para armar un reporte (ver _get_errors()).
+        """
+        # igual que en _add_custom_errors(), un validador custom que falla
+        # cancela el resto de las validaciones custom
+        custom_failed = [False]
+
+        def iter_custom_errors(validators):
+            if custom_failed[0]:
+                return
+            try:
+                for error in self._custom_errors(
+                        catalog, validators=validators):
+                    yield error
+            except Exception as e:
+                logger.warning("Error de validación: %s", e)
+                custom_failed[0] = True
+
+        for error in iter_custom_errors(
+                self._catalog_validators_for_catalog(catalog)):
+            yield error
+
+        for error in self._iter_schema_errors(catalog):
+            yield error
+
+        for error in iter_custom_errors(
+                self._dataset_validators_for_catalog(catalog)):
+            yield error
+
+        if broken_links:
+            link_validators = self._link_validators_for_catalog(
+                catalog, verify_ssl, url_check_timeout,
+                broken_links_threads, transport, link_checker)
+            for error in iter_custom_errors(link_validators):
+                yield error
+
+    def _iter_schema_errors(self, catalog):
+        """Itera los errores de schema, validando los metadatos de nivel
+        catálogo antes que cada uno de los datasets."""
         try:
-            for error in self._custom_errors(
-                    catalog, broken_links=broken_links,
-                    verify_ssl=verify_ssl,
-                    url_check_timeout=url_check_timeout,
-                    broken_links_threads=broken_links_threads):
+            envelope_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, ENVELOPE_PART)
+            dataset_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, DATASET_PART)
+        except ValueError:
+            envelope_validator = None
+
+        if envelope_validator is None or not _has_dataset_list(catalog):
+            for error in self.jsonschema_validator.iter_errors(catalog):
+                yield error
+            return
+
+        for error in envelope_validator.iter_errors(catalog):
+            yield error
+        for dataset in catalog["dataset"]:
+            for error in dataset_validator.iter_errors(dataset):
+                yield error
+
+    def _iter_lazy_errors(self, catalog, datasets=None, broken_links=False,
+                          verify_ssl=True, url_check_timeout=1,
+                          broken_links_threads=1, transport=None,
+                          link_checker=None, validation_cache=None,
+                          workers=1):
+        """Itera los errores de un DataJson lazy sin cargar todos sus
+        datasets en memoria.
+
+        Los metadatos de nivel catálogo se validan con el schema sin la
+        lista de datasets. Los datasets se leen de la fuente en chunks de
+        LAZY_CHUNK_SIZE y cada uno se valida como en _get_split_errors():
+        con el schema de dataset y los validadores custom de dataset (y sus
+        links, si se pide). La unicidad de la lista de datasets se chequea
+        con un hash de cada uno. Los errores tienen su path dentro del
+        catálogo completo.
+
+        Args:
+            datasets (list): Si se pasa, se le agrega el título y el
+                identificador de cada dataset recorrido.
+
+        Raises:
+            LazyCatalogError: Si el schema no permite validar cada dataset
+                por separado.
+        """
+        try:
+            envelope_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, ENVELOPE_PART)
+            dataset_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, DATASET_PART)
+        except ValueError:
+            raise LazyCatalogError("validar con este schema")
+
+        for error in envelope_validator.iter_errors(dict(catalog,
+                                                         dataset=[])):
+            yield error
+
+        namespace = (self._validation_cache_namespace()
+                     if validation_cache is not None else None)
+        pool = None
+        if workers and workers > 1:
+            pool = multiprocessing.Pool(workers)
+        digests = set()
+        repeated = None
+        offset = 0
+        try:
+            for chunk in _iter_chunks(catalog.iter_datasets(),
+                                      LAZY_CHUNK_SIZE):
+                for dataset in chunk:
+                    digest = _dataset_digest(dataset)
+                    if digest in digests and repeated is None:
+                        repeated = dataset
+                    digests.add(digest)
+                    if datasets is not None:
+                        datasets.append({"title": dataset.get("title"),
+                                         "identifier": dataset.get(
+                                             "identifier")})
+
+                entries = self._chunk_errors_entries(
+                    chunk, dataset_validator, validation_cache, namespace,
+                    workers or 1, pool)
+                for index, (schema_entry, custom_entry) in enumerate(
+                        entries):
+                    for entry in schema_entry + custom_entry:
+                        yield _rebase_error(entry, offset + index)
+
+                if broken_links:
+                    link_validators = self._link_validators_for_catalog(
+                        {"dataset": chunk}, verify_ssl, url_check_timeout,
+                        broken_links_threads, transport, link_checker)
+                    for error in self._iter_lazy_custom_errors(
+                            link_validators, offset):
+                        yield error
+                offset += len(chunk)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            if validation_cache is not None:
+                validation_cache.save()
+
+        if repeated is not None:
+            # la instancia del error son sólo los datasets repetidos
+            for error in envelope_validator.iter_errors(
+                    dict(catalog, dataset=[repeated, repeated])):
+                if error.validator == "uniqueItems":
+                    yield error
+
+        for error in self._iter_lazy_custom_errors(
+                self._catalog_validators_for_catalog(catalog)):
+            yield error
+
+    def _chunk_errors_entries(self, datasets, dataset_validator,
+                              validation_cache, namespace, workers, pool):
+        """Devuelve las entradas de errores de un chunk de datasets, usando
+        el caché de validación si hay uno."""
+        entries = [None] * len(datasets)
+        keys = {}
+        if validation_cache is not None:
+            for index, dataset in enumerate(datasets):
+                keys[index] = validation_cache.key(dataset, namespace)
+                entries[index] = validation_cache.get(keys[index])
+
+        pending = [index for index, entry in enumerate(entries)
+                   if entry is None]
+        pending_entries = self._datasets_errors_entries(
+            [datasets[index] for index in pending], dataset_validator,
+            workers, pool)
+        for index, entry in zip(pending, pending_entries):
+            entries[index] = entry
+            if validation_cache is not None:
+                validation_cache.set(keys[index], entry)
+        return entries
+
+    @staticmethod
+    def _iter_lazy_custom_errors(validators, offset=None):
+        """Itera los errores de validadores custom. Con `offset`, los
+        validadores recibieron un chunk de datasets y sus errores se ubican
+        en el catálogo completo."""
+        try:
+            for validator in validators:
+                for error in validator.validate():
+                    if offset is None:
+                        yield error
+                    else:
+                        yield _rebase_error(
+                            _error_entry(error, list(error.path)[2:]),
+                            offset + error.path[1])
+        except Exception as e:
+            logger.warning("Error de validación: %s", e)
+
+    def _add_custom_errors(self, errors, catalog, validators, **kwargs):
+        try:
+            for error in self._custom_errors(catalog, validators=validators,
+                                             **kwargs):
                 errors.append(error)
         except Exception as e:
             print(e)
             logger.warning("Error de validación")
         return errors
 
+    def _get_split_errors(self, catalog, validation_cache=None, workers=1):
+        """Devuelve los errores de schema del catálogo y los de cada
+        dataset, validando cada dataset por separado.
+
+        Los errores de nivel catálogo (incluyendo los de la lista "dataset",
+        como datasets repetidos) se calculan siempre en este proceso. Los de
+        cada dataset se toman del caché, si hay uno y el dataset no cambió,
+        o se calculan repartiendo los datasets en un pool de `workers`
+        procesos.
+
+        Returns:
+            list: Errores encontrados, o None si el schema no permite validar
+            cada dataset por separado.
+        """
+        try:
+            envelope_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, ENVELOPE_PART)
+            dataset_validator = self.init_jsonschema_validator(
+                self.schema_dir, self.schema_filename, DATASET_PART)
+        except ValueError:
+            return None
+
+        datasets = catalog["dataset"]
+        entries = [None] * len(datasets)
+        keys = {}
+        if validation_cache is not None:
+            namespace = self._validation_cache_namespace()
+            for index, dataset in enumerate(datasets):
+                keys[index] = validation_cache.key(dataset, namespace)
+                entries[index] = validation_cache.get(keys[index])
+
+        pending = [index for index, entry in enumerate(entries)
+                   if entry is None]
+        pending_entries = self._datasets_errors_entries(
+            [datasets[index] for index in pending], dataset_validator,
+            workers)
+        for index, entry in zip(pending, pending_entries):
+            entries[index] = entry
+            if validation_cache is not None:
+                validation_cache.set(keys[index], entry)
+        if validation_cache is not None:
+            validation_cache.save()
+
+        errors = list(envelope_validator.iter_errors(catalog))
+        custom_errors = []
+        for index, (schema_entry, custom_entry) in enumerate(entries):
+            errors.extend(_rebase_error(error, index)
+                          for error in schema_entry)
+            custom_errors.extend(_rebase_error(error, index)
+                                 for error in custom_entry)
+
+        # en cada dataset, los errores custom van después de los de schema
+        return errors + custom_errors
+
+    def _datasets_errors_entries(self, datasets, dataset_validator,
+                                 workers=1, pool=None):
+        """Valida una lista de datasets, en paralelo si workers > 1.
+
+        Si se pasa un `pool` de procesos, se usa en lugar de crear uno.
+
+        Returns:
+            list: Entradas de errores de cada dataset (ver
+            _dataset_errors_entry()), en el orden de los datasets.
+        """
+        if workers <= 1 or len(datasets) <= 1:
+            return [self._dataset_errors_entry(dataset, dataset_validator)
+                    for dataset in datasets]
+
+        validator_args = (type(self), self.schema_filename, self.schema_dir,
+                          self.engine)
+        chunk_size = max(1, -(-len(datasets) // (workers * CHUNKS_PER_WORKER)))
+        chunks = [(validator_args, datasets[i:i + chunk_size])
+                  for i in range(0, len(datasets), chunk_size)]
+
+        if pool is not None:
+            results = pool.map(_validate_datasets_chunk, chunks)
+        else:
+            pool = multiprocessing.Pool(workers)
+            try:
+                results = pool.map(_validate_datasets_chunk, chunks)
+            finally:
+                pool.close()
+                pool.join()
+
+        return [entry for chunk_entries in results for entry in chunk_entries]
+
+    def _dataset_errors_entry(self, dataset, dataset_validator):
+        """Valida un dataset y devuelve sus errores de schema y custom, con
+        paths relativos al dataset, en el formato de ValidationCache."""
+        schema_entry = [
+            _error_entry(error, list(error.path))
+            for error in dataset_validator.iter_errors(dataset)]
+
+        # los validadores custom reciben un catálogo con sólo este dataset
+        custom_entry = []
+        try:
+            for validator in self._dataset_validators_for_catalog(
+                    {"dataset": [dataset]}):
+                for error in validator.validate():
+                    custom_entry.append(
+                        _error_entry(error, list(error.path)[2:]))
+        except Exception as e:
+            logger.warning("Error de validación: %s", e)
+
+        return schema_entry, custom_entry
+
+    def _validation_cache_namespace(self):
+        """Identifica el schema y las validaciones custom con las que se
+        validan los datasets, para no mezclar entradas del caché."""
+        schema_dir, schema_filename, mtime = _schema_cache_key(
+            self.schema_dir, self.schema_filename)
+        return "{}:{}:{}:{}:{}".format(
+            pydatajson.__version__, type(self).__name__, schema_dir,
+            schema_filename, mtime)
+
     def _default_response(self, catalog):
         return {
             "status": "OK",
@@ -128,71 +771,144 @@ class Validator(object):
 
     # noinspection PyTypeChecker
     def _custom_errors(self, catalog, broken_links=False, verify_ssl=True,
-                       url_check_timeout=1, broken_links_threads=1):
+                       url_check_timeout=1, broken_links_threads=1,
+                       transport=None, validators=None, link_checker=None):
         """Realiza validaciones sin usar el jsonschema.
 
         En esta función se agregan bloques de código en python que realizan
         validaciones complicadas o imposibles de especificar usando jsonschema
         """
-        validators = self._validators_for_catalog(catalog)
+        if validators is None:
+            validators = self._validators_for_catalog(catalog)
         if broken_links:
-            validators.append(LandingPagesValidator(catalog, verify_ssl,
-                                                    url_check_timeout,
-                                                    broken_links_threads))
-            validators.append(DistributionUrlsValidator(catalog, verify_ssl,
-                                                        url_check_timeout,
-                                                        broken_links_threads))
+            validators.extend(self._link_validators_for_catalog(
+                catalog, verify_ssl, url_check_timeout,
+                broken_links_threads, transport, link_checker))
 
         for validator in validators:
             for error in validator.validate():
                 yield error
 
     @staticmethod
-    def _validators_for_catalog(catalog):
+    def _link_validators_for_catalog(catalog, verify_ssl=True,
+                                     url_check_timeout=1,
+                                     broken_links_threads=1, transport=None,
+                                     link_checker=None):
+        """Validadores custom que chequean el estado de las URLs."""
+        return [
+            BrokenLinksValidator(catalog, verify_ssl, url_check_timeout,
+                                 broken_links_threads, transport,
+                                 link_checker)
+        ]
+
+    @classmethod
+    def _validators_for_catalog(cls, catalog):
+        return (cls._catalog_validators_for_catalog(catalog) +
+                cls._dataset_validators_for_catalog(catalog))
+
+    @staticmethod
+    def _catalog_validators_for_catalog(catalog):
+        """Validadores custom de los metadatos de nivel catálogo."""
+        return [
+            ThemeIdsNotRepeatedValidator(catalog)
+        ]
+
+    @staticmethod
+    def _dataset_validators_for_catalog(catalog):
+        """Validadores custom cuyos errores dependen sólo de cada dataset."""
         return [
-            ThemeIdsNotRepeatedValidator(catalog),
             ConsistentDistributionFieldsValidator(catalog)
         ]
 
     def _update_validation_response(self, error, response):
         """Actualiza la respuesta por default acorde a un error de
         validación."""
-        new_response = response.copy()
-
-        # El status del catálogo entero será ERROR
-        new_response["status"] = "ERROR"
-
-        # Adapto la información del ValidationError recibido a los fines
-        # del validador de DataJsons
-        error_info = {
-            # Error Code 1 para "campo obligatorio faltante"
-            # Error Code 2 para "error en tipo o formato de campo"
-            "error_code": 1 if error.validator == "required" else 2,
-            "message": error.message,
-            "validator": error.validator,
-            "validator_value": error.validator_value,
-            "path": list(error.path),
-            # La instancia validada es irrelevante si el error es de tipo 1
-            "instance": (None if error.validator == "required"
-                         else error.instance)
-        }
+        return fill_response(response, [error])
+
+
+# Validadores usados por los procesos del pool de validación, uno por clase
+# y schema, reutilizados entre chunks
+_process_validators = {}
+
+
+def _validate_datasets_chunk(args):
+    """Valida un chunk de datasets en un proceso del pool.
+
+    Args:
+        args (tuple): ((clase del validador, schema_filename, schema_dir,
+            motor), lista de datasets).
+
+    Returns:
+        list: Entradas de errores de cada dataset.
+    """
+    validator_args, datasets = args
+    validator = _process_validators.get(validator_args)
+    if validator is None:
+        validator_class, schema_filename, schema_dir, engine = validator_args
+        validator = validator_class(schema_filename, schema_dir, engine)
+        _process_validators[validator_args] = validator
+
+    dataset_validator = validator.init_jsonschema_validator(
+        validator.schema_dir, validator.schema_filename, DATASET_PART)
+    return [validator._dataset_errors_entry(dataset, dataset_validator)
+            for dataset in datasets]
+
+
+def _is_lazy(catalog):
+    return getattr(catalog, "lazy", False)
+
+
+def _iter_chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-        # Identifico a qué nivel de jerarquía sucedió el error.
-        if len(error.path) >= 2 and error.path[0] == "dataset":
-            # El error está a nivel de un dataset particular o inferior
-            position = new_response["error"]["dataset"][error.path[1]]
-        else:
-            # El error está a nivel de catálogo
-            position = new_response["error"]["catalog"]
 
-        position["status"] = "ERROR"
-        position["errors"].append(error_info)
+def _dataset_digest(dataset):
+    """Hash de un dataset, para detectar datasets repetidos sin
+    conservarlos."""
+    serialized = json.dumps(dataset, sort_keys=True, default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).digest()
 
-        return new_response
+
+def _has_dataset_list(catalog):
+    return isinstance(catalog, dict) and \
+        isinstance(catalog.get("dataset"), list)
+
+
+def _error_entry(error, relative_path):
+    return (error.validator, error.message, error.validator_value,
+            relative_path, error.instance)
+
+
+def _rebase_error(entry, dataset_index):
+    """Reconstruye un error cacheado de un dataset en su posición dentro del
+    catálogo."""
+    validator, message, validator_value, relative_path, instance = entry
+    return BaseValidationError(validator, message, validator_value,
+                               ["dataset", dataset_index] + relative_path,
+                               instance)
+
+
+def _validation_kwargs(validation_cache=None, workers=None):
+    # sólo se pasan los parámetros usados, para no romper validadores
+    # propios que no los soportan
+    kwargs = {}
+    if validation_cache is not None:
+        kwargs["validation_cache"] = validation_cache
+    if workers and workers > 1:
+        kwargs["workers"] = workers
+    return kwargs
 
 
 def is_valid_catalog(catalog, validator=None, verify_ssl=True,
-                     url_check_timeout=1):
+                     url_check_timeout=1, validation_cache=None,
+                     workers=None):
     """Valida que un archivo `data.json` cumpla con el schema definido.
 
     Chequea que el data.json tiene todos los campos obligatorios y que
@@ -201,6 +917,11 @@ def is_valid_catalog(catalog, validator=None, verify_ssl=True,
 
     Args:
         catalog (str o dict): Catálogo (dict, JSON o XLSX) a ser validado.
+        validation_cache (ValidationCache): Caché de errores por dataset.
+            Si se especifica, sólo se revalidan los datasets que cambiaron.
+        workers (int): Cantidad de procesos entre los que se reparte la
+            validación de los datasets. Por defecto se valida en este
+            proceso.
 
     Returns:
         bool: True si el data.json cumple con el schema, sino False.
@@ -213,12 +934,15 @@ def is_valid_catalog(catalog, validator=None, verify_ssl=True,
             validator = Validator()
 
     return validator.is_valid(catalog, verify_ssl=verify_ssl,
-                              url_check_timeout=url_check_timeout)
+                              url_check_timeout=url_check_timeout,
+                              **_validation_kwargs(validation_cache,
+                                                   workers))
 
 
 def validate_catalog(catalog, only_errors=False, fmt="dict",
                      export_path=None, validator=None,
-                     verify_ssl=True, url_check_timeout=1):
+                     verify_ssl=True, url_check_timeout=1,
+                     validation_cache=None, workers=None):
     """Analiza un data.json registrando los errores que encuentra.
 
     Chequea que el data.json tiene todos los campos obligatorios y que
@@ -236,6 +960,11 @@ def validate_catalog(catalog, only_errors=False, fmt="dict",
         export_path (str): Path donde exportar el reporte generado (en
             formato XLSX o CSV). Si se especifica, el método no devolverá
             nada, a pesar de que se pase algún argumento en `fmt`.
+        validation_cache (ValidationCache): Caché de errores por dataset.
+            Si se especifica, sólo se revalidan los datasets que cambiaron.
+        workers (int): Cantidad de procesos entre los que se reparte la
+            validación de los datasets. Por defecto se valida en este
+            proceso.
 
     Returns:
         dict: Diccionario resumen de los errores encontrados::
@@ -279,4 +1008,37 @@ def validate_catalog(catalog, only_errors=False, fmt="dict",
     return validator.validate_catalog(catalog,
                                       only_errors,
                                       verify_ssl=verify_ssl,
-                                      url_check_timeout=url_check_timeout)
+                                      url_check_timeout=url_check_timeout,
+                                      **_validation_kwargs(
+                                          validation_cache, workers))
+
+
+def get_validation_errors(catalog, validator=None, verify_ssl=True,
+                          url_check_timeout=1, validation_cache=None,
+                          workers=None):
+    """Devuelve los errores de un data.json agrupados por dataset.
+
+    Es la representación compacta de validate_catalog(), para quien sólo
+    necesita saber qué datasets tienen errores y cuántos.
+
+    Args:
+        catalog (str o dict): Catálogo (dict, JSON o XLSX) a ser validado.
+        validation_cache (ValidationCache): Caché de errores por dataset.
+            Si se especifica, sólo se revalidan los datasets que cambiaron.
+        workers (int): Cantidad de procesos entre los que se reparte la
+            validación de los datasets. Por defecto se valida en este
+            proceso.
+
+    Returns:
+        ValidationErrors: Errores de nivel catálogo y de cada dataset.
+    """
+    catalog = readers.read_catalog(catalog)
+    if not validator:
+        if hasattr(catalog, "validator"):
+            validator = catalog.validator
+        else:
+            validator = Validator()
+
+    return validator.get_validation_errors(
+        catalog, verify_ssl=verify_ssl, url_check_timeout=url_check_timeout,
+        **_validation_kwargs(validation_cache, workers))
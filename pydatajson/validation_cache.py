@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'validation_cache' de Pydatajson
+
+Contiene un caché de los errores de validación de cada dataset, indexado por
+un hash de su contenido. Al validar de nuevo un catálogo en el que cambiaron
+pocos datasets, sólo esos datasets (y los metadatos de nivel catálogo) se
+vuelven a validar; los errores del resto se toman del caché.
+
+El caché vive en memoria y, si se indica un directorio, se persiste en disco
+entre ejecuciones.
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from six import text_type
+from six.moves import cPickle as pickle
+
+from pydatajson.helpers import ensure_dir_exists, write_file_atomically
+
+logger = logging.getLogger('pydatajson')
+
+# se incrementa cuando cambia el formato de las entradas o las validaciones
+# que se cachean, para invalidar los cachés anteriores
+VALIDATION_CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 100000
+
+
+class ValidationCache(object):
+    """Caché de errores de validación por dataset.
+
+    Cada entrada guarda los errores de un dataset como tuplas (validator,
+    message, validator_value, path, instance), con el path relativo al
+    dataset, de forma que sirven aunque el dataset cambie de posición en el
+    catálogo.
+
+    Args:
+        cache_dir (str): Directorio donde se persiste el caché. Si no se
+            especifica, el caché sólo vive en memoria.
+        max_entries (int): Cantidad máxima de datasets que se recuerdan. Al
+            superarla se descartan los usados hace más tiempo.
+    """
+
+    FILENAME = "validation_cache.pickle"
+
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._modified = False
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            ensure_dir_exists(cache_dir)
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(dataset, namespace=""):
+        """Calcula la clave de un dataset a partir de su JSON canónico.
+
+        Args:
+            dataset (dict): Dataset a validar.
+            namespace (str): Identifica el schema y las validaciones con las
+                que se valida el dataset.
+
+        Returns:
+            str: Clave del dataset en el caché.
+        """
+        canonical = json.dumps(dataset, sort_keys=True, separators=(",", ":"),
+                               ensure_ascii=False, default=text_type)
+        content = "{}\n{}\n{}".format(VALIDATION_CACHE_VERSION, namespace,
+                                      canonical)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Devuelve los errores cacheados de un dataset, o None."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        """Guarda los errores de un dataset.
+
+        Args:
+            key (str): Clave devuelta por key().
+            entry (tuple): Errores del dataset (ver Validator).
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._modified = True
+
+    def load(self):
+        """Lee el caché persistido en disco, si existe."""
+        try:
+            with io.open(self._path(), "rb") as f:
+                version, entries = pickle.load(f)
+        except (IOError, OSError):
+            return
+        except Exception as e:
+            logger.warning(
+                "No se pudo leer el caché de validación: {}".format(e))
+            return
+
+        if version == VALIDATION_CACHE_VERSION:
+            with self._lock:
+                self._entries = entries
+
+    def save(self):
+        """Persiste el caché en disco, si se configuró un directorio y hubo
+        cambios desde la última lectura."""
+        if not self.cache_dir or not self._modified:
+            return
+
+        with self._lock:
+            content = pickle.dumps((VALIDATION_CACHE_VERSION, self._entries),
+                                   pickle.HIGHEST_PROTOCOL)
+            self._modified = False
+        write_file_atomically(self._path(), content)
+
+    def clear(self):
+        """Elimina todas las entradas del caché, en memoria y en disco."""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._modified = False
+        if self.cache_dir and os.path.exists(self._path()):
+            os.remove(self._path())
+
+    def _path(self):
+        return os.path.join(self.cache_dir, self.FILENAME)
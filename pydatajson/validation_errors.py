@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""Módulo 'validation_errors' de Pydatajson
+
+Contiene una representación compacta de los errores de validación de un
+catálogo, agrupados por nivel (catálogo o dataset) en una sola pasada. Los
+reportes que sólo necesitan saber qué datasets tienen errores la consumen
+directamente, sin armar la respuesta completa de validate_catalog().
+"""
+
+from __future__ import unicode_literals, print_function
+from __future__ import with_statement, absolute_import
+
+OK = "OK"
+ERROR = "ERROR"
+
+
+class ValidationErrors(object):
+    """Errores de validación de un catálogo.
+
+    Sólo guarda los errores encontrados, separados entre los de nivel
+    catálogo y los de cada dataset (indexados por su posición en la lista
+    "dataset"). Los datasets sin errores no ocupan lugar.
+
+    Args:
+        errors (iterable): Errores de validación (ValidationError de
+            jsonschema o BaseValidationError).
+        datasets_count (int): Cantidad de datasets del catálogo, o None si el
+            catálogo no tiene una lista de datasets.
+    """
+
+    def __init__(self, errors=(), datasets_count=None):
+        self.datasets_count = datasets_count
+        self.catalog_errors = []
+        self.dataset_errors = {}
+        self.extend(errors)
+
+    def add(self, error):
+        """Agrega un error al nivel de jerarquía en el que sucedió."""
+        self.extend([error])
+
+    def extend(self, errors):
+        """Agrega varios errores, en una sola pasada."""
+        catalog_errors = self.catalog_errors
+        dataset_errors = self.dataset_errors
+        for error in errors:
+            path = error.path
+            if len(path) >= 2 and path[0] == "dataset":
+                # El error está a nivel de un dataset particular o inferior
+                bucket = dataset_errors.get(path[1])
+                if bucket is None:
+                    bucket = dataset_errors[path[1]] = []
+                bucket.append(error)
+            else:
+                # El error está a nivel de catálogo
+                catalog_errors.append(error)
+
+    def __len__(self):
+        return len(self.catalog_errors) + sum(
+            len(errors) for errors in self.dataset_errors.values())
+
+    def is_valid(self):
+        return not self.catalog_errors and not self.dataset_errors
+
+    @property
+    def status(self):
+        return OK if self.is_valid() else ERROR
+
+    @property
+    def catalog_status(self):
+        return ERROR if self.catalog_errors else OK
+
+    def dataset_status(self, index):
+        return ERROR if index in self.dataset_errors else OK
+
+    def dataset_errors_count(self, index):
+        return len(self.dataset_errors.get(index, ()))
+
+    def invalid_datasets(self):
+        """Devuelve las posiciones de los datasets con errores, en orden."""
+        return sorted(self.dataset_errors)
+
+    def fill_response(self, response):
+        """Vuelca los errores en una respuesta por default de
+        Validator.validate_catalog().
+
+        Args:
+            response (dict): Respuesta sin errores, con un lugar reservado
+                para cada dataset.
+
+        Returns:
+            dict: La misma respuesta, con los errores y estados completos.
+        """
+        errors = list(self.catalog_errors)
+        for index in self.invalid_datasets():
+            errors.extend(self.dataset_errors[index])
+        return fill_response(response, errors)
+
+
+def fill_response(response, errors):
+    """Vuelca errores de validación en una respuesta por default de
+    Validator.validate_catalog(), en una sola pasada y sin copiarla.
+
+    Args:
+        response (dict): Respuesta sin errores, con un lugar reservado para
+            cada dataset.
+        errors (iterable): Errores de validación.
+
+    Returns:
+        dict: La misma respuesta, con los errores y estados completos.
+    """
+    catalog_position = response["error"]["catalog"]
+    datasets_positions = response["error"]["dataset"]
+    for error in errors:
+        # Identifico a qué nivel de jerarquía sucedió el error.
+        path = error.path
+        if len(path) >= 2 and path[0] == "dataset":
+            position = datasets_positions[path[1]]
+        else:
+            position = catalog_position
+
+        # El status del catálogo entero será ERROR
+        response["status"] = ERROR
+        position["status"] = ERROR
+        position["errors"].append(error_info(error))
+
+    return response
+
+
+def error_info(error):
+    """Adapta la información de un error de validación a los fines del
+    validador de DataJsons.
+
+    Returns:
+        dict: Información del error, con las claves "error_code", "message",
+            "validator", "validator_value", "path" e "instance".
+    """
+    return {
+        # Error Code 1 para "campo obligatorio faltante"
+        # Error Code 2 para "error en tipo o formato de campo"
+        "error_code": 1 if error.validator == "required" else 2,
+        "message": error.message,
+        "validator": error.validator,
+        "validator_value": error.validator_value,
+        "path": list(error.path),
+        # La instancia validada es irrelevante si el error es de tipo 1
+        "instance": (None if error.validator == "required"
+                     else error.instance)
+    }
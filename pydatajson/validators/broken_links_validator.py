@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from pydatajson.link_checker import LinkChecker, UrlCheckPlanner
+from pydatajson.validators.distribution_urls_validator \
+    import DistributionUrlsValidator
+from pydatajson.validators.landing_pages_validator \
+    import LandingPagesValidator
+from pydatajson.validators.simple_validator import SimpleValidator
+
+
+class BrokenLinksValidator(SimpleValidator):
+    """Chequea las landing pages de los datasets y las URLs de las
+    distribuciones de un catálogo juntas, pidiendo una sola vez cada URL
+    que aparezca en más de un lugar."""
+
+    def __init__(self, catalog, verify_ssl, url_check_timeout, threads_count,
+                 transport=None, link_checker=None):
+        super(BrokenLinksValidator, self).__init__(catalog)
+        self.link_checker = link_checker or LinkChecker(
+            transport, url_check_timeout, verify_ssl, threads_count)
+        self.validators = [
+            LandingPagesValidator(catalog, verify_ssl, url_check_timeout,
+                                  threads_count, transport,
+                                  self.link_checker),
+            DistributionUrlsValidator(catalog, verify_ssl, url_check_timeout,
+                                      threads_count, transport,
+                                      self.link_checker)
+        ]
+        self.requests_saved = 0
+
+    def validate(self):
+        planner = UrlCheckPlanner(self.link_checker)
+        for validator in self.validators:
+            planner.add(validator)
+        results = planner.run()
+        self.requests_saved += planner.requests_saved
+
+        for errors in results:
+            for error in errors:
+                yield error
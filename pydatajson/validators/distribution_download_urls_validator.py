@@ -1,24 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from pydatajson import threading_helper
+from pydatajson.helpers import iter_catalog_datasets
 from pydatajson.validators.url_validator import UrlValidator
 
 
 class DistributionDownloadUrlsValidator(UrlValidator):
 
-    def validate(self):
-        async_results = []
-        for dataset in self.catalog.get('dataset', []):
-            distribution_urls = \
+    def plan(self):
+        distribution_urls = []
+        for dataset in iter_catalog_datasets(self.catalog):
+            distribution_urls += \
                 [distribution.get('downloadURL', '')
                  for distribution in dataset.get('distribution', [])]
-            async_results += threading_helper \
-                .apply_threading(distribution_urls,
-                                 self.is_working_url,
-                                 self.threads_count)
 
-        result = 0
-        for res, _ in async_results:
-            result += res
+        def report(async_results):
+            result = 0
+            for res, _ in async_results:
+                result += res
 
-        return result
+            return result
+
+        return distribution_urls, report
@@ -2,13 +2,12 @@
 # -*- coding: utf-8 -*-
 
 import pydatajson.custom_exceptions as ce
-from pydatajson import threading_helper
 from pydatajson.validators.url_validator import UrlValidator
 
 
 class LandingPagesValidator(UrlValidator):
 
-    def validate(self):
+    def plan(self):
         datasets = self.catalog.get('dataset')
         datasets = filter(lambda x: x.get('landingPage'), datasets)
 
@@ -23,18 +22,18 @@ class LandingPagesValidator(UrlValidator):
             })
             urls.append(dataset.get('landingPage'))
 
-        sync_res = threading_helper \
-            .apply_threading(urls,
-                             self.is_working_url,
-                             self.threads_count)
-
-        for i in range(len(sync_res)):
-            valid, status_code = sync_res[i]
-            act_metadata = metadata[i]
-            dataset_idx = act_metadata["dataset_idx"]
-            dataset_title = act_metadata["dataset_title"]
-            landing_page = act_metadata["landing_page"]
-
-            if not valid:
-                yield ce.BrokenLandingPageError(dataset_idx, dataset_title,
-                                                landing_page, status_code)
+        def report(sync_res):
+            for i in range(len(sync_res)):
+                valid, status_code = sync_res[i]
+                act_metadata = metadata[i]
+                dataset_idx = act_metadata["dataset_idx"]
+                dataset_title = act_metadata["dataset_title"]
+                landing_page = act_metadata["landing_page"]
+
+                if not valid:
+                    yield ce.BrokenLandingPageError(dataset_idx,
+                                                    dataset_title,
+                                                    landing_page,
+                                                    status_code)
+
+        return urls, report
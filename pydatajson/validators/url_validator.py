@@ -1,38 +1,45 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import re
-
-import requests
-from requests import RequestException, Timeout
-
-from pydatajson.constants import EXCEPTION_STATUS_CODES, \
-    INVALID_STATUS_CODES_REGEX
+from pydatajson.link_checker import LinkChecker
 from pydatajson.validators.simple_validator import SimpleValidator
 
 
 class UrlValidator(SimpleValidator):
 
-    def __init__(self, catalog, verify_ssl, url_check_timeout, threads_count):
+    def __init__(self, catalog, verify_ssl, url_check_timeout, threads_count,
+                 transport=None, link_checker=None):
         super(UrlValidator, self).__init__(catalog)
         self.verify_ssl = verify_ssl
         self.url_check_timeout = url_check_timeout
         self.threads_count = threads_count
+        self.link_checker = link_checker or LinkChecker(
+            transport, url_check_timeout, verify_ssl, threads_count)
+        self.transport = self.link_checker.transport
 
     def validate(self):
+        urls, report = self.plan()
+        return report(self.check_urls(urls))
+
+    def plan(self):
+        """Devuelve las URLs a chequear y la función que arma el resultado
+        de validate() a partir del resultado del chequeo de cada una.
+
+        Permite que un UrlCheckPlanner junte las URLs de varios validadores
+        y chequee cada una una sola vez.
+
+        Returns:
+            tuple: (list, function) con las URLs y la función que recibe la
+                lista de resultados (bool, int), en el mismo orden.
+        """
         raise NotImplementedError
 
     def is_working_url(self, url):
-        try:
-            response = requests.head(url,
-                                     timeout=self.url_check_timeout,
-                                     verify=self.verify_ssl)
-            matches = []
-            if response.status_code not in EXCEPTION_STATUS_CODES:
-                matches = \
-                    [re.match(pattern, str(response.status_code)) is not None
-                     for pattern in INVALID_STATUS_CODES_REGEX]
-            return True not in matches, response.status_code
-        except Timeout:
-            return False, 408
-        except (RequestException, Exception):
-            return False, None
+        return self.link_checker.check(url)
+
+    def check_urls(self, urls):
+        """Chequea una lista de URLs con el motor de chequeo de links.
+
+        Returns:
+            list: Tuplas (bool, int) con el resultado de cada URL.
+        """
+        return self.link_checker.check_urls(urls, self.is_working_url)
@@ -11,7 +11,6 @@ Contiene los métodos para escribir
 from __future__ import print_function, unicode_literals, with_statement
 
 import io
-import json
 import logging
 import os
 
@@ -19,9 +18,10 @@ import openpyxl as pyxl
 import unicodecsv as csv
 from openpyxl.styles import Font
 from openpyxl.utils import column_index_from_string
-from six import string_types, text_type, moves, iteritems
+from six import string_types, moves, iteritems
 
 from . import helpers
+from . import json_backends
 
 logger = logging.getLogger('pydatajson')
 
@@ -242,10 +242,17 @@ def _list_table_to_ws(wb, table, table_name=None, column_styles=None,
     _apply_styles_to_ws(ws, column_styles, cell_styles)
 
 
-def write_json(obj, path):
-    """Escribo un objeto a un archivo JSON con codificación UTF-8."""
-    obj_str = text_type(json.dumps(obj, indent=4, separators=(",", ": "),
-                                   ensure_ascii=False))
+def write_json(obj, path, json_backend=None):
+    """Escribo un objeto a un archivo JSON con codificación UTF-8.
+
+    Args:
+        obj (object): Objeto a escribir.
+        path (str): Path del archivo a escribir.
+        json_backend (str): Librería con la que se serializa el objeto (ver
+            json_backends). Si no se especifica, se usa la configurada con
+            json_backends.set_default_backend().
+    """
+    obj_str = json_backends.dumps(obj, indent=4, backend=json_backend)
 
     helpers.ensure_dir_exists(os.path.dirname(path))
 
@@ -253,14 +260,16 @@ def write_json(obj, path):
         target.write(obj_str)
 
 
-def write_json_catalog(catalog, path):
+def write_json_catalog(catalog, path, json_backend=None):
     """Escribe el catálogo en JSON.
 
     Args:
         catalog (DataJson): Catálogo de datos.
         path (str): Directorio absoluto donde se crea el archivo XLSX.
+        json_backend (str): Librería con la que se serializa el catálogo (ver
+            json_backends).
     """
-    write_json(catalog, path)
+    write_json(catalog, path, json_backend=json_backend)
 
 
 XLSX_FIELDS = {
@@ -52,7 +52,8 @@ setup(
     test_suite='tests',
     tests_require=test_requirements,
     extras_require={
-        ':python_version=="2.7"': backport_requirements
+        ':python_version=="2.7"': backport_requirements,
+        'fastjson': ['orjson; python_version>="3.6"', 'python-rapidjson']
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,569 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks de pydatajson
+
+Mide el tiempo de operaciones costosas sobre catálogos generados
+artificialmente. Se corren con:
+
+    python -m tests.benchmarks [nombre_del_benchmark ...]
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import with_statement
+
+import argparse
+import copy
+import glob
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import timeit
+from collections import OrderedDict
+
+import requests
+from openpyxl import Workbook
+
+from pydatajson import catalog_query, json_backends, link_checker, search, \
+    text_search, threading_helper, url_health_cache, validation, \
+    validation_errors
+from pydatajson.core import DataJson
+from pydatajson.readers import read_local_xlsx_catalog
+from pydatajson.validators.distribution_urls_validator \
+    import DistributionUrlsValidator
+from pydatajson.validators.landing_pages_validator \
+    import LandingPagesValidator
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(fn):
+    """Registra una función como benchmark."""
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+def report(name, times):
+    """Imprime el mejor y el peor tiempo de un benchmark."""
+    print("{:<40} mejor: {:8.3f}s  peor: {:8.3f}s  ({} corridas)".format(
+        name, min(times), max(times), len(times)))
+
+
+def generate_catalog(datasets=10000, distributions=2, fields=3):
+    """Genera un catálogo válido con la cantidad de entidades pedida."""
+    catalog = {
+        "title": "Catálogo de prueba",
+        "description": "Catálogo generado",
+        "publisher": {"name": "Organismo", "mbox": "datos@example.com"},
+        "issued": "2018-01-01",
+        "superThemeTaxonomy": "http://datos.gob.ar/superThemeTaxonomy.json",
+        "themeTaxonomy": [{"id": "tema", "label": "Tema",
+                           "description": "Tema de prueba"}],
+        "dataset": [],
+    }
+
+    for i in range(datasets):
+        dataset = {
+            "identifier": "dataset-{}".format(i),
+            "title": "Dataset {}".format(i),
+            "description": "Descripción",
+            "publisher": {"name": "Organismo"},
+            "superTheme": ["ECON"],
+            "theme": ["tema"],
+            "keyword": ["prueba"],
+            "accrualPeriodicity": "R/P1Y",
+            "issued": "2018-01-01",
+            "landingPage": "http://example.com/{}".format(i),
+            "distribution": [],
+        }
+        for j in range(distributions):
+            distribution_id = "{}.{}".format(i, j)
+            url = "http://example.com/{}.csv".format(distribution_id)
+            dataset["distribution"].append({
+                "identifier": distribution_id,
+                "title": "Distribución {}".format(j),
+                "accessURL": url,
+                "downloadURL": url,
+                "issued": "2018-01-01T00:00:00",
+                "field": [{"title": "campo_{}".format(k), "type": "string",
+                           "description": "Campo {}".format(k)}
+                          for k in range(fields)],
+            })
+        catalog["dataset"].append(dataset)
+
+    return catalog
+
+
+def generate_xlsx_catalog(path, datasets=10000, distributions=2, fields=3):
+    """Genera un catálogo XLSX con la cantidad de entidades pedida."""
+    wb = Workbook(write_only=True)
+
+    ws_catalog = wb.create_sheet("Catalog")
+    ws_catalog.append(["catalog_title", "catalog_description",
+                       "catalog_publisher_name", "catalog_publisher_mbox",
+                       "catalog_issued", "catalog_superThemeTaxonomy"])
+    ws_catalog.append(["Catálogo de prueba", "Catálogo generado",
+                       "Organismo", "datos@example.com", "2018-01-01",
+                       "http://datos.gob.ar/superThemeTaxonomy.json"])
+
+    ws_theme = wb.create_sheet("Theme")
+    ws_theme.append(["theme_id", "theme_label", "theme_description"])
+    ws_theme.append(["tema", "Tema", "Tema de prueba"])
+
+    ws_dataset = wb.create_sheet("Dataset")
+    ws_dataset.append(["dataset_identifier", "dataset_title",
+                       "dataset_description", "dataset_publisher_name",
+                       "dataset_superTheme", "dataset_theme",
+                       "dataset_accrualPeriodicity", "dataset_issued"])
+    ws_distribution = wb.create_sheet("Distribution")
+    ws_distribution.append(["dataset_identifier", "dataset_title",
+                            "distribution_identifier", "distribution_title",
+                            "distribution_accessURL",
+                            "distribution_downloadURL",
+                            "distribution_issued"])
+    ws_field = wb.create_sheet("Field")
+    ws_field.append(["dataset_identifier", "dataset_title",
+                     "distribution_identifier", "distribution_title",
+                     "field_title", "field_type", "field_description"])
+
+    for i in range(datasets):
+        dataset_id = "dataset-{}".format(i)
+        dataset_title = "Dataset {}".format(i)
+        ws_dataset.append([dataset_id, dataset_title, "Descripción",
+                           "Organismo", "ECON", "tema", "R/P1Y",
+                           "2018-01-01"])
+
+        for j in range(distributions):
+            distribution_id = "{}.{}".format(i, j)
+            distribution_title = "Distribución {}".format(j)
+            url = "http://example.com/{}.csv".format(distribution_id)
+            ws_distribution.append([dataset_id, dataset_title,
+                                    distribution_id, distribution_title,
+                                    url, url, "2018-01-01"])
+
+            for k in range(fields):
+                ws_field.append([dataset_id, dataset_title, distribution_id,
+                                 distribution_title, "campo_{}".format(k),
+                                 "string", "Campo {}".format(k)])
+
+    wb.save(path)
+
+
+@benchmark
+def xlsx_catalog_assembly(repeat=3, datasets=10000):
+    """Lectura de un catálogo XLSX con 10.000 datasets."""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "catalog.xlsx")
+        generate_xlsx_catalog(path, datasets=datasets)
+
+        times = timeit.repeat(lambda: read_local_xlsx_catalog(path),
+                              repeat=repeat, number=1)
+        report("xlsx_catalog_assembly ({} datasets)".format(datasets), times)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+@benchmark
+def json_backends_samples(repeat=5, number=20):
+    """Lectura y escritura de los catálogos de ejemplo con cada backend."""
+    documents = []
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.json"))):
+        with io.open(path, encoding="utf-8") as f:
+            content = f.read()
+        try:
+            documents.append((content, json_backends.loads(content, "json")))
+        except ValueError:
+            continue
+
+    for backend in json_backends.available_backends():
+        times = timeit.repeat(
+            lambda: [json_backends.loads(content, backend)
+                     for content, _ in documents],
+            repeat=repeat, number=number)
+        report("json loads ({})".format(backend), times)
+
+        times = timeit.repeat(
+            lambda: [json_backends.dumps(obj, indent=4, backend=backend)
+                     for _, obj in documents],
+            repeat=repeat, number=number)
+        report("json dumps ({})".format(backend), times)
+
+
+@benchmark
+def schema_validation_engines(repeat=3, datasets=2000):
+    """Validación contra el schema con jsonschema y con código generado."""
+    valid = generate_catalog(datasets=datasets)
+    invalid = generate_catalog(datasets=datasets)
+    for dataset in invalid["dataset"][::2]:
+        dataset["title"] = ""
+        del dataset["issued"]
+
+    for engine in validation.VALIDATION_ENGINES:
+        validator = validation.Validator(engine=engine).jsonschema_validator
+        for name, catalog in [("válido", valid), ("inválido", invalid)]:
+            times = timeit.repeat(
+                lambda: list(validator.iter_errors(catalog)),
+                repeat=repeat, number=1)
+            report("schema {} ({} datasets, {})".format(
+                engine, datasets, name), times)
+
+
+@benchmark
+def parallel_schema_validation(repeat=3, datasets=10000):
+    """Validación de un catálogo con los datasets repartidos en procesos."""
+    catalog = generate_catalog(datasets=datasets)
+    for dataset in catalog["dataset"][::2]:
+        dataset["title"] = ""
+
+    validator = validation.Validator()
+    cpus = multiprocessing.cpu_count()
+    for workers in sorted({1, 2, cpus}):
+        times = timeit.repeat(
+            lambda: validator.validate_catalog(catalog, workers=workers),
+            repeat=repeat, number=1)
+        report("validate_catalog ({} datasets, {} workers)".format(
+            datasets, workers), times)
+
+
+@benchmark
+def validation_response_assembly(repeat=5, datasets=20000):
+    """Armado de la respuesta de validación de un catálogo con muchos
+    errores, completa y compacta."""
+    catalog = generate_catalog(datasets=datasets)
+    for dataset in catalog["dataset"]:
+        dataset["title"] = ""
+        dataset["keyword"] = [1, 2]
+        del dataset["issued"]
+
+    validator = validation.Validator()
+    errors = validator._get_errors(catalog)
+    times = timeit.repeat(
+        lambda: validation_errors.fill_response(
+            validator._default_response(catalog), errors),
+        repeat=repeat, number=1)
+    report("respuesta completa ({} errores)".format(len(errors)), times)
+
+    times = timeit.repeat(
+        lambda: validation_errors.ValidationErrors(errors, datasets),
+        repeat=repeat, number=1)
+    report("errores compactos ({} errores)".format(len(errors)), times)
+
+
+class SlowTransport(object):
+    """Transporte que simula la latencia de los servidores chequeados."""
+
+    def __init__(self, latency=0.02):
+        self.latency = latency
+
+    def head(self, url, **kwargs):
+        time.sleep(self.latency)
+        return FakeResponse(200)
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+@benchmark
+def indexed_search(repeat=3, datasets=5000, queries=20):
+    """Búsquedas filtradas repetidas sobre un mismo catálogo, recorriéndolo
+    entero o con índices secundarios."""
+    catalog = generate_catalog(datasets=datasets, fields=1)
+    for i, dataset in enumerate(catalog["dataset"]):
+        dataset["publisher"] = {"name": "Organismo {}".format(i % 50)}
+    datajson = DataJson(catalog, indexed_search=True)
+
+    def run_queries(target):
+        for i in range(queries):
+            search.get_datasets(target, {"dataset": {
+                "publisher": {"name": "Organismo {}".format(i % 50)}}})
+            search.get_distributions(target, {"distribution": {
+                "identifier": "{}.0".format(i)}})
+
+    name = "{} búsquedas filtradas ({} datasets, {})".format(
+        queries * 2, datasets, "{}")
+    report(name.format("recorriendo el catálogo"),
+           timeit.repeat(lambda: run_queries(catalog), repeat=repeat,
+                         number=1))
+    report(name.format("con índices"),
+           timeit.repeat(lambda: run_queries(datajson), repeat=repeat,
+                         number=1))
+
+
+@benchmark
+def compiled_queries(repeat=3, datasets=5000, queries=20):
+    """Consultas con rangos de fechas y condiciones entre niveles, filtrando
+    en Python el resultado de get_datasets() o con una consulta compilada
+    que usa los índices secundarios."""
+    catalog = generate_catalog(datasets=datasets, fields=1)
+    for i, dataset in enumerate(catalog["dataset"]):
+        dataset["publisher"] = {"name": "Organismo {}".format(i % 50)}
+        dataset["issued"] = "201{}-0{}-01".format(i % 10, i % 9 + 1)
+    datajson = DataJson(catalog, indexed_search=True)
+
+    def python_filter(i):
+        return [
+            dataset for dataset in datajson.get_datasets()
+            if dataset["publisher"]["name"] in (
+                "Organismo {}".format(i % 50), "Organismo 0") and
+            "2015-01-01" <= dataset["issued"] < "2018-01-01" and
+            any(distribution.get("format") != "PDF"
+                for distribution in dataset["distribution"])]
+
+    compiled = [catalog_query.compile_query({
+        "dataset.publisher.name": {
+            "in": ["Organismo {}".format(i % 50), "Organismo 0"]},
+        "dataset.issued": {"gte": "2015-01-01", "lt": "2018-01-01"},
+        "not": {"distribution.format": "PDF"},
+    }) for i in range(queries)]
+
+    name = "{} consultas ({} datasets, {})".format(queries, datasets, "{}")
+    report(name.format("filtro en Python"),
+           timeit.repeat(lambda: [python_filter(i) for i in range(queries)],
+                         repeat=repeat, number=1))
+    report(name.format("consulta compilada"),
+           timeit.repeat(lambda: [datajson.query(query)
+                                  for query in compiled],
+                         repeat=repeat, number=1))
+
+
+@benchmark
+def catalog_pruning(repeat=3, datasets=10000, removed=2000):
+    """Eliminación de datasets antes de federar, de a uno (consultando el
+    catálogo entre eliminaciones) o en una sola pasada."""
+    catalog = generate_catalog(datasets=datasets, distributions=1, fields=1)
+    identifiers = [dataset["identifier"]
+                   for dataset in catalog["dataset"][::datasets // removed]]
+
+    def prune_one_by_one(datajson):
+        for identifier in identifiers:
+            datajson.remove_dataset(identifier)
+            datajson.get_dataset(catalog["dataset"][-1]["identifier"])
+
+    def time_pruning(prune):
+        times = []
+        for _ in range(repeat):
+            datajson = DataJson(copy.deepcopy(catalog))
+            start = timeit.default_timer()
+            prune(datajson)
+            times.append(timeit.default_timer() - start)
+        return times
+
+    name = "eliminar {} de {} datasets ({})".format(
+        len(identifiers), datasets, "{}")
+    report(name.format("de a uno"), time_pruning(prune_one_by_one))
+    report(name.format("remove_datasets"), time_pruning(
+        lambda datajson: datajson.remove_datasets(identifiers)))
+
+
+@benchmark
+def paginated_search(repeat=3, datasets=20000, page_size=50):
+    """Una página de resultados de un catálogo grande, recortando la lista
+    de get_datasets() o con iter_datasets() y un cursor."""
+    catalog = generate_catalog(datasets=datasets, distributions=1, fields=1)
+    datajson = DataJson(catalog, indexed_search=True)
+    offset = datasets // 2
+    cursor = catalog["dataset"][offset - 1]["identifier"]
+
+    name = "página de {} datasets de {} ({})".format(
+        page_size, datasets, "{}")
+    report(name.format("get_datasets"), timeit.repeat(
+        lambda: datajson.get_datasets(
+            exclude_meta_fields=["distribution"])[
+                offset:offset + page_size],
+        repeat=repeat, number=1))
+    report(name.format("iter_datasets con offset"), timeit.repeat(
+        lambda: list(datajson.iter_datasets(
+            exclude_meta_fields=["distribution"], offset=offset,
+            limit=page_size)),
+        repeat=repeat, number=1))
+    report(name.format("iter_datasets con cursor"), timeit.repeat(
+        lambda: list(datajson.iter_datasets(
+            exclude_meta_fields=["distribution"], cursor=cursor,
+            limit=page_size)),
+        repeat=repeat, number=1))
+
+
+@benchmark
+def flat_views(repeat=3, datasets=5000, accesses=20):
+    """Accesos repetidos a las listas planas de distribuciones y fields, con
+    un dict (se arman vistas en cada acceso), con un DataJson (se recorren
+    sus entidades) y con un DataJson con cached_views (vistas guardadas)."""
+    catalog = generate_catalog(datasets=datasets)
+    datajson = DataJson(copy.deepcopy(catalog))
+    cached = DataJson(copy.deepcopy(catalog), cached_views=True)
+
+    def run_accesses(target):
+        for _ in range(accesses):
+            search.get_distributions(target)
+            search.get_fields(target)
+
+    name = "{} accesos a distributions y fields ({} datasets, {})".format(
+        accesses * 2, datasets, "{}")
+    report(name.format("dict"),
+           timeit.repeat(lambda: run_accesses(catalog), repeat=repeat,
+                         number=1))
+    report(name.format("DataJson"),
+           timeit.repeat(lambda: run_accesses(datajson), repeat=repeat,
+                         number=1))
+    report(name.format("DataJson con cached_views"),
+           timeit.repeat(lambda: run_accesses(cached), repeat=repeat,
+                         number=1))
+
+
+@benchmark
+def full_text_search(repeat=3, datasets=100000, queries=100):
+    """Búsquedas de texto libre sobre un catálogo de 100.000 datasets."""
+    words = ["precios", "energía", "turismo", "población", "exportaciones",
+             "salud", "educación", "transporte", "empleo", "presupuesto",
+             "combustibles", "vivienda", "agricultura", "industria"]
+    catalog = generate_catalog(datasets=datasets, distributions=1, fields=1)
+    for i, dataset in enumerate(catalog["dataset"]):
+        dataset["title"] = "{} de {} {}".format(
+            words[i % len(words)], words[i // len(words) % len(words)], i)
+        dataset["keyword"] = [words[(i * 7) % len(words)]]
+    datajson = DataJson(catalog)
+
+    report("índice de texto ({} datasets)".format(datasets),
+           timeit.repeat(lambda: text_search.TextIndex(datajson),
+                         repeat=1, number=1))
+    datajson.search_text(words[0])
+    for query in ["{} {}".format(words[0], words[1]), "{} 12345".format(
+            words[2])]:
+        times = timeit.repeat(
+            lambda: datajson.search_text(query, limit=10), repeat=repeat,
+            number=queries)
+        report("búsqueda de texto '{}' (por consulta)".format(query),
+               [elapsed / queries for elapsed in times])
+
+
+@benchmark
+def link_checking(repeat=3, urls=500, hosts=10, workers=20):
+    """Chequeo de URLs con latencia simulada, con y sin concurrencia."""
+    urls = ["http://host{}.gob.ar/recurso/{}".format(i % hosts, i)
+            for i in range(urls)]
+    for max_workers in [1, workers]:
+        checker = link_checker.LinkChecker(SlowTransport(),
+                                           max_workers=max_workers)
+        times = timeit.repeat(lambda: checker.check_urls(urls),
+                              repeat=repeat, number=1)
+        report("link checker ({} URLs, {} workers)".format(
+            len(urls), max_workers), times)
+
+    checker = link_checker.LinkChecker(
+        SlowTransport(), max_workers=workers,
+        health_cache=url_health_cache.UrlHealthCache())
+    checker.check_urls(urls)
+    times = timeit.repeat(lambda: checker.check_urls(urls),
+                          repeat=repeat, number=1)
+    report("link checker ({} URLs, caché de estado)".format(len(urls)),
+           times)
+
+
+class DeadHostTransport(SlowTransport):
+    """Transporte que simula un host que nunca responde."""
+
+    def head(self, url, **kwargs):
+        time.sleep(self.latency)
+        raise requests.ConnectionError(url)
+
+
+@benchmark
+def dead_host_link_checking(repeat=3, urls=500, workers=4):
+    """Chequeo de las URLs de un host caído, con y sin corte por host."""
+    urls = ["http://caido.gob.ar/recurso/{}".format(i) for i in range(urls)]
+    for max_host_failures in [None, 5]:
+        times = timeit.repeat(
+            lambda: link_checker.LinkChecker(
+                DeadHostTransport(), max_workers=workers,
+                max_host_failures=max_host_failures).check_urls(urls),
+            repeat=repeat, number=1)
+        report("host caído ({} URLs, corte tras {} fallas)".format(
+            len(urls), max_host_failures), times)
+
+
+@benchmark
+def shared_worker_pool(repeat=3, calls=200, urls=5, workers=8):
+    """Muchos chequeos de pocas URLs, creando un pool de threads por
+    llamada o compartiendo uno de larga vida."""
+    batches = [["http://host{}.gob.ar/{}/{}".format(j, i, j)
+                for j in range(urls)] for i in range(calls)]
+
+    def check_batches(pool=None):
+        checker = link_checker.LinkChecker(
+            SlowTransport(latency=0.001), max_workers=workers, pool=pool)
+        for batch in batches:
+            checker.check_urls(batch)
+
+    name = "{} chequeos de {} URLs ({})".format(calls, urls, "{}")
+    report(name.format("pool por llamada"),
+           timeit.repeat(check_batches, repeat=repeat, number=1))
+    with threading_helper.WorkerPool(workers) as pool:
+        report(name.format("pool compartido"),
+               timeit.repeat(lambda: check_batches(pool), repeat=repeat,
+                             number=1))
+
+
+@benchmark
+def url_check_planning(repeat=3, datasets=100, catalogs=2, workers=20):
+    """Chequeo de links de varios catálogos que comparten URLs, validador
+    por validador o juntando todas las URLs en un UrlCheckPlanner."""
+    catalog = generate_catalog(datasets=datasets, fields=1)
+    validator_classes = [LandingPagesValidator, DistributionUrlsValidator]
+
+    def validators(checker):
+        return [cls(catalog, True, 1, workers, link_checker=checker)
+                for _ in range(catalogs) for cls in validator_classes]
+
+    def check_separately():
+        for validator in validators(link_checker.LinkChecker(
+                SlowTransport(), max_workers=workers)):
+            list(validator.validate())
+
+    def check_planned():
+        planner = link_checker.UrlCheckPlanner(link_checker.LinkChecker(
+            SlowTransport(), max_workers=workers))
+        for validator in validators(planner.link_checker):
+            planner.add(validator)
+        planner.run()
+        return planner
+
+    urls_count = sum(len(validator.plan()[0])
+                     for validator in validators(None))
+    report("links de {} catálogos ({} URLs, por validador)".format(
+        catalogs, urls_count),
+        timeit.repeat(check_separately, repeat=repeat, number=1))
+    report("links de {} catálogos ({} URLs, {} pedidos ahorrados)".format(
+        catalogs, urls_count, check_planned().requests_saved),
+        timeit.repeat(check_planned, repeat=repeat, number=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*",
+                        help="Benchmarks a correr (todos, por defecto): "
+                             "{}".format(", ".join(BENCHMARKS)))
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error("Benchmarks inexistentes: {}".format(", ".join(unknown)))
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+import decimal
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pydatajson import readers
+from pydatajson.catalog_cache import CatalogSnapshotCache
+from pydatajson.core import DataJson
+from pydatajson.helpers import write_file_atomically
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+
+class CatalogSnapshotCacheTestCase(unittest.TestCase):
+
+    @classmethod
+    def get_sample(cls, sample_filename):
+        return os.path.join(SAMPLES_DIR, sample_filename)
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = CatalogSnapshotCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_unchanged_catalog_is_loaded_from_snapshot(self):
+        path = self.get_sample("catalogo_justicia.xlsx")
+        original = DataJson(path, snapshot_cache=self.cache)
+
+        with mock.patch.object(readers, "read_catalog") as read_catalog:
+            cached = DataJson(path, snapshot_cache=self.cache)
+            read_catalog.assert_not_called()
+
+        self.assertDictEqual(dict(original), dict(cached))
+        self.assertEqual(original._datasets_index, cached._datasets_index)
+        self.assertEqual(original._distributions_index,
+                         cached._distributions_index)
+        self.assertEqual(original._fields_index, cached._fields_index)
+
+    def test_changed_catalog_is_read_again(self):
+        path = os.path.join(self.cache_dir, "catalog.json")
+        shutil.copy(self.get_sample("full_data.json"), path)
+        DataJson(path, snapshot_cache=self.cache)
+
+        shutil.copy(self.get_sample("minimum_data.json"), path)
+        catalog = DataJson(path, snapshot_cache=self.cache)
+
+        self.assertDictEqual(
+            readers.read_catalog(self.get_sample("minimum_data.json")),
+            dict(catalog))
+
+    def test_default_values_are_part_of_the_key(self):
+        path = self.get_sample("full_data.json")
+        self.assertNotEqual(
+            self.cache.key(path),
+            self.cache.key(path, default_values={"catalog_title": "x"}))
+
+    def test_non_json_default_values(self):
+        path = self.get_sample("full_data.json")
+        key = self.cache.key(path, default_values={
+            "dataset_issued": datetime.date(2018, 1, 1),
+            "distribution_byteSize": decimal.Decimal("10.5")})
+        self.assertNotEqual(self.cache.key(path), key)
+        self.assertEqual(key, self.cache.key(path, default_values={
+            "dataset_issued": datetime.date(2018, 1, 1),
+            "distribution_byteSize": decimal.Decimal("10.5")}))
+
+    def test_remote_and_dict_catalogs_are_not_cached(self):
+        self.assertIsNone(self.cache.key("http://test.com/data.json"))
+        self.assertIsNone(self.cache.key({"dataset": []}))
+
+    def test_corrupt_snapshot_is_ignored(self):
+        path = self.get_sample("full_data.json")
+        key = self.cache.key(path)
+        with open(self.cache._path(key), "wb") as f:
+            f.write(b"no es un pickle")
+
+        catalog = DataJson(path, snapshot_cache=self.cache)
+        self.assertDictEqual(readers.read_catalog(path), dict(catalog))
+
+    def test_concurrent_writes_to_the_same_path(self):
+        path = os.path.join(self.cache_dir, "snapshot")
+        errors = []
+
+        def write(i):
+            try:
+                for _ in range(200):
+                    write_file_atomically(path, b"contenido")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(i,))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        with open(path, "rb") as f:
+            self.assertEqual(b"contenido", f.read())
+        self.assertEqual(["snapshot"], os.listdir(self.cache_dir))
+
+    def test_failed_save_does_not_abort_loading(self):
+        path = self.get_sample("full_data.json")
+        with mock.patch.object(CatalogSnapshotCache, "save",
+                               side_effect=OSError("disco lleno")):
+            catalog = DataJson(path, snapshot_cache=self.cache)
+        self.assertDictEqual(readers.read_catalog(path), dict(catalog))
+        self.assertIsNotNone(catalog.get_dataset(
+            catalog["dataset"][0]["identifier"]))
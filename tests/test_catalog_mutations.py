@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de los métodos que modifican los datasets y distribuciones de un
+DataJson manteniendo sus índices."""
+
+from __future__ import unicode_literals
+
+import copy
+import unittest
+
+from pydatajson import custom_exceptions as ce
+from pydatajson.core import DataJson
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+
+def make_dataset(identifier, distributions=2, fields=2):
+    return {
+        "identifier": identifier,
+        "title": "Dataset {}".format(identifier),
+        "distribution": [
+            {"identifier": "{}.{}".format(identifier, i),
+             "title": "Distribución {}.{}".format(identifier, i),
+             "field": [{"id": "{}.{}.{}".format(identifier, i, j),
+                        "title": "field_{}".format(j)}
+                       for j in range(fields)]}
+            for i in range(distributions)]
+    }
+
+
+def make_catalog(datasets=5):
+    return {"dataset": [make_dataset("ds{}".format(i))
+                        for i in range(datasets)]}
+
+
+class CatalogMutationsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.datajson = DataJson(make_catalog())
+
+    def assert_indexes_are_current(self):
+        indexes = (self.datajson._datasets_index,
+                   self.datajson._distributions_index,
+                   self.datajson._fields_index)
+        rebuilt = DataJson(copy.deepcopy(dict(self.datajson)))
+        self.assertEqual((rebuilt._datasets_index,
+                          rebuilt._distributions_index,
+                          rebuilt._fields_index), indexes)
+
+        # las búsquedas por identificador no reconstruyen los índices
+        with mock.patch.object(DataJson, "_build_index") as build_index:
+            for dataset in self.datajson["dataset"]:
+                self.assertIs(dataset, self.datajson.get_dataset(
+                    dataset["identifier"]))
+                for distribution in dataset["distribution"]:
+                    self.assertIs(distribution, self.datajson.get_distribution(
+                        distribution["identifier"]))
+                    for field in distribution["field"]:
+                        self.assertIs(field, self.datajson.get_field(
+                            field["id"]))
+        build_index.assert_not_called()
+
+    def identifiers(self):
+        return [dataset["identifier"] for dataset in self.datajson["dataset"]]
+
+    def test_remove_dataset(self):
+        self.datajson.remove_dataset("ds1")
+        self.datajson.remove_dataset("inexistente")
+        self.assertEqual(["ds0", "ds2", "ds3", "ds4"], self.identifiers())
+        self.assertIsNone(self.datajson.get_dataset("ds1"))
+        self.assertIsNone(self.datajson.get_distribution("ds1.0"))
+        self.assert_indexes_are_current()
+
+    def test_remove_datasets(self):
+        removed = self.datajson.remove_datasets(["ds0", "ds3", "inexistente"])
+        self.assertEqual(2, removed)
+        self.assertEqual(["ds1", "ds2", "ds4"], self.identifiers())
+        self.assert_indexes_are_current()
+
+    def test_remove_distributions(self):
+        self.datajson.remove_distribution("ds2.0")
+        self.datajson.remove_distribution("ds3.1", dataset_identifier="ds2")
+        removed = self.datajson.remove_distributions(["ds0.1", "ds4.0",
+                                                      "ds4.1"])
+        self.assertEqual(3, removed)
+        self.assertEqual(
+            [["ds0.0"], ["ds1.0", "ds1.1"], ["ds2.1"], ["ds3.0", "ds3.1"],
+             []],
+            [[distribution["identifier"]
+              for distribution in dataset["distribution"]]
+             for dataset in self.datajson["dataset"]])
+        self.assertIsNone(self.datajson.get_field("ds2.0.0"))
+        self.assert_indexes_are_current()
+
+    def test_add_and_replace(self):
+        self.datajson.add_dataset(make_dataset("nuevo", distributions=1))
+        self.datajson.add_distribution(
+            make_dataset("otro")["distribution"][0], "ds0")
+        self.datajson.replace_dataset(make_dataset("ds1", distributions=1))
+        replaced = make_dataset("ds2")["distribution"][1]
+        replaced["title"] = "Reemplazada"
+        self.datajson.replace_distribution(replaced)
+
+        self.assertEqual(["ds0", "ds1", "ds2", "ds3", "ds4", "nuevo"],
+                         self.identifiers())
+        self.assertEqual("otro.0", self.datajson.get_distribution(
+            "otro.0")["identifier"])
+        self.assertIsNone(self.datajson.get_distribution("ds1.1"))
+        self.assertEqual("Reemplazada", self.datajson.get_distribution(
+            "ds2.1")["title"])
+        self.assert_indexes_are_current()
+
+    def test_invalid_mutations(self):
+        with self.assertRaises(ce.DatasetIdRepetitionError):
+            self.datajson.add_dataset(make_dataset("ds0"))
+        with self.assertRaises(ce.DistributionIdRepetitionError):
+            self.datajson.add_distribution(
+                make_dataset("ds0")["distribution"][0], "ds1")
+        with self.assertRaises(ce.DatasetIdNonExistentError):
+            self.datajson.add_distribution({"identifier": "x"}, "inexistente")
+        with self.assertRaises(ce.DatasetIdNonExistentError):
+            self.datajson.replace_dataset(make_dataset("inexistente"))
+        with self.assertRaises(ce.DistributionIdNonExistentError):
+            self.datajson.replace_distribution(
+                make_dataset("ds0")["distribution"][0],
+                dataset_identifier="ds1")
+        self.assert_indexes_are_current()
+
+    def test_direct_modifications_are_found(self):
+        # el catálogo se modificó sin usar los métodos de DataJson
+        self.datajson["dataset"].reverse()
+        self.datajson.remove_dataset("ds1")
+        self.datajson.remove_distribution("ds0.0")
+        self.assertEqual(["ds4", "ds3", "ds2", "ds0"], self.identifiers())
+        self.assertEqual(["ds0.1"], [
+            distribution["identifier"] for distribution
+            in self.datajson["dataset"][-1]["distribution"]])
+
+    def test_search_results_follow_mutations(self):
+        datajson = DataJson(make_catalog(), indexed_search=True)
+        self.assertEqual(20, len(datajson.get_fields()))
+        self.assertEqual(["ds2"], datajson.search_text("ds2"))
+
+        datajson.remove_datasets(["ds0", "ds2"])
+        datajson.add_dataset(make_dataset("ds5", distributions=1))
+        datajson.remove_distribution("ds3.0")
+        self.assertEqual(12, len(datajson.get_fields()))
+        self.assertEqual(["ds3.1"], datajson.get_distributions(
+            filter_in={"dataset": {"identifier": "ds3"}},
+            meta_field="identifier"))
+        self.assertEqual([], datajson.search_text("ds2"))
+        self.assertEqual(["ds5"], datajson.search_text("ds5"))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""Tests del lenguaje de consultas sobre catálogos."""
+
+from __future__ import unicode_literals
+
+import datetime
+import json
+import os
+import unittest
+
+from pydatajson.catalog_query import compile_query
+from pydatajson.core import DataJson
+from pydatajson.custom_exceptions import InvalidQueryError
+from pydatajson.search import query, get_datasets, get_distributions, \
+    get_fields
+from pydatajson.search_indexes import LEVELS
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from .test_search_indexes import FILTERS
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+
+def filters_to_query(filter_in, filter_out, levels):
+    """Traduce los filtros de search a una consulta. Los filtros de niveles
+    inferiores al buscado no se aplican en search."""
+    conditions = [{"dataset.identifier": {"exists": True}}]
+    for level, filters in (filter_in or {}).items():
+        for key, value in filters.items():
+            if level in levels:
+                conditions.append({"{}.{}".format(level, key): value})
+    for level, filters in (filter_out or {}).items():
+        for key, value in filters.items():
+            if level in levels:
+                conditions.append({"{}.{}".format(level, key): {"ne": value}})
+    return {"and": conditions}
+
+
+def make_catalog():
+    return {"dataset": [
+        {"identifier": "a", "publisher": {"name": "INDEC"},
+         "issued": "2017-05-01T10:00:00-03:00",
+         "distribution": [
+             {"identifier": "a.1", "format": "CSV", "byteSize": 100,
+              "issued": "2017-05-01",
+              "field": [{"id": "a.1.1", "type": "date"},
+                        {"id": "a.1.2", "type": "number",
+                         "units": "Pesos"}]},
+             {"identifier": "a.2", "format": "XLSX", "byteSize": 5000}]},
+        {"identifier": "b", "publisher": {"name": "BCRA"},
+         "issued": "2018-02-01",
+         "distribution": [
+             {"identifier": "b.1", "format": "JSON", "issued": "2018-02-01",
+              "field": [{"id": "b.1.1", "type": "string"}]}]},
+        {"identifier": "c", "issued": "2019"},
+    ]}
+
+
+class CatalogQueryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = make_catalog()
+        self.datajson = DataJson(make_catalog(), indexed_search=True)
+
+    def assert_query(self, expected, query_, level="dataset"):
+        for catalog in (self.catalog, self.datajson):
+            found = query(catalog, query_, level=level)
+            self.assertEqual(expected, [
+                entity.get("identifier", entity.get("id"))
+                for entity in found])
+
+    def test_nested_paths_and_in(self):
+        self.assert_query(["a"], {"dataset.publisher.name": "INDEC"})
+        self.assert_query(["a", "b"], {"dataset.publisher.name": {
+            "in": ["INDEC", "BCRA", "otro"]}})
+        self.assert_query(["b.1"], {"dataset.publisher": {"name": "BCRA"}},
+                          level="distribution")
+
+    def test_ranges(self):
+        # las fechas con zona horaria se comparan en UTC
+        self.assert_query(["a", "b"], {"dataset.issued": {
+            "gte": "2017-05-01T13:00:00Z", "lt": datetime.date(2019, 1, 1)}})
+        self.assert_query(["c"], {"dataset.issued": {"gte": "2019-01-01"}})
+        self.assert_query(["a.1"], {"distribution.issued": {
+            "lte": "2017-12-31"}}, level="distribution")
+        self.assert_query(["a.2"], {"distribution.byteSize": {"gt": 100}},
+                          level="distribution")
+
+    def test_exists_and_boolean_operators(self):
+        self.assert_query(["c"], {"dataset.publisher": {"exists": False}})
+        self.assert_query(["a"], {"field.units": {"exists": True}})
+        self.assert_query(["a.1", "b.1"], {"or": [
+            {"distribution.format": "CSV"},
+            {"dataset.identifier": "b"}]}, level="distribution")
+        self.assert_query(["b", "c"], {"not": {"distribution.format": "CSV"}})
+        self.assert_query(["a.1.1"], {"field.type": "date", "or": [
+            {"distribution.format": "CSV"}, {"field.units": "Pesos"}]},
+            level="field")
+
+    def test_meta_field(self):
+        self.assertEqual(["CSV", "XLSX"], self.datajson.query(
+            {"dataset.identifier": "a"}, level="distribution",
+            meta_field="format"))
+
+    def test_invalid_queries(self):
+        for invalid in [{}, [], {"publisher.name": "INDEC"},
+                        {"identifier": "a"}, {"and": {}},
+                        {"dataset.identifier": {"in": "a"}},
+                        {"dataset.issued": {"gt": None}}]:
+            with self.assertRaises(InvalidQueryError):
+                compile_query(invalid)
+
+    def test_queries_are_compiled_once(self):
+        compiled = compile_query({"dataset.identifier": {"in": ["a"]}})
+        self.assertIs(compiled, compile_query(compiled))
+        self.assertIs(compiled.predicate("dataset"),
+                      compiled.predicate("dataset"))
+
+    def test_datajson_uses_indexes(self):
+        compiled = compile_query({"distribution.format": "XLSX",
+                                  "dataset.issued": {"lt": "2018-01-01"}})
+        predicate = mock.Mock(side_effect=compiled.predicate("distribution"))
+        with mock.patch.object(compiled, "predicate",
+                               return_value=predicate):
+            self.assertEqual(["a.2"], self.datajson.query(
+                compiled, level="distribution", meta_field="identifier"))
+        # sólo se evalúa la distribución con el formato buscado
+        self.assertEqual(1, predicate.call_count)
+
+
+class SearchFiltersParityTestCase(unittest.TestCase):
+
+    def test_filters_as_queries(self):
+        path = os.path.join(SAMPLES_DIR, "full_data.json")
+        with open(path) as f:
+            catalog = json.load(f)
+        datajson = DataJson(path)
+
+        levels = [("dataset", get_datasets),
+                  ("distribution", get_distributions),
+                  ("field", get_fields)]
+        for filter_in, filter_out in FILTERS:
+            for depth, (level, get) in enumerate(levels):
+                compiled = compile_query(filters_to_query(
+                    filter_in, filter_out, LEVELS[:depth + 1]))
+                expected = get(catalog, filter_in, filter_out)
+                self.assertEqual(expected, query(catalog, compiled, level))
+                self.assertEqual(expected, query(datajson, compiled, level))
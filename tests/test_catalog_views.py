@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de las vistas planas de distribuciones y fields."""
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import os
+import pickle
+import unittest
+
+from pydatajson.catalog_views import EntityView
+from pydatajson.core import DataJson
+from pydatajson.search import get_distributions, get_fields, iter_fields
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+
+class RecordingDict(dict):
+    """Diccionario que cuenta las escrituras."""
+
+    writes = 0
+
+    def __setitem__(self, key, value):
+        self.writes += 1
+        super(RecordingDict, self).__setitem__(key, value)
+
+
+class CatalogViewsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(SAMPLES_DIR, "full_data.json")
+        self.datajson = DataJson(self.path, cached_views=True)
+
+    def test_search_does_not_modify_catalog(self):
+        expected = copy.deepcopy(dict(self.datajson))
+        self.datajson.get_distributions(
+            {"distribution": {"byteSize": 5120}})
+        self.datajson.get_fields({"field": {"type": "string"}})
+        self.assertEqual(expected, dict(self.datajson))
+
+    def test_views_have_parent_pointers(self):
+        dataset = self.datajson["dataset"][0]
+        distribution = dataset["distribution"][0]
+        field = distribution["field"][0]
+
+        distribution_view = self.datajson.distributions[0]
+        self.assertIs(dataset, distribution_view.dataset)
+        self.assertIs(distribution, distribution_view.entity)
+        self.assertEqual(dataset["identifier"],
+                         distribution_view["dataset_identifier"])
+
+        field_view = self.datajson.fields[0]
+        self.assertIs(distribution, field_view.distribution)
+        self.assertIs(field, field_view.entity)
+        self.assertEqual(distribution["identifier"],
+                         field_view["distribution_identifier"])
+
+    def test_views_are_cached(self):
+        self.assertIs(self.datajson.distributions, self.datajson.distributions)
+        self.assertIs(self.datajson.fields, self.datajson.fields)
+        self.assertIs(self.datajson.time_series, self.datajson.time_series)
+
+        filter_in = {"field": {"type": "string"}}
+        self.assertIs(self.datajson.get_fields(filter_in)[0],
+                      self.datajson.get_fields(filter_in)[0])
+
+    def test_views_are_read_only(self):
+        distributions = self.datajson.distributions
+        with self.assertRaises(TypeError):
+            distributions[0]["title"] = "otro"
+        with self.assertRaises(TypeError):
+            distributions[0].pop("title")
+        with self.assertRaises(TypeError):
+            distributions.append({})
+
+        # las copias son diccionarios y listas comunes
+        for copied in (distributions[0].copy(),
+                       copy.deepcopy(distributions[0]),
+                       pickle.loads(pickle.dumps(distributions[0]))):
+            self.assertNotIsInstance(copied, EntityView)
+            self.assertEqual(distributions[0], copied)
+            copied["title"] = "otro"
+        self.assertIs(list, type(copy.copy(distributions)))
+
+    def test_mutations_discard_views(self):
+        distributions = self.datajson.distributions
+        identifier = distributions[0]["identifier"]
+
+        self.datajson.remove_distribution(identifier)
+        self.assertEqual(len(distributions) - 1,
+                         len(self.datajson.distributions))
+        self.assertNotIn(identifier, [distribution["identifier"] for
+                                      distribution in
+                                      self.datajson.distributions])
+
+        self.datajson.remove_dataset(self.datajson["dataset"][0]["identifier"])
+        self.assertEqual(get_fields(dict(self.datajson)),
+                         self.datajson.fields)
+
+        del self.datajson["dataset"][0]["distribution"][0]["identifier"]
+        self.datajson.generate_distribution_ids()
+        self.assertEqual(self.datajson["dataset"][0]["identifier"] + "_0",
+                         self.datajson.distributions[0]["identifier"])
+
+    def test_default_search_returns_catalog_entities(self):
+        datajson = DataJson(self.path)
+        distribution = datajson["dataset"][0]["distribution"][0]
+        field = distribution["field"][0]
+        self.assertIs(distribution, datajson.distributions[0])
+        self.assertIs(field, datajson.fields[0])
+        self.assertIs(distribution, datajson.get_distribution(
+            title=distribution["title"],
+            dataset_identifier=distribution["dataset_identifier"]))
+        self.assertEqual(distribution["identifier"],
+                         field["distribution_identifier"])
+
+        datajson.distributions[0]["title"] = "otro"
+        self.assertEqual("otro", distribution["title"])
+
+        # los ids de las entidades contenedoras se escriben una sola vez
+        recording = RecordingDict(field)
+        distribution["field"][0] = recording
+        for _ in range(3):
+            self.assertIs(recording, datajson.fields[0])
+            list(datajson.iter_fields(limit=1))
+        self.assertEqual(0, recording.writes)
+
+        del distribution["identifier"]
+        datajson.generate_distribution_ids()
+        self.assertEqual(datajson["dataset"][0]["identifier"] + "_0",
+                         datajson.distributions[0]["identifier"])
+
+    def test_dict_search_writes_parent_ids_once(self):
+        with open(self.path) as f:
+            catalog = json.load(f)
+        get_fields(catalog)
+        expected = copy.deepcopy(catalog)
+        for _ in range(3):
+            get_distributions(catalog)
+            get_fields(catalog)
+            list(iter_fields(catalog))
+        self.assertEqual(expected, catalog)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests_mock
+
+from pydatajson import http_cache
+from pydatajson.http_cache import HttpCache
+from pydatajson.readers import read_catalog
+
+
+class HttpCacheTestCase(unittest.TestCase):
+    URL = "http://test.com/data.json"
+    CATALOG = {"title": "catalogo", "dataset": []}
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = HttpCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    @requests_mock.Mocker()
+    def test_sends_conditional_headers_and_serves_304_from_disk(self, m):
+        content = json.dumps(self.CATALOG).encode("utf-8")
+        m.get(self.URL, content=content, headers={
+            "ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2020 00:00:00 GMT"})
+        self.assertEqual(content, self.cache.get(self.URL))
+
+        m.get(self.URL, status_code=304)
+        self.assertEqual(content, self.cache.get(self.URL))
+
+        headers = m.request_history[-1].headers
+        self.assertEqual('"v1"', headers["If-None-Match"])
+        self.assertEqual("Wed, 01 Jan 2020 00:00:00 GMT",
+                         headers["If-Modified-Since"])
+
+    @requests_mock.Mocker()
+    def test_304_without_cached_body_repeats_unconditional_get(self, m):
+        m.get(self.URL, content=b"v1", headers={"ETag": '"v1"'})
+        self.cache.get(self.URL)
+        os.remove(self.cache._path(self.cache._key(self.URL),
+                                   HttpCache.BODY_SUFFIX))
+
+        m.get(self.URL, [{"status_code": 304},
+                         {"content": b"v1", "headers": {"ETag": '"v1"'}}])
+        self.assertEqual(b"v1", self.cache.get(self.URL))
+        self.assertEqual('"v1"',
+                         m.request_history[-2].headers["If-None-Match"])
+        self.assertNotIn("If-None-Match", m.request_history[-1].headers)
+
+        # la entrada vuelve a guardarse con el cuerpo
+        m.get(self.URL, status_code=304)
+        self.assertEqual(b"v1", self.cache.get(self.URL))
+
+    @requests_mock.Mocker()
+    def test_changed_resource_replaces_cached_copy(self, m):
+        m.get(self.URL, content=b"v1", headers={"ETag": '"v1"'})
+        self.cache.get(self.URL)
+        m.get(self.URL, content=b"v2", headers={"ETag": '"v2"'})
+        self.assertEqual(b"v2", self.cache.get(self.URL))
+
+        m.get(self.URL, status_code=304)
+        self.assertEqual(b"v2", self.cache.get(self.URL))
+        self.assertEqual('"v2"',
+                         m.request_history[-1].headers["If-None-Match"])
+
+    @requests_mock.Mocker()
+    def test_responses_without_validators_are_not_stored(self, m):
+        m.get(self.URL, content=b"contenido")
+        self.cache.get(self.URL)
+        self.cache.get(self.URL)
+
+        self.assertNotIn("If-None-Match", m.request_history[-1].headers)
+        self.assertEqual(0, self.cache.size())
+
+    @requests_mock.Mocker()
+    def test_error_responses_are_not_stored(self, m):
+        m.get(self.URL, status_code=500, content=b"error",
+              headers={"ETag": '"v1"'})
+        self.cache.get(self.URL)
+        self.assertEqual(0, self.cache.size())
+
+    @requests_mock.Mocker()
+    def test_least_recently_used_entries_are_evicted(self, m):
+        cache = HttpCache(self.cache_dir, max_size=10)
+        for name in ["a", "b", "c"]:
+            m.get("http://test.com/" + name, content=b"12345",
+                  headers={"ETag": name})
+
+        cache.get("http://test.com/a")
+        cache.get("http://test.com/b")
+        cache.get("http://test.com/c")
+
+        self.assertEqual(10, cache.size())
+        stored_urls = [meta["url"] for _, meta, _ in cache._entries()]
+        self.assertNotIn("http://test.com/a", stored_urls)
+
+    @requests_mock.Mocker()
+    def test_read_catalog_uses_cache(self, m):
+        content = json.dumps(self.CATALOG).encode("utf-8")
+        m.get(self.URL, content=content, headers={"ETag": '"v1"'})
+        read_catalog(self.URL, http_cache=self.cache)
+
+        m.get(self.URL, status_code=304)
+        self.assertEqual(self.CATALOG,
+                         read_catalog(self.URL, http_cache=self.cache))
+
+    @requests_mock.Mocker()
+    def test_default_cache(self, m):
+        content = json.dumps(self.CATALOG).encode("utf-8")
+        m.get(self.URL, content=content, headers={"ETag": '"v1"'})
+
+        http_cache.set_default_cache(self.cache)
+        try:
+            read_catalog(self.URL)
+            m.get(self.URL, status_code=304)
+            self.assertEqual(self.CATALOG, read_catalog(self.URL))
+        finally:
+            http_cache.set_default_cache(None)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import unittest
+
+import nose
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pydatajson import json_backends
+from pydatajson.readers import read_json
+from pydatajson.writers import write_json
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+TEMP_DIR = os.path.join("tests", "temp")
+
+
+class JSONBackendsTestCase(unittest.TestCase):
+    SAMPLES = ["full_data.json", "catalogo_justicia.json",
+               "several_datasets_with_types.json"]
+
+    @classmethod
+    def get_sample(cls, sample_filename):
+        return os.path.join(SAMPLES_DIR, sample_filename)
+
+    def tearDown(self):
+        json_backends.set_default_backend(json_backends.AUTO)
+
+    def test_stdlib_backend_is_always_available(self):
+        self.assertIn("json", json_backends.available_backends())
+
+    def test_backends_read_the_same_as_stdlib(self):
+        for sample in self.SAMPLES:
+            path = self.get_sample(sample)
+            with io.open(path, encoding="utf-8") as f:
+                expected = json.load(f)
+
+            for backend in json_backends.available_backends():
+                self.assertEqual(expected, read_json(path,
+                                                     json_backend=backend))
+
+    def test_auto_backend_writes_the_same_as_stdlib(self):
+        path = os.path.join(TEMP_DIR, "json_backends.json")
+        for sample in self.SAMPLES:
+            catalog = read_json(self.get_sample(sample))
+            expected = json.dumps(catalog, indent=4, separators=(",", ": "),
+                                  ensure_ascii=False)
+
+            write_json(catalog, path)
+            with io.open(path, encoding="utf-8") as f:
+                self.assertEqual(expected, f.read())
+
+        os.remove(path)
+
+    def test_backends_write_equivalent_json(self):
+        catalog = read_json(self.get_sample("full_data.json"))
+        for backend in json_backends.available_backends():
+            dumped = json_backends.dumps(catalog, indent=4, backend=backend)
+            self.assertEqual(catalog, json.loads(dumped))
+
+    def test_failing_backend_falls_back_to_stdlib(self):
+        backend = mock.Mock()
+        backend.loads.side_effect = ValueError
+        backend.dumps.side_effect = TypeError
+
+        with mock.patch.object(json_backends, "get_backend",
+                               return_value=backend):
+            self.assertEqual({"a": 1}, json_backends.loads('{"a": 1}'))
+            self.assertEqual('{"a":1}', json_backends.dumps({"a": 1}))
+
+    @nose.tools.raises(ValueError)
+    def test_invalid_json_raises_stdlib_error(self):
+        json_backends.loads('{"a": ')
+
+    def test_default_backend_is_configurable(self):
+        json_backends.set_default_backend("json")
+        self.assertEqual("json", json_backends.get_default_backend())
+        self.assertIsInstance(json_backends.get_backend(),
+                              json_backends.JSONBackend)
+
+    @nose.tools.raises(ValueError)
+    def test_unknown_backend_raises(self):
+        json_backends.set_default_backend("simplejson")
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+"""Tests del motor de chequeo de links."""
+
+from __future__ import unicode_literals
+
+import os
+import threading
+import time
+import unittest
+from collections import Counter
+
+import requests_mock
+from requests import ConnectionError
+
+from pydatajson.core import DataJson
+from pydatajson.indicators import generate_catalogs_indicators
+from pydatajson.link_checker import LinkChecker, UrlCheckPlanner, \
+    HostHealth, UNCHECKED_RESULT
+from pydatajson.reporting import generate_datasets_summary
+from pydatajson.threading_helper import WorkerPool
+from pydatajson.validation import Validator
+from pydatajson.validators.distribution_download_urls_validator \
+    import DistributionDownloadUrlsValidator
+from pydatajson.validators.distribution_urls_validator \
+    import DistributionUrlsValidator
+from pydatajson.validators.landing_pages_validator \
+    import LandingPagesValidator
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+TEST_URL = "http://www.test.com/recurso.csv"
+
+
+class LinkCheckerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.checker = LinkChecker(timeout=2)
+
+    @requests_mock.Mocker()
+    def test_head_is_used_when_accepted(self, req_mock):
+        req_mock.head(TEST_URL, status_code=200)
+        self.assertEqual((True, 200), self.checker.check(TEST_URL))
+        self.assertEqual(["HEAD"],
+                         [r.method for r in req_mock.request_history])
+
+    @requests_mock.Mocker()
+    def test_rejected_head_falls_back_to_ranged_get(self, req_mock):
+        req_mock.head(TEST_URL, status_code=405)
+        req_mock.get(TEST_URL, status_code=206)
+        self.assertEqual((True, 206), self.checker.check(TEST_URL))
+        self.assertEqual("bytes=0-0",
+                         req_mock.request_history[1].headers["Range"])
+
+    @requests_mock.Mocker()
+    def test_empty_resources_are_working(self, req_mock):
+        req_mock.head(TEST_URL, status_code=405)
+        req_mock.get(TEST_URL, status_code=416)
+        self.assertEqual((True, 200), self.checker.check(TEST_URL))
+
+    @requests_mock.Mocker()
+    def test_failed_fallback_keeps_head_status(self, req_mock):
+        req_mock.head(TEST_URL, status_code=403)
+        req_mock.get(TEST_URL, exc=ConnectionError)
+        self.assertEqual((False, 403), self.checker.check(TEST_URL))
+
+    @requests_mock.Mocker()
+    def test_results_keep_the_order_of_the_urls(self, req_mock):
+        urls = ["http://host{}.com/{}".format(i % 3, i) for i in range(30)]
+        for i, url in enumerate(urls):
+            req_mock.head(url, status_code=404 if i % 4 == 0 else 200)
+
+        checker = LinkChecker(max_workers=5)
+        expected = [(i % 4 != 0, 404 if i % 4 == 0 else 200)
+                    for i in range(30)]
+        self.assertEqual(expected, checker.check_urls(urls))
+
+    def test_concurrency_is_bounded_globally_and_per_host(self):
+        running = Counter()
+        peaks = Counter()
+        lock = threading.Lock()
+
+        def check(url):
+            host = url.split("/")[2]
+            with lock:
+                running[host] += 1
+                running["total"] += 1
+                peaks[host] = max(peaks[host], running[host])
+                peaks["total"] = max(peaks["total"], running["total"])
+            time.sleep(0.01)
+            with lock:
+                running[host] -= 1
+                running["total"] -= 1
+            return True, 200
+
+        urls = ["http://lento.com/{}".format(i) for i in range(20)] + \
+               ["http://rapido{}.com/".format(i) for i in range(10)]
+        checker = LinkChecker(max_workers=6, max_per_host=2)
+        checker.check_urls(urls, check)
+
+        self.assertLessEqual(peaks["total"], 6)
+        self.assertLessEqual(peaks["lento.com"], 2)
+        self.assertGreater(peaks["total"], 2)
+
+    def test_hosts_are_interleaved(self):
+        urls = ["http://a.com/1", "http://a.com/2", "http://a.com/3",
+                "http://b.com/1", "http://c.com/1", "http://b.com/2"]
+        self.assertEqual([0, 3, 4, 1, 5, 2],
+                         LinkChecker._interleave_hosts(urls))
+
+    def test_urls_after_the_deadline_are_not_checked(self):
+        def check(url):
+            time.sleep(0.05)
+            return False, 404
+
+        checker = LinkChecker(max_workers=1, deadline=0.12)
+        results = checker.check_urls(
+            ["http://host.com/{}".format(i) for i in range(10)], check)
+
+        self.assertIn(UNCHECKED_RESULT, results)
+        self.assertEqual((False, 404), results[0])
+        self.assertEqual(results.count(UNCHECKED_RESULT), checker.unchecked)
+
+    def test_concurrent_calls_keep_their_own_deadline(self):
+        checker = LinkChecker(max_workers=1, deadline=0.3)
+        timeouts = []
+        slow_started = threading.Event()
+
+        def slow_check(url):
+            slow_started.set()
+            time.sleep(0.2)
+            timeouts.append(checker._timeout(url))
+            return True, 200
+
+        # una llamada que empieza y termina mientras la otra sigue en curso
+        thread = threading.Thread(target=checker.check_urls,
+                                  args=(["http://a.com/1"], slow_check))
+        thread.start()
+        slow_started.wait()
+        checker.check_urls(["http://b.com/1"], lambda url: (True, 200))
+        thread.join()
+
+        # el tiempo límite de la primera llamada sigue vigente en su check
+        self.assertEqual(1, len(timeouts))
+        self.assertLess(timeouts[0], 0.2)
+        self.assertIsNone(getattr(checker._local, "deadline_at", None))
+
+    def test_repeated_urls_are_checked_once(self):
+        checked = []
+
+        def check(url):
+            checked.append(url)
+            return url.endswith("ok"), 200
+
+        urls = ["http://a.com/ok", "http://b.com/error", "http://a.com/ok",
+                "http://a.com/ok", "http://b.com/error"]
+        checker = LinkChecker(max_workers=2)
+        results = checker.check_urls(urls, check)
+
+        self.assertEqual([url.endswith("ok") for url in urls],
+                         [valid for valid, _ in results])
+        self.assertEqual(sorted(set(urls)), sorted(checked))
+        self.assertEqual(3, checker.requests_saved)
+
+    def test_checks_run_in_the_shared_pool(self):
+        threads = set()
+
+        def check(url):
+            threads.add(threading.current_thread().ident)
+            return True, 200
+
+        with WorkerPool(4) as pool:
+            checker = LinkChecker(max_workers=4, pool=pool)
+            for i in range(3):
+                results = checker.check_urls(
+                    ["http://host{}.com/{}".format(j % 3, j + i * 10)
+                     for j in range(10)], check)
+                self.assertEqual([(True, 200)] * 10, results)
+        self.assertLessEqual(len(threads), 4)
+        self.assertNotIn(threading.current_thread().ident, threads)
+
+
+class HostHealthTestCase(unittest.TestCase):
+
+    def test_dead_host_is_skipped_after_consecutive_failures(self):
+        checked = Counter()
+
+        def check(url):
+            host = url.split("/")[2]
+            checked[host] += 1
+            return (True, 200) if host == "vivo.com" else (False, None)
+
+        urls = ["http://{}/{}".format(host, i) for i in range(20)
+                for host in ("muerto.com", "vivo.com")]
+        checker = LinkChecker(max_host_failures=5)
+        results = checker.check_urls(urls, check)
+
+        self.assertEqual(5, checked["muerto.com"])
+        self.assertEqual(20, checked["vivo.com"])
+        self.assertEqual([(False, None), (True, 200)] * 20, results)
+        hosts = dict((host["host"], host) for host in checker.hosts_report())
+        self.assertEqual("SKIPPED", hosts["muerto.com"]["status"])
+        self.assertEqual(15, hosts["muerto.com"]["skipped"])
+        self.assertEqual("OK", hosts["vivo.com"]["status"])
+
+    def test_responses_reset_consecutive_failures(self):
+        health = HostHealth("host.com")
+        for _ in range(3):
+            for _ in range(4):
+                health.record((False, None), 0.1)
+            health.record((False, 404), 0.1)
+        self.assertFalse(health.is_open)
+        self.assertEqual(12, health.failures)
+
+    def test_timeouts_below_the_maximum_do_not_open_the_host(self):
+        health = HostHealth("host.com")
+        for _ in range(10):
+            health.record((False, 408), 1, at_max_timeout=False)
+        self.assertFalse(health.is_open)
+        for _ in range(5):
+            health.record((False, 408), 4, at_max_timeout=True)
+        self.assertTrue(health.is_open)
+
+    def test_open_host_is_probed_after_retry_delay(self):
+        health = HostHealth("host.com")
+        for _ in range(5):
+            health.record((False, None), 0.1)
+        self.assertTrue(health.should_skip(retry_after=60))
+        self.assertTrue(health.should_skip(retry_after=None))
+
+        # pasado el tiempo de espera pasa una sola URL de prueba
+        health.opened_at -= 61
+        self.assertFalse(health.should_skip(retry_after=60))
+        self.assertTrue(health.should_skip(retry_after=60))
+        health.record((False, None), 0.1)
+        self.assertTrue(health.should_skip(retry_after=60))
+
+        # si la prueba responde, el host vuelve a chequearse
+        health.opened_at -= 61
+        self.assertFalse(health.should_skip(retry_after=60))
+        health.record((True, 200), 0.1)
+        self.assertFalse(health.is_open)
+        self.assertFalse(health.should_skip(retry_after=60))
+
+    def test_recovered_host_is_checked_again(self):
+        down = [True]
+
+        def check(url):
+            return (False, None) if down[0] else (True, 200)
+
+        urls = ["http://host.com/{}".format(i) for i in range(10)]
+        checker = LinkChecker(max_host_failures=2, host_retry_after=0)
+        self.assertEqual([(False, None)] * 10,
+                         checker.check_urls(urls, check))
+        down[0] = False
+        self.assertEqual([(True, 200)] * 10, checker.check_urls(urls, check))
+        self.assertEqual("OK", checker.hosts_report()[0]["status"])
+
+    def test_timeout_adapts_to_observed_latency(self):
+        checker = LinkChecker(timeout=1)
+        fast, slow = HostHealth("rapido.com"), HostHealth("lento.com")
+        for _ in range(10):
+            fast.record((True, 200), 0.01)
+            slow.record((False, 408), 1, at_max_timeout=False)
+
+        self.assertEqual(1, checker._host_timeout(health=HostHealth("x")))
+        self.assertEqual(1, checker._host_timeout(health=fast))
+        self.assertEqual(4, checker._host_timeout(health=slow))
+        self.assertEqual(1, LinkChecker(timeout=1, adaptive_timeout=False)
+                         ._host_timeout(health=slow))
+
+
+class LinkCheckerValidatorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = DataJson(os.path.join(SAMPLES_DIR, "full_data.json"))
+
+    @requests_mock.Mocker()
+    def test_validators_use_the_given_link_checker(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=200)
+        checker = LinkChecker(max_workers=4)
+        validator = DistributionUrlsValidator(self.catalog, True, 1, 1,
+                                              link_checker=checker)
+        with mock.patch.object(checker, "check_urls",
+                               wraps=checker.check_urls) as check_urls:
+            self.assertEqual([], list(validator.validate()))
+        self.assertEqual(1, check_urls.call_count)
+
+    @requests_mock.Mocker()
+    def test_datajson_passes_its_link_checker(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=404)
+        checker = LinkChecker(max_workers=4)
+        datajson = DataJson(os.path.join(SAMPLES_DIR, "full_data.json"),
+                            link_checker=checker)
+        with mock.patch.object(checker, "check_urls",
+                               wraps=checker.check_urls) as check_urls:
+            self.assertFalse(datajson.is_valid_catalog(broken_links=True))
+        self.assertTrue(check_urls.called)
+
+    @requests_mock.Mocker()
+    def test_validation_reports_hosts_health(self, req_mock):
+        req_mock.head(requests_mock.ANY, exc=ConnectionError)
+        checker = LinkChecker(max_host_failures=1)
+        response = Validator().validate_catalog(
+            self.catalog, broken_links=True, link_checker=checker)
+
+        self.assertEqual(checker.hosts_report(), response["hosts"])
+        self.assertIn("SKIPPED", [host["status"]
+                                  for host in response["hosts"]])
+        self.assertNotIn("hosts", Validator().validate_catalog(self.catalog))
+
+
+class UrlCheckPlannerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = DataJson(os.path.join(SAMPLES_DIR, "full_data.json"))
+        self.checked = Counter()
+
+    def check(self, url):
+        self.checked[url] += 1
+        return False, 404
+
+    def validators(self, catalog, checker):
+        return [cls(catalog, True, 1, 1, link_checker=checker)
+                for cls in (LandingPagesValidator, DistributionUrlsValidator,
+                            DistributionDownloadUrlsValidator)]
+
+    def test_results_are_fanned_out_to_each_validator(self):
+        checker = LinkChecker()
+        with mock.patch.object(checker, "check", self.check):
+            expected = [validator.validate() for validator
+                        in self.validators(self.catalog, checker)]
+            expected = [list(expected[0]), list(expected[1]), expected[2]]
+
+        self.checked.clear()
+        planner = UrlCheckPlanner(checker, self.check)
+        for validator in self.validators(self.catalog, checker):
+            planner.add(validator)
+        landing_pages, distribution_urls, download_urls_ok = planner.run()
+
+        self.assertEqual(
+            [[e.message for e in expected[0]],
+             [e.message for e in expected[1]], expected[2]],
+            [[e.message for e in landing_pages],
+             [e.message for e in distribution_urls], download_urls_ok])
+        self.assertEqual(set([1]), set(self.checked.values()))
+        self.assertEqual(planner.urls_count - len(self.checked),
+                         planner.requests_saved)
+
+    def test_urls_are_checked_once_across_catalogs(self):
+        planner = UrlCheckPlanner(LinkChecker(), self.check)
+        for catalog in (self.catalog, DataJson(self.catalog)):
+            for validator in self.validators(catalog, planner.link_checker):
+                planner.add(validator)
+        planner.run()
+
+        self.assertEqual(set([1]), set(self.checked.values()))
+        self.assertGreater(planner.requests_saved, len(self.checked))
+
+    @requests_mock.Mocker()
+    def test_catalogs_indicators_check_each_url_once(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=200)
+        with mock.patch(
+                "pydatajson.status_indicators_generator"
+                ".generate_datasets_summary",
+                wraps=generate_datasets_summary) as summary:
+            indicators, network = generate_catalogs_indicators(
+                [self.catalog, DataJson(self.catalog)], broken_links=True)
+        # cada catálogo se resume (y valida) una sola vez
+        self.assertEqual(2, summary.call_count)
+
+        urls = [r.url for r in req_mock.request_history]
+        self.assertEqual(len(set(urls)), len(urls))
+        for catalog_indicators in indicators:
+            self.assertEqual(
+                catalog_indicators['distribuciones_cant'],
+                catalog_indicators['distribuciones_download_url_ok_cant'])
+        self.assertEqual(1.0, network['distribuciones_download_url_ok_pct'])
@@ -5,11 +5,13 @@
 
 from __future__ import print_function, unicode_literals, with_statement
 
+import json
 import os.path
 import unittest
 from tempfile import NamedTemporaryFile
 
 import nose
+import requests_mock
 import vcr
 
 from tests.support.factories.xlsx import CSV_TABLE, WRITE_XLSX_TABLE
@@ -23,7 +25,9 @@ import filecmp
 from tests.context import pydatajson
 from pydatajson.core import DataJson
 from pydatajson.helpers import ensure_dir_exists
-from pydatajson.custom_exceptions import NonParseableCatalog
+from pydatajson.custom_exceptions import NonParseableCatalog, \
+    DatasetUnexpectedTitle
+from pydatajson.validation_cache import ValidationCache
 from tests import xl_methods
 import openpyxl as pyxl
 
@@ -227,8 +231,13 @@ revíselo manualmente""".format(temp_filename)
         path = os.path.join(self.TEMP_DIR, "test.json")
 
         pydatajson.writers.write_json_catalog(obj, path)
+        pydatajson.writers.write_json.assert_called_once_with(
+            obj, path, json_backend=None)
 
-        pydatajson.writers.write_json.assert_called_once_with(obj, path)
+        mock_write_json.reset_mock()
+        pydatajson.writers.write_json_catalog(obj, path, json_backend="json")
+        pydatajson.writers.write_json.assert_called_once_with(
+            obj, path, json_backend="json")
 
     def test_read_write_both_formats_yields_the_same(self):
         for suffix in ['xlsx', 'json']:
@@ -282,6 +291,55 @@ revíselo manualmente""".format(temp_filename)
             self.get_sample('catalogo_justicia_no_xlsx_suffix'))
         self.assertDictEqual(original, suffixless)
 
+    @requests_mock.Mocker()
+    def test_read_remote_suffixless_catalog_fetches_once(self, req_mock):
+        for sample in ['full_data.json', 'catalogo_justicia.xlsx']:
+            with open(self.get_sample(sample), 'rb') as catalog_file:
+                req_mock.get('http://test.com/catalog',
+                             content=catalog_file.read())
+            expected = pydatajson.readers.read_catalog(
+                self.get_sample(sample))
+
+            with mock.patch('pydatajson.readers.read_ckan_catalog') as ckan:
+                catalog = pydatajson.readers.read_catalog(
+                    'http://test.com/catalog')
+                ckan.assert_not_called()
+
+            self.assertDictEqual(expected, catalog)
+            self.assertEqual(1, req_mock.call_count)
+            req_mock.reset_mock()
+
+    def test_sniff_catalog_format(self):
+        sniff = pydatajson.readers.sniff_catalog_format
+        self.assertEqual('xlsx', sniff(b'PK\x03\x04\x14\x00'))
+        self.assertEqual('json', sniff(b'\xef\xbb\xbf \n{"title": "a"}'))
+        self.assertEqual('json', sniff(b'[]'))
+        self.assertEqual('json', sniff(b'', 'application/json'))
+        self.assertEqual('xlsx', sniff(
+            b'', 'application/vnd.openxmlformats-officedocument'
+                 '.spreadsheetml.sheet'))
+        self.assertIsNone(sniff(b'<html></html>', 'text/html'))
+
+    @requests_mock.Mocker()
+    def test_unknown_suffixless_content_falls_back_to_ckan(self, req_mock):
+        req_mock.get('http://test.com/', text='<html></html>',
+                     headers={'Content-Type': 'text/html'})
+        with mock.patch('pydatajson.readers.read_ckan_catalog',
+                        return_value='test_catalog'):
+            catalog = pydatajson.readers.read_catalog('http://test.com/')
+        self.assertEqual('test_catalog', catalog)
+
+    def test_auto_format_ignores_suffix(self):
+        original = pydatajson.readers.read_catalog(
+            self.get_sample('catalogo_justicia.xlsx'))
+        with NamedTemporaryFile(suffix='.json') as tempfile:
+            with open(self.get_sample('catalogo_justicia.xlsx'), 'rb') as f:
+                tempfile.write(f.read())
+            tempfile.flush()
+            catalog = pydatajson.readers.read_catalog(tempfile.name,
+                                                      catalog_format='auto')
+        self.assertDictEqual(original, catalog)
+
     @mock.patch('pydatajson.readers.read_json', return_value='test_catalog')
     def test_force_json_format(self, mock_reader):
         catalog = pydatajson.readers.read_catalog('full_data.xlsx',
@@ -325,12 +383,189 @@ revíselo manualmente""".format(temp_filename)
         self.assertTrue('theme' not in written_dataset)
         self.assertTrue('field' not in written_distribution)
 
+    def test_iter_datasets_yields_the_same_as_read_catalog(self):
+        catalog_path = self.get_sample('full_data.json')
+        expected_datasets = pydatajson.readers.read_catalog(
+            catalog_path)['dataset']
+
+        with mock.patch('pydatajson.readers.STREAM_CHUNK_SIZE', 7):
+            datasets = list(pydatajson.readers.iter_datasets(catalog_path))
+
+        self.assertListEqual(expected_datasets, datasets)
+
+    @requests_mock.Mocker()
+    def test_iter_remote_datasets(self, req_mock):
+        catalog_path = self.get_sample('full_data.json')
+        with open(catalog_path, 'rb') as catalog_file:
+            req_mock.get('http://test.com/data.json',
+                         content=catalog_file.read())
+        expected_datasets = pydatajson.readers.read_catalog(
+            catalog_path)['dataset']
+
+        with mock.patch('pydatajson.readers.STREAM_CHUNK_SIZE', 5):
+            datasets = list(pydatajson.readers.iter_datasets(
+                'http://test.com/data.json'))
+
+        self.assertListEqual(expected_datasets, datasets)
+
+    def test_read_catalog_metadata_excludes_datasets(self):
+        catalog_path = self.get_sample('full_data.json')
+        expected_metadata = pydatajson.readers.read_catalog(catalog_path)
+        expected_metadata.pop('dataset')
+
+        metadata = pydatajson.readers.read_catalog_metadata(catalog_path)
+
+        self.assertDictEqual(expected_metadata, metadata)
+
+    @nose.tools.raises(ValueError)
+    def test_iter_datasets_of_malformed_json_raises(self):
+        with NamedTemporaryFile(suffix='.json') as tempfile:
+            tempfile.write(b'{"title": "catalogo", "dataset": [{"a": 1},')
+            tempfile.flush()
+            list(pydatajson.readers.iter_datasets(tempfile.name))
+
+    def test_lazy_datajson_streams_datasets(self):
+        catalog_path = self.get_sample('full_data.json')
+        eager = DataJson(catalog_path)
+        lazy = DataJson(catalog_path, lazy=True)
+
+        self.assertNotIn('dataset', lazy)
+        self.assertEqual(eager['title'], lazy['title'])
+        self.assertListEqual(eager.get_datasets(), lazy.get_datasets())
+        self.assertListEqual(list(eager.iter_datasets()),
+                             list(lazy.iter_datasets()))
+        self.assertListEqual(eager.get_distributions(),
+                             lazy.get_distributions())
+        identifier = '99db6631-d1c9-470b-a73e-c62daa32c777'
+        self.assertEqual(eager.get_dataset(identifier),
+                         lazy.get_dataset(identifier))
+
+    @mock.patch('pydatajson.validation.LAZY_CHUNK_SIZE', 2)
+    def test_lazy_datajson_is_validated_like_eager(self):
+        for sample in ['full_data.json', 'several_datasets.json',
+                       'too_long_field_title.json']:
+            catalog_path = self.get_sample(sample)
+            eager = DataJson(catalog_path)
+            lazy = DataJson(catalog_path, lazy=True)
+
+            self.assertEqual(eager.is_valid_catalog(),
+                             lazy.is_valid_catalog())
+            self.assertDictEqual(eager.validate_catalog(),
+                                 lazy.validate_catalog())
+            eager_errors = eager.get_validation_errors()
+            lazy_errors = lazy.get_validation_errors()
+            self.assertEqual(eager_errors.datasets_count,
+                             lazy_errors.datasets_count)
+            self.assertListEqual(eager_errors.invalid_datasets(),
+                                 lazy_errors.invalid_datasets())
+            self.assertNotIn('dataset', lazy)
+
+    def test_lazy_datajson_reports_repeated_datasets(self):
+        catalog = pydatajson.readers.read_catalog(
+            self.get_sample('full_data.json'))
+        catalog['dataset'].append(catalog['dataset'][0])
+        with NamedTemporaryFile(suffix='.json', mode='w') as tempfile:
+            json.dump(catalog, tempfile)
+            tempfile.flush()
+            lazy = DataJson(tempfile.name, lazy=True)
+
+            self.assertFalse(lazy.is_valid_catalog())
+            errors = lazy.validate_catalog()['error']['catalog']['errors']
+            self.assertEqual(['uniqueItems'],
+                             [error['validator'] for error in errors])
+
+    def test_lazy_datajson_uses_validation_cache(self):
+        catalog_path = self.get_sample('too_long_field_title.json')
+        cache = ValidationCache()
+        lazy = DataJson(catalog_path, lazy=True, validation_cache=cache)
+
+        expected = DataJson(catalog_path).validate_catalog()
+        self.assertDictEqual(expected, lazy.validate_catalog())
+        self.assertEqual(1, len(cache))
+        self.assertDictEqual(expected, lazy.validate_catalog())
+
+    def test_lazy_datajson_generates_indicators_like_eager(self):
+        central_catalog = self.get_sample('full_data.json')
+        for sample in ['full_data.json', 'several_datasets.json']:
+            catalog_path = self.get_sample(sample)
+            eager = DataJson(catalog_path)
+            lazy = DataJson(catalog_path, lazy=True)
+
+            self.assertDictEqual(eager.generate_indicators(),
+                                 lazy.generate_indicators())
+            self.assertEqual(
+                eager.generate_catalogs_indicators(
+                    central_catalog=central_catalog),
+                lazy.generate_catalogs_indicators(
+                    central_catalog=central_catalog))
+            self.assertNotIn('dataset', lazy)
+
+    def test_lazy_is_ignored_for_xlsx_catalogs(self):
+        catalog = DataJson(self.get_sample('catalogo_justicia.xlsx'),
+                           lazy=True)
+        self.assertFalse(catalog.lazy)
+        self.assertIn('dataset', catalog)
+
     @nose.tools.raises(NonParseableCatalog)
     def test_missing_mandatory_field_on_xlsx_catalog_raises(self):
         sample = self.get_sample(
             'catalogo-justicia-missing-distribution-identifier.xlsx')
         pydatajson.readers.read_catalog(sample)
 
+    def test_read_catalogs_keeps_order_and_reports_errors(self):
+        a_dict = {"title": "catalogo", "dataset": []}
+        catalogs = [self.get_sample("full_data.json"),
+                    self.get_sample("inexistente.json"),
+                    a_dict]
+
+        results = pydatajson.readers.read_catalogs(catalogs, max_workers=3)
+
+        self.assertEqual(3, len(results))
+        self.assertEqual(
+            (pydatajson.readers.read_catalog(catalogs[0]), None), results[0])
+        self.assertIsNone(results[1][0])
+        self.assertIsInstance(results[1][1], NonParseableCatalog)
+        self.assertEqual((a_dict, None), results[2])
+
+    def test_read_catalogs_parses_xlsx_in_processes(self):
+        catalogs = [self.get_sample("catalogo_justicia.xlsx"),
+                    self.get_sample(
+                        "catalogo-justicia-missing-distribution-identifier"
+                        ".xlsx")]
+
+        results = pydatajson.readers.read_catalogs(catalogs,
+                                                   xlsx_processes=2)
+
+        self.assertEqual(
+            (pydatajson.readers.read_catalog(catalogs[0]), None), results[0])
+        self.assertIsInstance(results[1][1], NonParseableCatalog)
+
+    def test_xlsx_dataset_lookup_warns_duplicates_and_wrong_titles(self):
+        catalog = {"catalog_dataset": [
+            {"dataset_identifier": "1", "dataset_title": "Uno"},
+            {"dataset_identifier": "2", "dataset_title": "Dos"},
+            {"dataset_identifier": "2", "dataset_title": "Dos"},
+            {"dataset_identifier": "3", "dataset_title": "Tres"},
+        ]}
+        index = pydatajson.readers._index_by_identifier(
+            catalog["catalog_dataset"], "dataset_identifier")
+        logger = mock.Mock()
+
+        self.assertEqual(0, pydatajson.readers._get_dataset_index(
+            catalog, "1", "Uno", logger, index))
+        logger.warning.assert_not_called()
+
+        self.assertIsNone(pydatajson.readers._get_dataset_index(
+            catalog, "2", "Dos", logger, index))
+        self.assertIn("Hay mas de un dataset",
+                      logger.warning.call_args[0][0])
+
+        self.assertIsNone(pydatajson.readers._get_dataset_index(
+            catalog, "3", "Otro", logger, index))
+        warnings = [call[0][0] for call in logger.warning.call_args_list]
+        self.assertIsInstance(warnings[-2], DatasetUnexpectedTitle)
+        self.assertIn("No hay ningun dataset", warnings[-1])
+
 
 if __name__ == '__main__':
     nose.run(defaultTest=__name__)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de paridad entre el validador generado por schema_compiler y
+jsonschema."""
+
+from __future__ import unicode_literals
+
+import copy
+import glob
+import json
+import os
+import random
+import unittest
+
+import jsonschema
+import nose
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pydatajson import schema_compiler, validation
+from pydatajson.core import DataJson
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+# valores con los que se reemplazan campos de los catálogos para generar
+# errores de todos los tipos que chequea el schema
+MUTATIONS = [None, "", "x", 1, 1.5, True, False, [], [""], ["a b"], {},
+             "2016-13-45", "no es una uri", "R/P1Y", "AGRI", "a" * 200,
+             ["AGRI"], "mail@test.com", -1, [{"a": 1}, {"a": True}]]
+
+
+def error_signature(error):
+    return (error.validator, error.message, repr(error.validator_value),
+            list(error.path), list(error.schema_path), repr(error.instance),
+            [error_signature(e) for e in error.context])
+
+
+def iter_nodes(obj, path=()):
+    yield path, obj
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            for node in iter_nodes(value, path + (key,)):
+                yield node
+    elif isinstance(obj, list):
+        for index, value in enumerate(obj):
+            for node in iter_nodes(value, path + (index,)):
+                yield node
+
+
+def mutate(catalog, rand, mutations_count):
+    """Reemplaza, borra o duplica elementos al azar de un catálogo."""
+    for _ in range(mutations_count):
+        path = rand.choice(list(iter_nodes(catalog)))[0]
+        if not path:
+            continue
+        parent = catalog
+        for key in path[:-1]:
+            parent = parent[key]
+
+        action = rand.random()
+        if action < 0.3 and isinstance(parent, dict):
+            del parent[path[-1]]
+        elif action < 0.4 and isinstance(parent, list):
+            parent.append(copy.deepcopy(parent[path[-1]]))
+        else:
+            parent[path[-1]] = copy.deepcopy(rand.choice(MUTATIONS))
+    return catalog
+
+
+def load_samples():
+    catalogs = []
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.json"))):
+        with open(path) as sample:
+            try:
+                catalogs.append(json.load(sample))
+            except ValueError:
+                continue
+    return catalogs
+
+
+class SchemaCompilerParityTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        validation.clear_validators_cache()
+        cls.reference = validation.get_jsonschema_validator()
+        cls.compiled = validation.get_compiled_validator()
+        cls.samples = load_samples()
+
+    def assert_same_errors(self, instance):
+        expected = [error_signature(e)
+                    for e in self.reference.iter_errors(instance)]
+        errors = [error_signature(e)
+                  for e in self.compiled.iter_errors(instance)]
+        self.assertEqual(expected, errors)
+        self.assertEqual(self.reference.is_valid(instance),
+                         self.compiled.is_valid(instance))
+        return len(errors)
+
+    def test_samples_have_the_same_errors(self):
+        errors_count = sum(self.assert_same_errors(catalog)
+                           for catalog in self.samples)
+        self.assertGreater(errors_count, 0)
+
+    def test_mutated_catalogs_have_the_same_errors(self):
+        rand = random.Random(20181017)
+        catalogs = [c for c in self.samples if isinstance(c, dict) and
+                    isinstance(c.get("dataset"), list)]
+        errors_count = 0
+        for _ in range(300):
+            catalog = copy.deepcopy(rand.choice(catalogs))
+            errors_count += self.assert_same_errors(
+                mutate(catalog, rand, rand.randint(1, 6)))
+        self.assertGreater(errors_count, 300)
+
+    def test_non_catalog_instances_have_the_same_errors(self):
+        for instance in MUTATIONS:
+            self.assert_same_errors(instance)
+
+    def test_duplicated_datasets_are_detected(self):
+        catalog = {"dataset": [{"title": "a", "keyword": [True]},
+                               {"title": "a", "keyword": [1]}]}
+        self.assert_same_errors(catalog)
+        self.assertIn("uniqueItems", [e.validator for e in
+                                      self.compiled.iter_errors(catalog)])
+
+    def test_uniq_is_the_same_as_jsonschema(self):
+        rand = random.Random(7)
+        values = [1, 1.0, True, False, 0, None, "a", [1], [True], {"a": 1},
+                  {"a": True}, {"a": [1, {"b": None}]}, {"a": [1.0]}]
+        for _ in range(500):
+            container = [rand.choice(values)
+                         for _ in range(rand.randint(0, 4))]
+            self.assertEqual(jsonschema._utils.uniq(container),
+                             schema_compiler.uniq(container))
+
+    def test_validation_responses_are_the_same(self):
+        rand = random.Random(1)
+        for catalog in self.samples[:20]:
+            if not isinstance(catalog, dict):
+                continue
+            catalog = mutate(copy.deepcopy(catalog), rand, 3)
+            if not isinstance(catalog.get("dataset", []), list):
+                continue
+            self.assertEqual(
+                validation.Validator().validate_catalog(catalog),
+                validation.Validator(engine="compiled").validate_catalog(
+                    catalog))
+
+
+class SchemaCompilerTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        validation.set_default_engine(validation.JSONSCHEMA_ENGINE)
+
+    @nose.tools.raises(schema_compiler.SchemaCompilationError)
+    def test_unsupported_keywords_are_rejected(self):
+        schema_compiler.compile_validator(jsonschema.Draft4Validator(
+            {"type": "object", "additionalProperties": False}))
+
+    def test_recursive_references_are_compiled(self):
+        schema = {"type": "object",
+                  "properties": {"child": {"$ref": "#"}}}
+        compiled = schema_compiler.compile_validator(
+            jsonschema.Draft4Validator(schema))
+
+        self.assertTrue(compiled.is_valid({"child": {"child": {}}}))
+        errors = list(compiled.iter_errors({"child": {"child": 1}}))
+        self.assertEqual(["child", "child"], list(errors[0].path))
+
+    def test_unsupported_schemas_fall_back_to_jsonschema(self):
+        with mock.patch.object(
+                schema_compiler, "compile_validator",
+                side_effect=schema_compiler.SchemaCompilationError):
+            validation.clear_validators_cache()
+            validator = validation.Validator(engine="compiled")
+        self.assertIsInstance(validator.jsonschema_validator,
+                              jsonschema.Draft4Validator)
+
+    def test_default_engine_is_used_by_datajson(self):
+        validation.set_default_engine("compiled")
+        self.assertIsInstance(DataJson().validator.jsonschema_validator,
+                              schema_compiler.CompiledValidator)
+
+        datajson = DataJson(validation_engine="jsonschema")
+        self.assertIsInstance(datajson.validator.jsonschema_validator,
+                              jsonschema.Draft4Validator)
+
+    @nose.tools.raises(ValueError)
+    def test_unknown_engine_raises(self):
+        validation.set_default_engine("fastjsonschema")
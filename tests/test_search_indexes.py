@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de los índices secundarios de las búsquedas filtradas."""
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import os
+import unittest
+
+from pydatajson.core import DataJson
+from pydatajson.search import get_datasets, get_distributions, get_fields
+from pydatajson.search_indexes import SearchIndexes
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+FILTERS = [
+    ({"dataset": {"publisher": {
+        "mbox": "datosabiertos@jefatura.gob.ar",
+        "name": "Ministerio de Modernización. Secretaría de Modernización "
+                "Administrativa. Oficina Nacional de Contrataciones"}}}, None),
+    ({"dataset": {"accrualPeriodicity": "R/P1Y"}}, None),
+    ({"distribution": {"byteSize": 5120}}, None),
+    ({"distribution": {"dataset_identifier":
+                       "99db6631-d1c9-470b-a73e-c62daa32c777"}}, None),
+    ({"field": {"title": "procedimiento_id"}}, None),
+    ({"field": {"type": "string"}},
+     {"distribution": {"identifier": "1.1"}}),
+    (None, {"dataset": {"accrualPeriodicity": "R/P1Y"}}),
+    ({"dataset": {"title": "no existe"}}, None),
+    ({"dataset": {"inexistente": None}}, {"field": {"type": "integer"}}),
+]
+
+
+class SearchIndexesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        path = os.path.join(SAMPLES_DIR, "full_data.json")
+        with open(path) as f:
+            self.catalog = json.load(f)
+        self.datajson = DataJson(path, indexed_search=True)
+
+    def assert_same_results(self, filter_in, filter_out):
+        for get in (get_datasets, get_distributions, get_fields):
+            # un dict no se indexa: se recorre completo
+            expected = get(dict(self.datajson),
+                           copy.deepcopy(filter_in),
+                           copy.deepcopy(filter_out))
+            self.assertEqual(expected, get(self.datajson,
+                                           copy.deepcopy(filter_in),
+                                           copy.deepcopy(filter_out)))
+
+    def test_indexed_search_matches_full_scan(self):
+        for filter_in, filter_out in FILTERS:
+            self.assert_same_results(filter_in, filter_out)
+        self.assertIsNotNone(self.datajson._search_indexes)
+
+    def test_indexes_are_built_once(self):
+        with mock.patch.object(SearchIndexes, "_build",
+                               autospec=True,
+                               side_effect=SearchIndexes._build) as build:
+            for _ in range(3):
+                self.datajson.get_datasets(
+                    {"dataset": {"accrualPeriodicity": "R/P1Y"}})
+        self.assertEqual(1, build.call_count)
+
+    def test_nested_lookup(self):
+        indexes = SearchIndexes(self.catalog)
+        name = self.catalog["dataset"][0]["publisher"]["name"]
+        self.assertIn((0,), indexes.lookup("dataset", "publisher.name",
+                                           name))
+        self.assertEqual(frozenset(),
+                         indexes.lookup("dataset", "publisher.name", "otro"))
+
+    def test_mutations_discard_indexes(self):
+        filter_in = {"distribution": {"byteSize": 5120}}
+        distributions = self.datajson.get_distributions(filter_in)
+        self.assertTrue(distributions)
+
+        for distribution in distributions:
+            self.datajson.remove_distribution(distribution["identifier"])
+        self.assertEqual([], self.datajson.get_distributions(filter_in))
+
+        self.datajson["dataset"][0]["accrualPeriodicity"] = "R/P1D"
+        self.datajson.clear_search_indexes()
+        self.assert_same_results({"dataset": {"accrualPeriodicity": "R/P1D"}},
+                                 None)
+
+    def test_in_place_edits_without_indexes(self):
+        datajson = DataJson(os.path.join(SAMPLES_DIR, "full_data.json"))
+        filter_in = {"dataset": {"title": "Editado"}}
+        self.assertEqual([], datajson.get_datasets(filter_in))
+
+        # sin indexed_search las búsquedas ven las modificaciones directas
+        dataset = datajson["dataset"][0]
+        dataset["title"] = "Editado"
+        self.assertEqual([dataset], datajson.get_datasets(filter_in))
+        self.assertNotIn(dataset, datajson.get_datasets(filter_out=filter_in))
+        self.assertEqual(
+            dataset["distribution"],
+            datajson.get_distributions(filter_in))
+        self.assertIsNone(datajson._search_indexes)
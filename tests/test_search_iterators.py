@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de los iteradores paginados de búsqueda."""
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import os
+import unittest
+
+from pydatajson import custom_exceptions as ce
+from pydatajson.catalog_views import EntityView
+from pydatajson.core import DataJson
+from pydatajson.search import get_datasets, get_distributions, get_fields
+from pydatajson.search import iter_datasets, iter_distributions, iter_fields
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from .test_catalog_mutations import make_catalog
+from .test_search_indexes import FILTERS
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+SEARCHES = [(get_datasets, iter_datasets, "identifier"),
+            (get_distributions, iter_distributions, "identifier"),
+            (get_fields, iter_fields, "id")]
+
+
+class SearchIteratorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(SAMPLES_DIR, "full_data.json")
+        with open(self.path) as f:
+            self.catalog = json.load(f)
+        self.catalogs = [self.catalog, DataJson(self.path),
+                         DataJson(self.path, lazy=True),
+                         DataJson(self.path, indexed_search=True,
+                                  cached_views=True)]
+
+    def test_iterators_match_lists(self):
+        for filter_in, filter_out in FILTERS:
+            for get, iterate, _ in SEARCHES:
+                for catalog in self.catalogs:
+                    expected = get(catalog, copy.deepcopy(filter_in),
+                                   copy.deepcopy(filter_out))
+                    self.assertEqual(expected, list(iterate(
+                        catalog, copy.deepcopy(filter_in),
+                        copy.deepcopy(filter_out))))
+
+    def test_special_filters(self):
+        for get, iterate, _ in SEARCHES:
+            for kwargs in [{"only_time_series": True},
+                           {"meta_field": "title"},
+                           {"meta_field": "dataset_identifier"}]:
+                expected = get(self.catalog, **kwargs)
+                for catalog in self.catalogs:
+                    self.assertEqual(expected,
+                                     list(iterate(catalog, **kwargs)))
+
+        self.assertEqual(
+            get_fields(self.catalog, distribution_identifier="1.1"),
+            list(self.catalogs[1].iter_fields(distribution_identifier="1.1")))
+
+    def test_offset_and_limit(self):
+        for get, iterate, _ in SEARCHES:
+            expected = get(self.catalog)
+            for catalog in self.catalogs:
+                for offset, limit in [(0, 1), (1, 2), (2, None), (100, 5)]:
+                    self.assertEqual(
+                        expected[offset:offset + limit if limit else None],
+                        list(iterate(catalog, offset=offset, limit=limit)))
+
+    def assert_cursor_pagination(self, get, iterate, key, catalogs):
+        expected = get(catalogs[0])
+        for catalog in catalogs:
+            pages = []
+            cursor = None
+            while True:
+                page = list(iterate(catalog, limit=2, cursor=cursor))
+                if not page:
+                    break
+                pages.extend(page)
+                cursor = page[-1][key]
+            self.assertEqual(expected, pages)
+
+    def test_cursor_pagination(self):
+        for get, iterate, key in SEARCHES[:2]:
+            self.assert_cursor_pagination(get, iterate, key, self.catalogs)
+
+        # sólo los campos con id pueden usarse como cursor
+        self.assert_cursor_pagination(
+            get_fields, iter_fields, "id",
+            [make_catalog(), DataJson(make_catalog())])
+
+    def test_cursor_follows_catalog_changes(self):
+        datajson = self.catalogs[1]
+        first, second = [dataset["identifier"]
+                         for dataset in datajson["dataset"][:2]]
+        datajson.add_dataset({"identifier": "nuevo", "distribution": []})
+        datajson.remove_dataset(first)
+        # el cursor sigue en el mismo dataset aunque cambió su posición
+        identifiers = [dataset["identifier"]
+                       for dataset in datajson["dataset"]]
+        self.assertEqual(
+            identifiers[identifiers.index(second) + 1:],
+            list(datajson.iter_datasets(cursor=second,
+                                        meta_field="identifier")))
+
+    def test_unknown_cursor(self):
+        errors = [ce.DatasetIdNonExistentError,
+                  ce.DistributionIdNonExistentError,
+                  ce.FieldIdNonExistentError]
+        for (_, iterate, _), error in zip(SEARCHES, errors):
+            for catalog in self.catalogs:
+                with self.assertRaises(error):
+                    list(iterate(catalog, cursor="inexistente"))
+
+    def test_only_returned_entities_are_copied(self):
+        datajson = self.catalogs[3]
+        with mock.patch.object(EntityView, "copy", autospec=True,
+                               side_effect=lambda view: dict(view)) as copy_:
+            page = list(iter_distributions(
+                datajson, exclude_meta_fields=["title"], offset=1,
+                limit=1))
+        self.assertEqual(1, copy_.call_count)
+        self.assertNotIn("title", page[0])
+        self.assertTrue(all("title" in distribution for distribution
+                            in get_distributions(datajson)))
+
+        page = list(iter_distributions(
+            self.catalog, exclude_meta_fields=["title"], limit=1))
+        self.assertNotIn("title", page[0])
+        self.assertIn("title",
+                      self.catalog["dataset"][0]["distribution"][0])
+
+        page = list(self.catalogs[1].iter_datasets(
+            exclude_meta_fields=["distribution"], limit=1))
+        self.assertNotIn("distribution", page[0])
+        self.assertIn("distribution", self.catalogs[1]["dataset"][0])
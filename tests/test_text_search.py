@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""Tests del índice de texto de los metadatos de un catálogo."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from pydatajson.core import DataJson
+from pydatajson.search import search_text
+from pydatajson.text_search import TextIndex, tokenize
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+
+def make_catalog():
+    return {"dataset": [
+        {"identifier": "combustibles", "title": "Precios de combustibles",
+         "description": "Precios en surtidor por provincia",
+         "keyword": ["naftas", "energía"],
+         "distribution": [
+             {"identifier": "combustibles.1",
+              "title": "Precios mensuales",
+              "field": [{"id": "nafta_super", "title": "nafta_super",
+                         "description": "Precio de la nafta súper"},
+                        {"title": "indice_tiempo"}]}]},
+        {"identifier": "energia", "title": "Generación de energía",
+         "description": "Energía generada por región y precios mayoristas",
+         "distribution": [
+             {"identifier": "energia.1", "title": "Generación por regiones"}]},
+        {"identifier": "turismo", "title": "Turismo internacional",
+         "description": "Llegadas de turistas a las ciudades"},
+    ]}
+
+
+class TextSearchTestCase(unittest.TestCase):
+
+    def test_tokenize_folds_spanish_text(self):
+        self.assertEqual(["region", "ciudad", "energia", "precio", "super"],
+                         tokenize("Regiones y Ciudades de la ENERGÍA: "
+                                  "precios_súper"))
+        self.assertEqual(["bien", "compra"], tokenize(["bienes", "compras"]))
+        self.assertEqual([], tokenize(None))
+
+    def test_search_ranks_by_relevance(self):
+        index = TextIndex(make_catalog())
+        self.assertEqual(["combustibles", "energia"],
+                         index.search("PRECIO"))
+        self.assertEqual(["combustibles"], index.search("precio", limit=1))
+        self.assertEqual(["turismo"], index.search("ciudad"))
+        self.assertEqual([], index.search("inexistente"))
+        self.assertEqual(["energia.1"],
+                         index.search("region", level="distribution"))
+
+        ranked = index.search("precios", with_scores=True)
+        self.assertGreater(ranked[0][1], ranked[1][1])
+        for limit in range(1, 4):
+            self.assertEqual(index.search("precio energia turismo")[:limit],
+                             index.search("precio energia turismo",
+                                          limit=limit))
+
+    def test_fields_without_id_are_not_indexed(self):
+        index = TextIndex(make_catalog())
+        self.assertEqual(["nafta_super"], index.search("nafta",
+                                                       level="field"))
+        self.assertEqual([], index.search("tiempo", level="field"))
+
+    def test_incremental_updates_match_rebuild(self):
+        catalog = make_catalog()
+        index = TextIndex()
+        for dataset in catalog["dataset"]:
+            index.add_dataset(dataset)
+        index.remove_dataset("turismo")
+        index.remove_distribution("combustibles.1")
+
+        del catalog["dataset"][2]
+        del catalog["dataset"][0]["distribution"][0]
+        rebuilt = TextIndex(catalog)
+        for level, query in [("dataset", "precio ciudad energia"),
+                             ("distribution", "precio region"),
+                             ("field", "nafta")]:
+            self.assertEqual(
+                rebuilt.search(query, level, with_scores=True),
+                index.search(query, level, with_scores=True))
+
+    def test_datajson_updates_text_index(self):
+        datajson = DataJson(make_catalog())
+        self.assertEqual(["turismo"], datajson.search_text("turistas"))
+        self.assertEqual(["turismo"], search_text(make_catalog(),
+                                                  "turistas"))
+
+        with mock.patch.object(TextIndex, "add_catalog") as add_catalog:
+            datajson.remove_dataset("turismo")
+            datajson.remove_distribution("energia.1")
+            self.assertEqual([], datajson.search_text("turistas"))
+            self.assertEqual([], datajson.search_text(
+                "regiones", level="distribution"))
+        add_catalog.assert_not_called()
+
+        datajson["dataset"][0]["title"] = "Turismo receptivo"
+        datajson.clear_search_indexes()
+        self.assertEqual(["combustibles"], datajson.search_text("turismo"))
+
+    def test_sample_catalog(self):
+        datajson = DataJson(os.path.join(SAMPLES_DIR, "full_data.json"))
+        self.assertEqual(
+            ["99db6631-d1c9-470b-a73e-c62daa32c777",
+             "99db6631-d1c9-470b-a73e-c62daa32c420"],
+            datajson.search_text("contrataciones electrónicas"))
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
+import threading
+import time
 from unittest import TestCase
 
-from pydatajson.threading_helper import apply_threading
+from pydatajson.threading_helper import apply_threading, WorkerPool
 
 
 class ThreadingTests(TestCase):
@@ -24,3 +26,53 @@ class ThreadingTests(TestCase):
 
         with self.assertRaises(ZeroDivisionError):  # Es "sincrónico"!
             apply_threading(elements, divide, 3)
+
+    def test_threading_with_shared_pool(self):
+        with WorkerPool(2) as pool:
+            for _ in range(3):
+                result = apply_threading([1, 2, 3], lambda x: x * 2, 2,
+                                         pool=pool)
+                self.assertEqual([2, 4, 6], result)
+
+
+class WorkerPoolTests(TestCase):
+
+    def test_threads_are_reused_between_calls(self):
+        threads = set()
+
+        def function(x):
+            threads.add(threading.current_thread().ident)
+            return x
+
+        with WorkerPool(3) as pool:
+            for _ in range(5):
+                self.assertEqual(list(range(20)),
+                                 pool.map(function, range(20)))
+        self.assertLessEqual(len(threads), 3)
+
+    def test_pending_tasks_are_bounded(self):
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def function(x):
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return x
+
+        with WorkerPool(8) as pool:
+            results = list(pool.imap_unordered(function, range(30),
+                                               max_pending=3))
+        self.assertEqual(list(range(30)), sorted(results))
+        self.assertLessEqual(max_running[0], 3)
+
+    def test_closed_pool_rejects_tasks(self):
+        pool = WorkerPool(2)
+        pool.map(str, [1, 2])
+        pool.close()
+        with self.assertRaises(ValueError):
+            pool.map(str, [1, 2])
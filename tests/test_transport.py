@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import os
+import unittest
+
+import requests_mock
+from ckanapi import RemoteCKAN
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pydatajson import transport as pydj_transport
+from pydatajson.core import DataJson
+from pydatajson.custom_remote_ckan import CustomRemoteCKAN
+from pydatajson.download import download
+from pydatajson.readers import read_catalog
+from pydatajson.transport import Transport
+from pydatajson.validators.url_validator import UrlValidator
+
+TEMP_DIR = os.path.join("tests", "temp")
+
+
+class TransportTestCase(unittest.TestCase):
+    URL = "http://test.com/data.json"
+    CATALOG = {"title": "catalogo", "dataset": []}
+
+    def setUp(self):
+        self.transport = Transport(pool_connections=3, pool_maxsize=7)
+
+    def tearDown(self):
+        pydj_transport.set_default_transport(None)
+
+    def test_pools_are_configurable(self):
+        for prefix in ["http://", "https://"]:
+            adapter = self.transport.session.get_adapter(prefix + "test.com")
+            self.assertEqual(7, adapter._pool_maxsize)
+            self.assertEqual(3, adapter._pool_connections)
+
+    def test_default_transport_is_shared(self):
+        default = pydj_transport.get_default_transport()
+        self.assertIs(default, pydj_transport.get_default_transport())
+
+        pydj_transport.set_default_transport(self.transport)
+        self.assertIs(self.transport, pydj_transport.get_default_transport())
+
+    @requests_mock.Mocker()
+    def test_read_catalog_uses_transport(self, m):
+        m.get(self.URL, text=json.dumps(self.CATALOG))
+        with mock.patch.object(self.transport, "request",
+                               wraps=self.transport.request) as request:
+            catalog = read_catalog(self.URL, transport=self.transport)
+            request.assert_called_once_with("GET", self.URL, verify=False,
+                                            timeout=mock.ANY,
+                                            allow_redirects=True)
+        self.assertEqual(self.CATALOG, catalog)
+
+    @requests_mock.Mocker()
+    def test_datajson_uses_transport(self, m):
+        m.get(self.URL, text=json.dumps(self.CATALOG))
+        with mock.patch.object(self.transport, "request",
+                               wraps=self.transport.request) as request:
+            DataJson(self.URL, transport=self.transport)
+            self.assertEqual(1, request.call_count)
+
+    @requests_mock.Mocker()
+    def test_default_transport_is_used_when_none_is_given(self, m):
+        m.get(self.URL, text=json.dumps(self.CATALOG))
+        pydj_transport.set_default_transport(self.transport)
+        with mock.patch.object(self.transport, "request",
+                               wraps=self.transport.request) as request:
+            read_catalog(self.URL)
+            self.assertEqual(1, request.call_count)
+
+    @requests_mock.Mocker()
+    def test_url_validator_uses_transport(self, m):
+        m.head(self.URL, status_code=200)
+        validator = UrlValidator({}, True, 1, 1, transport=self.transport)
+        with mock.patch.object(self.transport, "request",
+                               wraps=self.transport.request) as request:
+            self.assertEqual((True, 200), validator.is_working_url(self.URL))
+            self.assertEqual("HEAD", request.call_args[0][0])
+
+    @requests_mock.Mocker()
+    def test_download_uses_transport(self, m):
+        m.get(self.URL, content=b"contenido")
+        path = os.path.join(TEMP_DIR, "transport_download")
+        with mock.patch.object(self.transport, "request",
+                               wraps=self.transport.request) as request:
+            download(self.URL, path, transport=self.transport)
+            self.assertEqual(1, request.call_count)
+
+        with open(path, "rb") as f:
+            self.assertEqual(b"contenido", f.read())
+        os.remove(path)
+
+    def test_remote_ckan_shares_transport_session(self):
+        portal = CustomRemoteCKAN("http://test.com", transport=self.transport)
+        self.assertIs(self.transport.session, portal.session)
+
+        portal.close()
+        self.assertIs(self.transport.session, portal.session)
+
+        # una sesión propia del portal sí se cierra
+        own_session = mock.Mock()
+        portal.session = own_session
+        portal.close()
+        own_session.close.assert_called_once_with()
+        self.assertIsNone(portal.session)
+
+    def test_remote_ckan_passes_session_to_ckanapi(self):
+        # las versiones de ckanapi que reciben la sesión no abren otra
+        def init(portal, address, apikey=None, user_agent=None,
+                 get_only=False, session=None):
+            portal.session = session
+
+        with mock.patch.object(RemoteCKAN, "__init__", init):
+            portal = CustomRemoteCKAN("http://test.com",
+                                      transport=self.transport)
+        self.assertIs(self.transport.session, portal.session)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""Tests del caché persistente de estado de URLs."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sqlite3
+import time
+import unittest
+
+import requests_mock
+
+from pydatajson import url_health_cache
+from pydatajson.link_checker import LinkChecker
+from pydatajson.status_indicators_generator import StatusIndicatorsGenerator
+from pydatajson.url_health_cache import UrlHealthCache
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+TEMP_DIR = os.path.join("tests", "temp", "url_health_cache")
+
+
+class UrlHealthCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        self.path = os.path.join(TEMP_DIR, "urls.sqlite")
+        self.urls = ["http://host{}.com/recurso".format(i) for i in range(5)]
+
+    def tearDown(self):
+        url_health_cache.set_default_cache(None)
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def test_results_are_persisted_across_instances(self):
+        cache = UrlHealthCache(self.path)
+        cache.set_many({self.urls[0]: (True, 200),
+                        self.urls[1]: (False, 404)})
+        cache.close()
+
+        reopened = UrlHealthCache(self.path)
+        self.assertEqual({self.urls[0]: (True, 200),
+                          self.urls[1]: (False, 404)},
+                         reopened.get_many(self.urls))
+        self.assertEqual(2, reopened.hits)
+        self.assertEqual(3, reopened.misses)
+
+    def test_results_depend_on_ssl_verification(self):
+        cache = UrlHealthCache()
+        cache.set(self.urls[0], (False, None), verify_ssl=True)
+        self.assertIsNone(cache.get(self.urls[0], verify_ssl=False))
+
+        cache.set(self.urls[0], (True, 200), verify_ssl=False)
+        self.assertEqual((False, None), cache.get(self.urls[0]))
+        self.assertEqual((True, 200),
+                         cache.get(self.urls[0], verify_ssl=False))
+
+        checker = LinkChecker(verify_ssl=False, health_cache=cache)
+        self.assertEqual([(True, 200)], checker.check_urls(
+            self.urls[:1], lambda url: (False, None)))
+
+    def test_tables_without_ssl_column_are_replaced(self):
+        os.makedirs(TEMP_DIR)
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute(
+                "CREATE TABLE url_health (url TEXT PRIMARY KEY, "
+                "valid INTEGER NOT NULL, status_code INTEGER, "
+                "checked_at REAL NOT NULL)")
+            connection.execute("INSERT INTO url_health VALUES (?, 0, NULL, ?)",
+                               (self.urls[0], time.time()))
+        connection.close()
+
+        cache = UrlHealthCache(self.path)
+        self.assertEqual(0, len(cache))
+        cache.set(self.urls[0], (True, 200))
+        self.assertEqual((True, 200), cache.get(self.urls[0]))
+
+    def test_ok_and_failed_results_expire_separately(self):
+        cache = UrlHealthCache(ok_ttl=100, error_ttl=10)
+        cache.set(self.urls[0], (True, 200))
+        cache.set(self.urls[1], (False, None))
+
+        later = time.time() + 50
+        with mock.patch.object(url_health_cache.time, "time",
+                               return_value=later):
+            self.assertEqual((True, 200), cache.get(self.urls[0]))
+            self.assertIsNone(cache.get(self.urls[1]))
+            cache.purge()
+        self.assertEqual(1, len(cache))
+
+    def test_large_batches_are_queried_in_chunks(self):
+        urls = ["http://host.com/{}".format(i) for i in range(1200)]
+        cache = UrlHealthCache()
+        cache.set_many(dict((url, (True, 200)) for url in urls))
+        self.assertEqual(1200, len(cache.get_many(urls + [None, ""])))
+
+    @requests_mock.Mocker()
+    def test_link_checker_only_requests_missing_urls(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=200)
+        cache = UrlHealthCache(self.path)
+        checker = LinkChecker(max_workers=3, health_cache=cache)
+
+        checker.check_urls(self.urls[:3])
+        self.assertEqual(3, req_mock.call_count)
+
+        results = checker.check_urls(self.urls)
+        self.assertEqual([(True, 200)] * 5, results)
+        self.assertEqual(5, req_mock.call_count)
+
+    def test_unchecked_urls_are_not_cached(self):
+        cache = UrlHealthCache()
+        checker = LinkChecker(deadline=0.01, health_cache=cache)
+        checker.check_urls(self.urls, lambda url: time.sleep(0.02) or
+                           (True, 200))
+        self.assertEqual(1, len(cache))
+
+    @requests_mock.Mocker()
+    def test_default_cache_is_used_by_indicators(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=200)
+        url_health_cache.set_default_cache(UrlHealthCache(self.path))
+        catalog = os.path.join(SAMPLES_DIR, "full_data.json")
+
+        first = StatusIndicatorsGenerator(catalog)
+        first.distribuciones_download_url_ok_cant()
+        requests_count = req_mock.call_count
+        self.assertGreater(requests_count, 0)
+
+        second = StatusIndicatorsGenerator(catalog)
+        self.assertEqual(first.distribuciones_download_url_ok_cant(),
+                         second.distribuciones_download_url_ok_cant())
+        self.assertEqual(requests_count, req_mock.call_count)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import os
+import shutil
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pydatajson.core import DataJson
+from pydatajson.validation import Validator
+from pydatajson.validation_cache import ValidationCache
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+TEMP_DIR = os.path.join("tests", "temp")
+
+
+class ValidationCacheTestCase(unittest.TestCase):
+    CACHE_DIR = os.path.join(TEMP_DIR, "validation_cache")
+
+    @classmethod
+    def get_sample(cls, sample_filename):
+        return os.path.join(SAMPLES_DIR, sample_filename)
+
+    def setUp(self):
+        shutil.rmtree(self.CACHE_DIR, ignore_errors=True)
+        with open(self.get_sample("several_datasets_with_types.json")) as f:
+            self.catalog = json.load(f)
+        self.validator = Validator()
+
+    def tearDown(self):
+        shutil.rmtree(self.CACHE_DIR, ignore_errors=True)
+
+    def test_incremental_validation_matches_full_validation(self):
+        cache = ValidationCache()
+        for sample in ["full_data.json", "several_datasets.json",
+                       "several_datasets_with_types.json",
+                       "invalid_multiple_fields_type.json",
+                       "missing_dataset_title.json",
+                       "repeated_downloadURL.json"]:
+            with open(self.get_sample(sample)) as f:
+                catalog = json.load(f)
+
+            expected = self.validator.validate_catalog(catalog)
+            for _ in range(2):
+                self.assertEqual(expected, self.validator.validate_catalog(
+                    catalog, validation_cache=cache))
+
+    def test_only_changed_datasets_are_revalidated(self):
+        cache = ValidationCache()
+        datasets_count = len(self.catalog["dataset"])
+        self.validator.validate_catalog(self.catalog, validation_cache=cache)
+        self.assertEqual(datasets_count, cache.misses)
+
+        self.catalog["dataset"][1]["title"] = ""
+        expected = self.validator.validate_catalog(self.catalog)
+        with mock.patch.object(self.validator, "_dataset_errors_entry",
+                               wraps=self.validator._dataset_errors_entry) \
+                as validate_dataset:
+            response = self.validator.validate_catalog(
+                self.catalog, validation_cache=cache)
+            self.assertEqual(1, validate_dataset.call_count)
+
+        self.assertEqual(expected, response)
+        self.assertEqual("ERROR", response["error"]["dataset"][1]["status"])
+
+    def test_repeated_datasets_are_validated_at_catalog_level(self):
+        cache = ValidationCache()
+        self.validator.validate_catalog(self.catalog, validation_cache=cache)
+
+        self.catalog["dataset"].append(copy.deepcopy(
+            self.catalog["dataset"][0]))
+        response = self.validator.validate_catalog(self.catalog,
+                                                   validation_cache=cache)
+        self.assertEqual(self.validator.validate_catalog(self.catalog),
+                         response)
+        self.assertIn("uniqueItems", [
+            error["validator"]
+            for error in response["error"]["catalog"]["errors"]])
+
+    def test_cache_is_persisted_to_disk(self):
+        cache = ValidationCache(self.CACHE_DIR)
+        self.validator.is_valid(self.catalog, validation_cache=cache)
+
+        reloaded = ValidationCache(self.CACHE_DIR)
+        self.assertEqual(len(cache), len(reloaded))
+        self.validator.is_valid(self.catalog, validation_cache=reloaded)
+        self.assertEqual(0, reloaded.misses)
+
+        reloaded.clear()
+        self.assertEqual(0, len(ValidationCache(self.CACHE_DIR)))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ValidationCache(max_entries=2)
+        for i in range(3):
+            cache.set(str(i), ([], []))
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("0"))
+        self.assertIsNotNone(cache.get("2"))
+
+    def test_key_depends_on_content_and_namespace(self):
+        dataset = self.catalog["dataset"][0]
+        reordered = dict(reversed(list(dataset.items())))
+
+        self.assertEqual(ValidationCache.key(dataset),
+                         ValidationCache.key(reordered))
+        self.assertNotEqual(ValidationCache.key(dataset),
+                            ValidationCache.key(dataset, "otro schema"))
+
+    def test_datajson_uses_validation_cache(self):
+        cache = ValidationCache()
+        datajson = DataJson(self.catalog, validation_cache=cache)
+        datajson.validate_catalog()
+        self.assertEqual(DataJson(self.catalog).is_valid_catalog(),
+                         datajson.is_valid_catalog())
+        self.assertEqual(len(self.catalog["dataset"]), cache.hits)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de la agregación de errores de validación."""
+
+from __future__ import unicode_literals
+
+import copy
+import random
+import unittest
+
+from pydatajson.core import DataJson
+from pydatajson.validation import Validator, get_validation_errors
+from pydatajson.validation_errors import ValidationErrors, error_info
+
+from .test_schema_compiler import load_samples, mutate
+
+
+def legacy_response(validator, catalog):
+    """Arma la respuesta de validate_catalog() error por error."""
+    response = validator._default_response(catalog)
+    for error in validator._get_errors(catalog):
+        response = copy.deepcopy(response)
+        response["status"] = "ERROR"
+        if len(error.path) >= 2 and error.path[0] == "dataset":
+            position = response["error"]["dataset"][error.path[1]]
+        else:
+            position = response["error"]["catalog"]
+        position["status"] = "ERROR"
+        position["errors"].append(error_info(error))
+    return response
+
+
+class ValidationErrorsTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rand = random.Random(14)
+        samples = [c for c in load_samples() if isinstance(c, dict) and
+                   isinstance(c.get("dataset"), list)]
+        cls.catalogs = list(samples)
+        for _ in range(100):
+            catalog = mutate(copy.deepcopy(rand.choice(samples)), rand,
+                             rand.randint(1, 4))
+            if isinstance(catalog.get("dataset"), list) and all(
+                    isinstance(d, dict) for d in catalog["dataset"]):
+                cls.catalogs.append(catalog)
+
+    def setUp(self):
+        self.validator = Validator()
+
+    def test_response_is_the_same_as_error_by_error(self):
+        for catalog in self.catalogs:
+            try:
+                expected = legacy_response(self.validator, catalog)
+            except Exception:
+                continue
+            self.assertEqual(expected,
+                             self.validator.validate_catalog(catalog))
+
+    def test_compact_errors_match_the_response(self):
+        for catalog in self.catalogs:
+            try:
+                response = self.validator.validate_catalog(catalog)
+            except Exception:
+                continue
+            errors = self.validator.get_validation_errors(catalog)
+
+            self.assertEqual(response["status"], errors.status)
+            self.assertEqual(response["error"]["catalog"]["status"],
+                             errors.catalog_status)
+            datasets = response["error"]["dataset"]
+            for index, dataset in enumerate(datasets):
+                self.assertEqual(dataset["status"],
+                                 errors.dataset_status(index))
+                self.assertEqual(len(dataset["errors"]),
+                                 errors.dataset_errors_count(index))
+            self.assertEqual(
+                [i for i, d in enumerate(datasets) if d["status"] == "ERROR"],
+                errors.invalid_datasets())
+            self.assertEqual(len(datasets), errors.datasets_count)
+            self.assertEqual(response, errors.fill_response(
+                self.validator._default_response(catalog)))
+
+    def test_datasets_without_errors_are_not_stored(self):
+        catalog = copy.deepcopy(self.catalogs[0])
+        catalog["dataset"] = [catalog["dataset"][0]] * 3
+        catalog["dataset"][1] = dict(catalog["dataset"][0], title=1)
+
+        errors = get_validation_errors(catalog)
+        self.assertFalse(errors.is_valid())
+        self.assertEqual([1], list(errors.dataset_errors))
+        self.assertEqual(0, errors.dataset_errors_count(0))
+
+    def test_empty_errors_leave_the_response_untouched(self):
+        response = self.validator._default_response(self.catalogs[0])
+        expected = copy.deepcopy(response)
+        self.assertEqual(expected,
+                         ValidationErrors().fill_response(response))
+
+    def test_datajson_reports_use_compact_errors(self):
+        datajson = DataJson(self.catalogs[0])
+        errors = datajson.get_validation_errors()
+        response = datajson.validate_catalog()
+        self.assertEqual(response["status"], errors.status)
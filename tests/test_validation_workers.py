@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""Tests de la validación de datasets repartida entre procesos."""
+
+from __future__ import unicode_literals
+
+import copy
+import json
+import os
+import random
+import unittest
+
+from pydatajson.core import DataJson
+from pydatajson.validation import Validator, validate_catalog
+from pydatajson.validation_cache import ValidationCache
+
+from .test_schema_compiler import load_samples, mutate
+
+SAMPLES_DIR = os.path.join("tests", "samples")
+
+
+class ValidationWorkersTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.samples = [c for c in load_samples() if isinstance(c, dict) and
+                       isinstance(c.get("dataset"), list)]
+
+    def setUp(self):
+        with open(os.path.join(SAMPLES_DIR,
+                               "several_datasets_with_types.json")) as f:
+            self.catalog = json.load(f)
+        self.validator = Validator()
+
+    def test_parallel_validation_matches_serial_validation(self):
+        for catalog in self.samples:
+            self.assertEqual(self.validator.validate_catalog(catalog),
+                             self.validator.validate_catalog(catalog,
+                                                             workers=2))
+
+    def test_parallel_validation_of_mutated_catalogs(self):
+        rand = random.Random(12)
+        catalogs = []
+        for _ in range(20):
+            catalog = mutate(copy.deepcopy(rand.choice(self.samples)), rand,
+                             rand.randint(1, 4))
+            if isinstance(catalog.get("dataset"), list) and all(
+                    isinstance(d, dict) for d in catalog["dataset"]):
+                catalogs.append(catalog)
+
+        merged = {"dataset": [d for c in catalogs for d in c["dataset"]]}
+        catalogs.append(merged)
+        for catalog in catalogs:
+            expected = self.validator.validate_catalog(catalog)
+            self.assertEqual(expected, self.validator.validate_catalog(
+                catalog, workers=3))
+            self.assertEqual(self.validator.is_valid(catalog),
+                             self.validator.is_valid(catalog, workers=3))
+
+    def test_parallel_validation_fills_the_cache(self):
+        cache = ValidationCache()
+        self.catalog["dataset"][0]["title"] = ""
+        expected = self.validator.validate_catalog(self.catalog)
+
+        response = self.validator.validate_catalog(
+            self.catalog, validation_cache=cache, workers=2)
+        self.assertEqual(expected, response)
+        self.assertEqual(len(self.catalog["dataset"]), len(cache))
+
+        self.assertEqual(expected, self.validator.validate_catalog(
+            self.catalog, validation_cache=cache, workers=2))
+        self.assertEqual(len(self.catalog["dataset"]), cache.hits)
+
+    def test_workers_argument_is_accepted_everywhere(self):
+        expected = self.validator.validate_catalog(self.catalog)
+        self.assertEqual(expected, validate_catalog(self.catalog, workers=2))
+
+        datajson = DataJson(self.catalog)
+        self.assertEqual(datajson.is_valid_catalog(),
+                         datajson.is_valid_catalog(workers=2))
+        self.assertEqual(datajson.validate_catalog(),
+                         datajson.validate_catalog(workers=2))
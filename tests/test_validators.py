@@ -4,11 +4,17 @@ from __future__ import print_function, unicode_literals, with_statement
 
 import json
 import os.path
+import shutil
+import threading
 import unittest
 
+import jsonschema
+
 import requests_mock
 from requests import Timeout, ConnectionError
 
+from pydatajson import validation
+from pydatajson.helpers import ensure_dir_exists
 from pydatajson.validators \
     .consistent_distribution_fields_validator \
     import ConsistentDistributionFieldsValidator
@@ -191,3 +197,119 @@ class ValidatorsTestCase(unittest.TestCase):
         req_mock.head(self.test_url)
         url_validator.is_working_url(self.test_url)
         self.assertEqual(100, req_mock.request_history[0].timeout)
+
+
+class ValidatorsCacheTestCase(unittest.TestCase):
+    SAMPLES_DIR = os.path.join("tests", "samples")
+    TEMP_SCHEMA_DIR = os.path.join("tests", "temp", "schemas")
+
+    def setUp(self):
+        validation.clear_validators_cache()
+        catalog_path = os.path.join(self.SAMPLES_DIR, "full_data.json")
+        with open(catalog_path) as catalog_file:
+            self.catalog = json.load(catalog_file)
+
+    def tearDown(self):
+        validation.clear_validators_cache()
+        shutil.rmtree(self.TEMP_SCHEMA_DIR, ignore_errors=True)
+
+    def test_schemas_are_read_once_per_process(self):
+        with mock.patch('pydatajson.validation.readers.read_json',
+                        wraps=validation.readers.read_json) as read_json:
+            validation.Validator()
+            reads = read_json.call_count
+            validators = [validation.Validator() for _ in range(5)]
+
+        self.assertEqual(reads, read_json.call_count)
+        self.assertTrue(all(v.jsonschema_validator is
+                            validators[0].jsonschema_validator
+                            for v in validators))
+
+    def test_references_are_resolved_without_reading_disk(self):
+        validator = validation.Validator()
+        with mock.patch.object(jsonschema.RefResolver, 'resolve_remote',
+                               side_effect=AssertionError):
+            self.assertTrue(validator.is_valid(self.catalog))
+
+    def test_modified_schemas_are_read_again(self):
+        shutil.rmtree(self.TEMP_SCHEMA_DIR, ignore_errors=True)
+        ensure_dir_exists(os.path.dirname(self.TEMP_SCHEMA_DIR))
+        shutil.copytree(validation.ABSOLUTE_SCHEMA_DIR, self.TEMP_SCHEMA_DIR)
+        schema_dir = os.path.abspath(self.TEMP_SCHEMA_DIR)
+
+        first = validation.get_jsonschema_validator(schema_dir=schema_dir)
+        schema_path = os.path.join(schema_dir, "catalog.json")
+        mtime = os.path.getmtime(schema_path) + 10
+        os.utime(schema_path, (mtime, mtime))
+        second = validation.get_jsonschema_validator(schema_dir=schema_dir)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(1, len(validation._compiled_schemas))
+
+    def test_each_thread_gets_its_own_validator(self):
+        validators = []
+        thread = threading.Thread(target=lambda: validators.append(
+            validation.get_jsonschema_validator()))
+        thread.start()
+        thread.join()
+
+        own = validation.get_jsonschema_validator()
+        self.assertIsNot(validators[0], own)
+        self.assertIs(validators[0].schema, own.schema)
+
+
+class ShortCircuitValidationTestCase(unittest.TestCase):
+    SAMPLES_DIR = os.path.join("tests", "samples")
+
+    def setUp(self):
+        catalog_path = os.path.join(self.SAMPLES_DIR, "full_data.json")
+        with open(catalog_path) as catalog_file:
+            self.catalog = json.load(catalog_file)
+        self.validator = validation.Validator()
+
+    def test_is_valid_matches_full_validation(self):
+        for sample in ["full_data.json", "several_datasets.json",
+                       "invalid_multiple_fields_type.json",
+                       "missing_dataset_title.json",
+                       "repeated_downloadURL.json",
+                       "invalid_themeTaxonomy.json",
+                       "null_dataset_theme.json"]:
+            sample_path = os.path.join(self.SAMPLES_DIR, sample)
+            with open(sample_path) as catalog_file:
+                catalog = json.load(catalog_file)
+            self.assertEqual(not self.validator._get_errors(catalog),
+                             self.validator.is_valid(catalog))
+
+    def test_schema_is_not_validated_after_a_custom_error(self):
+        self.catalog["themeTaxonomy"].append(
+            self.catalog["themeTaxonomy"][0])
+        with mock.patch.object(self.validator, "_iter_schema_errors") \
+                as iter_schema_errors:
+            self.assertFalse(self.validator.is_valid(self.catalog))
+        iter_schema_errors.assert_not_called()
+
+    def test_datasets_are_not_validated_after_a_catalog_error(self):
+        self.catalog["title"] = ""
+        self.catalog["dataset"] *= 50
+        dataset_validator = self.validator.init_jsonschema_validator(
+            self.validator.schema_dir, self.validator.schema_filename,
+            validation.DATASET_PART)
+        with mock.patch.object(dataset_validator, "iter_errors") \
+                as iter_errors:
+            self.assertFalse(self.validator.is_valid(self.catalog))
+        iter_errors.assert_not_called()
+
+    def test_links_are_not_checked_after_a_schema_error(self):
+        self.catalog["title"] = ""
+        with mock.patch.object(UrlValidator, "is_working_url") \
+                as is_working_url:
+            self.assertFalse(self.validator.is_valid(self.catalog,
+                                                     broken_links=True))
+        is_working_url.assert_not_called()
+
+    @requests_mock.Mocker()
+    def test_links_are_checked_on_valid_catalogs(self, req_mock):
+        req_mock.head(requests_mock.ANY, status_code=404)
+        self.assertFalse(self.validator.is_valid(self.catalog,
+                                                 broken_links=True))
+        self.assertTrue(req_mock.called)